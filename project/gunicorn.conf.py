@@ -0,0 +1,73 @@
+"""
+Gunicorn config for the production launch mode.
+
+    gunicorn project.wsgi
+
+Gunicorn picks this file up from the working directory. Every value can be
+overridden through a GUNICORN_* environment variable.
+
+Deploying new code: the app is preloaded in the master, so HUP only
+re-forks workers from the code already imported and keeps running the old
+release. Either restart gunicorn, or upgrade without dropping requests:
+
+    kill -USR2 <master pid>       # start a new master + workers on the new code
+    kill -TERM <old master pid>   # once they serve, stop the old ones gracefully
+
+With GUNICORN_PRELOAD=0 each worker imports the app itself and HUP is a
+graceful reload of the new code, at the cost of per-worker memory.
+"""
+import multiprocessing
+import os
+
+
+def _env_int(name, default):
+    return int(os.environ.get(name, default))
+
+
+bind = os.environ.get('GUNICORN_BIND', '0.0.0.0:8000')
+
+# Sync workers are CPU bound on serialization and password hashing: 2 x cores + 1.
+workers = _env_int('GUNICORN_WORKERS', multiprocessing.cpu_count() * 2 + 1)
+# Use "uvicorn.workers.UvicornWorker" with project.asgi:application for the ASGI stack.
+worker_class = os.environ.get('GUNICORN_WORKER_CLASS', 'sync')
+# With more than one thread, "sync" runs the threaded (gthread) worker.
+# ADMISSION_CONTROL needs concurrent requests: when_ready refuses to start
+# single-threaded sync workers with it enabled.
+threads = _env_int('GUNICORN_THREADS', 1)
+
+# Import Django and the URLconf once in the master, so workers share those
+# pages copy-on-write instead of each importing the app on its own. HUP then
+# no longer loads new code; see the module docstring.
+preload_app = os.environ.get('GUNICORN_PRELOAD', '1') != '0'
+
+# Recycle workers after this many requests (plus jitter, so they don't all
+# restart at once) to cap slow memory growth.
+max_requests = _env_int('GUNICORN_MAX_REQUESTS', 2000)
+max_requests_jitter = _env_int('GUNICORN_MAX_REQUESTS_JITTER', 200)
+
+timeout = _env_int('GUNICORN_TIMEOUT', 30)
+graceful_timeout = _env_int('GUNICORN_GRACEFUL_TIMEOUT', 30)
+keepalive = _env_int('GUNICORN_KEEPALIVE', 5)
+
+accesslog = os.environ.get('GUNICORN_ACCESSLOG', '-')
+errorlog = '-'
+
+raw_env = ['DJANGO_SETTINGS_MODULE={}'.format(
+    os.environ.get('DJANGO_SETTINGS_MODULE', 'project.settings_production'))]
+
+
+def when_ready(server):
+    # Runs in the master before any worker is forked.
+    from task.admission import check_worker_concurrency
+    check_worker_concurrency(server.cfg.worker_class_str)
+    # Once the app is preloaded, load the URLconf, and so every view module,
+    # so a new worker's first request doesn't pay for those imports.
+    if server.cfg.preload_app:
+        from django.urls import get_resolver
+        get_resolver().url_patterns
+
+
+def post_fork(server, worker):
+    # Connections opened while preloading must not be shared between processes.
+    from django.db import connections
+    connections.close_all()
@@ -10,6 +10,7 @@ BASE_DIR = Path(__file__).resolve().parent.parent
 # Quick-start development settings - unsuitable for production
 # See https://docs.djangoproject.com/en/3.2/howto/deployment/checklist/
 environ.Env.read_env()
+env = environ.Env()
 # SECURITY WARNING: keep the secret key used in production secret!
 SECRET_KEY = os.environ.get('SECRET_KEY')
 
@@ -30,14 +31,19 @@ INSTALLED_APPS = [
     'django.contrib.staticfiles',
     # packages
     'rest_framework',
+    'rest_framework.authtoken',
     # my apps
     'task',
 
 ]
 
 MIDDLEWARE = [
+    'task.middleware.RequestMetricsMiddleware',
+    'task.middleware.AdmissionControlMiddleware',
+    'task.middleware.ReadYourWritesMiddleware',
     'django.middleware.security.SecurityMiddleware',
-    'django.contrib.sessions.middleware.SessionMiddleware',
+    'task.middleware.CompressionMiddleware',
+    'task.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
@@ -45,6 +51,75 @@ MIDDLEWARE = [
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
 
+# gzip/brotli compression of response bodies of at least MIN_SIZE bytes, in
+# the client's order of preference, ties going to ALGORITHMS order. Leave it
+# disabled behind a proxy that already compresses.
+RESPONSE_COMPRESSION = {
+    'ENABLED': env.bool('RESPONSE_COMPRESSION_ENABLED', default=False),
+    'MIN_SIZE': env.int('RESPONSE_COMPRESSION_MIN_SIZE', default=1024),
+    'ALGORITHMS': ['br', 'gzip'],
+    'GZIP_LEVEL': 6,
+    'BROTLI_QUALITY': 4,
+}
+
+# Session storage, picked with SESSION_BACKEND:
+# - db: every session-authenticated request reads django_session
+# - cached_db: read from CACHES[SESSION_CACHE_ALIAS], written through to the DB
+# - cache: no DB at all, sessions are lost with the cache
+# cached_db and cache need a cache shared by every worker (Redis,
+# Memcached...), or a logout would only be seen by one worker; workers
+# refuse to start with a per-process one.
+# - signed_cookies: no server storage, the client holds the (signed, not
+#   encrypted) data
+# All of them skip saving a session that a request left unchanged. Expired
+# DB rows are removed by `manage.py purge_sessions`.
+_session_engines = {
+    'db': 'task.sessions.db',
+    'cached_db': 'task.sessions.cached_db',
+    'cache': 'task.sessions.cache',
+    'signed_cookies': 'task.sessions.signed_cookies',
+}
+SESSION_ENGINE = _session_engines[env('SESSION_BACKEND', default='db')]
+SESSION_CACHE_ALIAS = env('SESSION_CACHE_ALIAS', default='default')
+
+# Load shedding, per worker process: a request gets a 503 with Retry-After
+# (seconds) instead of waiting when its endpoint (URL name) has as many
+# requests in progress as its limit, or the process has MAX_IN_FLIGHT times
+# the share of the endpoint's priority. Endpoint limits start at
+# INITIAL_LIMIT and move between MIN_LIMIT and MAX_LIMIT: they shrink while
+# the endpoint's recent latency is over TOLERANCE times its usual latency,
+# and grow otherwise (SMOOTHING is the weight of each update). Needs threaded
+# or async workers: gunicorn refuses to start single-threaded sync workers
+# with it enabled. Counters are listed by metrics/.
+ADMISSION_CONTROL = {
+    'ENABLED': env.bool('ADMISSION_CONTROL_ENABLED', default=False),
+    'MAX_IN_FLIGHT': env.int('ADMISSION_CONTROL_MAX_IN_FLIGHT', default=64),
+    'INITIAL_LIMIT': 20,
+    'MIN_LIMIT': 1,
+    'MAX_LIMIT': 200,
+    'TOLERANCE': 2.0,
+    'SMOOTHING': 0.2,
+    'RETRY_AFTER': 1,
+    'PRIORITIES': {
+        'login': 'critical',
+        'task:create': 'critical',
+        'task:async-create': 'critical',
+        'signup': 'high',
+        'task:bulk-create': 'low',
+        'task:export': 'low',
+    },
+    'DEFAULT_PRIORITY': 'normal',
+    'PRIORITY_SHARES': {'critical': 1.0, 'high': 0.9, 'normal': 0.75, 'low': 0.5},
+}
+
+# Per-request query count / timing instrumentation (Server-Timing header and
+# "task.metrics" log lines). Disabled, the middleware unloads itself.
+REQUEST_METRICS = {
+    'ENABLED': env.bool('REQUEST_METRICS_ENABLED', default=False),
+    # Log a warning when one SQL statement runs this many times in a request.
+    'N_PLUS_ONE_THRESHOLD': 10,
+}
+
 ROOT_URLCONF = 'project.urls'
 
 TEMPLATES = [
@@ -77,28 +152,191 @@ DATABASES = {
         'PASSWORD': os.environ.get('DATABASE_PASS'),
         "HOST": os.environ.get("DATABASE_HOST"),
         "PORT": os.environ.get("DATABASE_PORT"),
+        # Keep connections open across requests instead of reconnecting each time,
+        # and ping a reused connection before its first query in a request.
+        'CONN_MAX_AGE': env.int('DATABASE_CONN_MAX_AGE', default=60),
+        'CONN_HEALTH_CHECKS': env.bool('DATABASE_CONN_HEALTH_CHECKS', default=True),
     }
 }
 
+# Read replicas: one DATABASES alias per host in DATABASE_REPLICA_HOSTS, with
+# the primary's credentials. Tests mirror them onto the primary.
+for index, host in enumerate(env.list('DATABASE_REPLICA_HOSTS', default=[])):
+    DATABASES['replica_{}'.format(index)] = dict(DATABASES['default'], HOST=host, TEST={'MIRROR': 'default'})
+
+DATABASE_ROUTERS = ['task.routers.PrimaryReplicaRouter']
+
+# Reads of MODELS go to a random replica; clients that wrote within
+# STICKY_SECONDS read from the primary. Every other model (users, tokens,
+# sessions...) is always read from the primary, where a just-issued token
+# or session already exists. CACHE is the CACHES alias remembering recent
+# writers and should be shared (e.g. Redis) when running several workers.
+READ_REPLICAS = {
+    'DATABASES': [alias for alias in DATABASES if alias != 'default'],
+    'MODELS': ['task.Product'],
+    'STICKY_SECONDS': env.int('DATABASE_REPLICA_STICKY_SECONDS', default=5),
+    'CACHE': 'default',
+}
+
+# Cap on the connections used by the async views (one per task.concurrency
+# thread); requests that wait longer than TIMEOUT seconds get a 503.
+DATABASE_POOL = {
+    'ENABLED': env.bool('DATABASE_POOL_ENABLED', default=False),
+    'MAX_SIZE': env.int('DATABASE_POOL_MAX_SIZE', default=8),
+    'TIMEOUT': env.float('DATABASE_POOL_TIMEOUT', default=5.0),
+}
+
 AUTHENTICATION_BACKENDS = [
     'django.contrib.auth.backends.ModelBackend',
 
 ]
 
-if 'test' in sys.argv:
-    DATABASES['default'] = {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
-    }
+# Rendered ProductListView responses, keyed by the seller's catalog_version
+# (read from the database), so product writes from any worker invalidate them.
+# BACKEND can be task.cache.DjangoCacheBackend to use a CACHES alias (file, Redis...).
+PRODUCT_LIST_CACHE = {
+    'ENABLED': True,
+    'BACKEND': 'task.cache.LocMemLRUBackend',
+    'OPTIONS': {
+        'max_entries': 1024,
+        'max_bytes': 64 * 1024 * 1024,
+    },
+}
+
+PRODUCT_BULK_CREATE = {
+    'CHUNK_SIZE': 1000,
+    'MAX_CHUNK_SIZE': 5000,
+    'MAX_ROWS': 100000,
+}
+
+# Threads (and so DB connections) used by the async views for ORM work.
+ASYNC_SYNC_WORKERS = env.int('ASYNC_SYNC_WORKERS', default=8)
 
+# Rows fetched per round trip by the streaming catalog export.
+PRODUCT_EXPORT_CHUNK_SIZE = 2000
 
+# Admin change lists of tables larger than this take their row count from
+# the database statistics (Postgres, MySQL) rather than COUNT(*).
+ADMIN_ESTIMATED_COUNT_THRESHOLD = env.int('ADMIN_ESTIMATED_COUNT_THRESHOLD', default=100000)
+
+# Signups per client address and time window ("<count>/<s|m|h|d>", None to
+# disable). Counters live in BACKEND: task.throttling.LocMemRateStore (per
+# process) or task.throttling.CacheRateStore with OPTIONS {'alias': ...} to
+# share them across workers.
+SIGNUP_THROTTLE = {
+    'RATE': env('SIGNUP_THROTTLE_RATE', default='20/min'),
+    'BACKEND': 'task.throttling.LocMemRateStore',
+    'OPTIONS': {},
+}
+
+# DB-backed background jobs run by `manage.py run_jobs`: WORKERS processes,
+# polling every POLL_INTERVAL seconds. A failed job is retried up to
+# MAX_ATTEMPTS times, RETRY_BACKOFF seconds later, doubled per attempt up to
+# RETRY_BACKOFF_MAX; jobs running longer than STALE_AFTER seconds are assumed
+# lost with their worker and queued again. Export jobs write to EXPORT_DIR.
+JOB_QUEUE = {
+    'WORKERS': env.int('JOB_WORKERS', default=2),
+    'POLL_INTERVAL': env.float('JOB_POLL_INTERVAL', default=1.0),
+    'MAX_ATTEMPTS': 3,
+    'RETRY_BACKOFF': 10,
+    'RETRY_BACKOFF_MAX': 600,
+    'STALE_AFTER': 3600,
+    'EXPORT_DIR': env('JOB_EXPORT_DIR', default=str(BASE_DIR / 'exports')),
+}
+
+# Threads hashing signup passwords; a signup waiting longer than TIMEOUT
+# seconds for one gets a 503. ALGORITHM hashes new passwords with the costs
+# below (argon2 needs argon2-cffi); stored hashes made with another algorithm
+# or cost are re-hashed when their user logs in.
+PASSWORD_HASHING = {
+    'WORKERS': env.int('PASSWORD_HASHING_WORKERS', default=2),
+    'TIMEOUT': 10.0,
+    'ALGORITHM': env('PASSWORD_HASHER', default='pbkdf2_sha256'),
+    'PBKDF2_ITERATIONS': env.int('PASSWORD_HASHER_ITERATIONS', default=260000),
+    'ARGON2_TIME_COST': env.int('PASSWORD_HASHER_ARGON2_TIME_COST', default=2),
+    'ARGON2_MEMORY_COST': env.int('PASSWORD_HASHER_ARGON2_MEMORY_COST', default=102400),
+    'ARGON2_PARALLELISM': env.int('PASSWORD_HASHER_ARGON2_PARALLELISM', default=8),
+}
+
+_password_hashers = {
+    'pbkdf2_sha256': 'task.hashers.PBKDF2PasswordHasher',
+    'argon2': 'task.hashers.Argon2PasswordHasher',
+    'pbkdf2_sha1': 'django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher',
+    'bcrypt_sha256': 'django.contrib.auth.hashers.BCryptSHA256PasswordHasher',
+}
+# The first one hashes new passwords, the others only verify existing hashes.
+PASSWORD_HASHERS = [
+    _password_hashers[PASSWORD_HASHING['ALGORITHM']],
+    *(path for name, path in _password_hashers.items() if name != PASSWORD_HASHING['ALGORITHM']),
+]
+
+# Runs the suite on every core (DJANGO_TEST_PROCESSES or --parallel N to
+# override) and reports its wall time; see task.runner.
+TEST_RUNNER = 'task.runner.TimedTestRunner'
+
+if 'test' in sys.argv:
+    # Test databases live in memory (TEST NAME); parallel workers each get
+    # their own copy of them when forked.
+    DATABASES = {
+        'default': {
+            'ENGINE': 'task.db.backends.sqlite3',
+            'NAME': BASE_DIR / 'db.sqlite3',
+            'CONN_HEALTH_CHECKS': True,
+            'TEST': {'NAME': ':memory:'},
+        },
+        # A separate database standing in for a replica; tests that route to
+        # it opt in with override_settings(READ_REPLICAS=...).
+        'replica': {
+            'ENGINE': 'task.db.backends.sqlite3',
+            'NAME': BASE_DIR / 'db_replica.sqlite3',
+            'TEST': {'NAME': ':memory:'},
+        },
+    }
+    READ_REPLICAS['DATABASES'] = []
+    # Test transactions are rolled back, so cached pages would leak between tests.
+    PRODUCT_LIST_CACHE['ENABLED'] = False
+    # Every test client signs up from the same address.
+    SIGNUP_THROTTLE['RATE'] = None
+    # Hashing is not under test in most tests; a single MD5 round keeps
+    # factories and logins from dominating the suite's run time. MD5 is only
+    # ever accepted here, never by a deployed instance.
+    PASSWORD_HASHERS = ['django.contrib.auth.hashers.MD5PasswordHasher', *PASSWORD_HASHERS]
+
+
+# JSON is encoded and decoded with orjson. Clients can also ask for
+# MessagePack through Accept / Content-Type: application/msgpack.
+# Throttles identify clients by REMOTE_ADDR. Behind NUM_PROXIES load balancers
+# appending to X-Forwarded-For, the address the outermost one saw is used
+# instead; left unset, DRF would key on the header as the client sent it.
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
+        'task.authentication.CachedTokenAuthentication',
         'rest_framework.authentication.BasicAuthentication',
         'rest_framework.authentication.SessionAuthentication',
 
     ],
+    'DEFAULT_RENDERER_CLASSES': [
+        'task.renderers.ORJSONRenderer',
+        'task.renderers.MessagePackRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
+    'DEFAULT_PARSER_CLASSES': [
+        'task.parsers.ORJSONParser',
+        'task.parsers.MessagePackParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ],
+    'NUM_PROXIES': env.int('NUM_PROXIES', default=0),
 }
+# In-process cache of token -> user lookups done by CachedTokenAuthentication.
+# Revoking a token or deactivating a user only clears the cache of the worker
+# that did it: the other workers accept the old credentials for up to TTL
+# seconds. Lower TTL to shorten that window; 0 disables the cache.
+TOKEN_AUTH_CACHE = {
+    'TTL': env.int('TOKEN_AUTH_CACHE_TTL', default=60),
+    'MAX_ENTRIES': 10000,
+}
+
 # Password validation
 # https://docs.djangoproject.com/en/3.2/ref/settings/#auth-password-validators
 
@@ -0,0 +1,37 @@
+"""
+API-only profile: ``DJANGO_SETTINGS_MODULE=project.settings_api``.
+
+``project.settings_production`` for pods that only serve the JSON endpoints
+(signup/, login/, metrics/ and task/): the admin, messages, static files,
+templates and browsable API are left out, so workers start without importing
+them. Serve the admin from pods running ``project.settings_production``.
+``manage.py startup_report`` compares the start-up cost of both profiles.
+"""
+from project.settings_production import *  # noqa: F401,F403
+from project.settings_production import INSTALLED_APPS, MIDDLEWARE, REST_FRAMEWORK
+
+_html_apps = {
+    'django.contrib.admin',
+    'django.contrib.messages',
+    'django.contrib.staticfiles',
+}
+INSTALLED_APPS = [app for app in INSTALLED_APPS if app not in _html_apps]
+
+_html_middleware = {
+    'django.contrib.messages.middleware.MessageMiddleware',
+    'django.middleware.clickjacking.XFrameOptionsMiddleware',
+}
+MIDDLEWARE = [middleware for middleware in MIDDLEWARE if middleware not in _html_middleware]
+
+ROOT_URLCONF = 'project.urls_api'
+
+# No template engine: error pages fall back to Django's plain-text bodies.
+TEMPLATES = []
+
+REST_FRAMEWORK = dict(
+    REST_FRAMEWORK,
+    DEFAULT_RENDERER_CLASSES=[
+        renderer for renderer in REST_FRAMEWORK['DEFAULT_RENDERER_CLASSES']
+        if renderer != 'rest_framework.renderers.BrowsableAPIRenderer'
+    ],
+)
@@ -0,0 +1,15 @@
+"""
+Production profile: ``DJANGO_SETTINGS_MODULE=project.settings_production``.
+
+Same as ``project.settings`` with DEBUG off (DEBUG keeps every executed SQL
+query in memory for the lifetime of a request) and hosts and secrets taken
+from the environment.
+"""
+from project.settings import *  # noqa: F401,F403
+from project.settings import env
+
+DEBUG = False
+
+SECRET_KEY = env('SECRET_KEY')
+
+ALLOWED_HOSTS = env.list('ALLOWED_HOSTS', default=['*'])
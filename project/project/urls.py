@@ -1,13 +1,12 @@
 from django.contrib import admin
 from django.urls import path, include
-from task.views import UserRegistrationAPIView, UserLoginAPIView
+
+from project import urls_api
 
 
 urlpatterns = [
     path('admin/', admin.site.urls),
     path('api-auth/', include('rest_framework.urls')),
-    path('signup/', UserRegistrationAPIView.as_view(), name='signup'),
-    path('login/', UserLoginAPIView.as_view(), name='login'),
-    path('task/', include('task.urls', namespace='task')),
+    *urls_api.urlpatterns,
 
 ]
@@ -0,0 +1,11 @@
+from django.urls import path, include
+from task.views import UserRegistrationAPIView, UserLoginAPIView, MetricsView
+
+
+urlpatterns = [
+    path('signup/', UserRegistrationAPIView.as_view(), name='signup'),
+    path('login/', UserLoginAPIView.as_view(), name='login'),
+    path('metrics/', MetricsView.as_view(), name='metrics'),
+    path('task/', include('task.urls', namespace='task')),
+
+]
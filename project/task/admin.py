@@ -1,6 +1,67 @@
-from django.contrib import admin
-from .models import User, Product
-# Register your models here.
+from django.contrib import admin, messages
+from django.utils.translation import gettext_lazy as _, ngettext
 
-admin.site.register(User)
-admin.site.register(Product)
+from task.authentication import token_cache
+from task.bulk import clear_product_prices, delete_products
+from task.models import User, Product
+from task.pagination import EstimatedCountPaginator
+
+
+class LargeTableAdmin(admin.ModelAdmin):
+    """
+    Change list settings for tables with millions of rows: counts come from
+    the database statistics and the extra unfiltered ``COUNT(*)`` shown next
+    to search results is skipped.
+    """
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+    list_per_page = 50
+
+    def get_actions(self, request):
+        # delete_selected loads every selected row and its relations first.
+        actions = super().get_actions(request)
+        actions.pop('delete_selected', None)
+        return actions
+
+
+@admin.register(User)
+class UserAdmin(LargeTableAdmin):
+    list_display = ('email', 'username', 'is_active', 'is_staff', 'date_joined')
+    # Prefix lookups on the unique columns, which Postgres answers from their
+    # varchar_pattern_ops indexes; they also drive the seller autocomplete.
+    search_fields = ('email__startswith', 'username__startswith')
+    ordering = ('email',)
+    actions = ['deactivate_users']
+
+    @admin.action(description=_('Deactivate selected users'), permissions=['change'])
+    def deactivate_users(self, request, queryset):
+        user_ids = set(queryset.values_list('pk', flat=True))
+        updated = User.objects.filter(pk__in=user_ids).update(is_active=False)
+        # update() sends no post_save, which is what normally drops cached tokens.
+        if len(token_cache):
+            token_cache.delete_where(lambda cached: cached[0].pk in user_ids)
+        self.message_user(request, ngettext(
+            '%d user was deactivated.', '%d users were deactivated.', updated) % updated, messages.SUCCESS)
+
+
+@admin.register(Product)
+class ProductAdmin(LargeTableAdmin):
+    list_display = ('id', 'name', 'price', 'seller')
+    list_select_related = ('seller',)
+    # name is served by the trigram index on UPPER(name) on Postgres.
+    search_fields = ('name', 'seller__email__exact')
+    autocomplete_fields = ('seller',)
+    actions = ['delete_products', 'clear_prices']
+
+    @admin.action(description=_('Delete selected products'), permissions=['delete'])
+    def delete_products(self, request, queryset):
+        deleted = delete_products(queryset)
+        self.message_user(request, ngettext(
+            '%d product was deleted.', '%d products were deleted.', deleted) % deleted, messages.SUCCESS)
+
+    @admin.action(description=_('Clear the price of selected products'), permissions=['change'])
+    def clear_prices(self, request, queryset):
+        updated = clear_product_prices(queryset)
+        self.message_user(request, ngettext(
+            '%d product price was cleared.', '%d product prices were cleared.', updated) % updated,
+            messages.SUCCESS)
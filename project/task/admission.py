@@ -0,0 +1,198 @@
+import math
+import threading
+import time
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+from django.utils.translation import gettext_lazy as _
+from rest_framework import status
+from rest_framework.exceptions import APIException
+
+
+class Overloaded(APIException):
+    status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    default_detail = _('Server overloaded, try again later.')
+    default_code = 'overloaded'
+
+
+class EndpointLimit:
+    """
+    Concurrency limit of one endpoint, adapted to its latency.
+
+    Two moving averages of the request latency are kept: a short one (last
+    ~10 requests) and a long one (~100 requests) standing for the latency
+    the endpoint has without contention. While the short average stays
+    within ``tolerance`` times the long one the limit grows by about its
+    square root per update; past it, the limit shrinks in proportion, down
+    to half per update. The limit only grows while at least half of it is
+    in use, so an idle endpoint doesn't accumulate headroom it never
+    tested.
+    """
+
+    short_weight = 0.1
+    long_weight = 0.01
+
+    def __init__(self, priority, initial_limit=20, min_limit=1, max_limit=200, tolerance=2.0, smoothing=0.2):
+        self.priority = priority
+        self.limit = float(initial_limit)
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.tolerance = tolerance
+        self.smoothing = smoothing
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self.admitted = 0
+        self.rejected = 0
+        self.short_latency = None
+        self.long_latency = None
+
+    def record(self, latency, in_flight):
+        if self.short_latency is None:
+            self.short_latency = self.long_latency = latency
+            return
+        self.short_latency += (latency - self.short_latency) * self.short_weight
+        self.long_latency += (latency - self.long_latency) * self.long_weight
+        if self.long_latency > 2 * self.short_latency:
+            # Load went down: let the baseline catch up with faster responses.
+            self.long_latency *= 0.95
+
+        gradient = max(0.5, min(1.0, self.tolerance * self.long_latency / self.short_latency))
+        new_limit = self.limit * gradient + math.sqrt(self.limit)
+        if in_flight < self.limit / 2:
+            new_limit = min(new_limit, self.limit)
+        new_limit = self.limit * (1 - self.smoothing) + new_limit * self.smoothing
+        self.limit = max(self.min_limit, min(self.max_limit, new_limit))
+
+    def stats(self):
+        return {
+            'priority': self.priority,
+            'limit': round(self.limit, 2),
+            'in_flight': self.in_flight,
+            'peak_in_flight': self.peak_in_flight,
+            'admitted': self.admitted,
+            'rejected': self.rejected,
+            'latency_ms': round(self.short_latency * 1000, 3) if self.short_latency is not None else None,
+            'baseline_latency_ms': round(self.long_latency * 1000, 3) if self.long_latency is not None else None,
+        }
+
+
+class AdmissionController:
+    """
+    Admits or sheds requests before their view runs, per worker process.
+
+    A request is admitted when its endpoint (URL name) is under its
+    adaptive ``EndpointLimit`` and the process has fewer than
+    ``max_in_flight`` requests in progress times the share of the
+    endpoint's priority. Lower priorities get a smaller share, so bulk
+    exports are shed first and the last slots stay free for logins and
+    product creation. Rejected requests are not queued: the caller answers
+    them with ``Overloaded`` (503).
+    """
+
+    def __init__(self, max_in_flight=64, priorities=None, default_priority='normal', priority_shares=None,
+                 initial_limit=20, min_limit=1, max_limit=200, tolerance=2.0, smoothing=0.2):
+        self.max_in_flight = max_in_flight
+        self.priorities = priorities or {}
+        self.default_priority = default_priority
+        self.priority_shares = priority_shares or {}
+        self.limit_options = {
+            'initial_limit': initial_limit, 'min_limit': min_limit, 'max_limit': max_limit,
+            'tolerance': tolerance, 'smoothing': smoothing,
+        }
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self._endpoints = {}
+        self._lock = threading.Lock()
+
+    def _endpoint(self, name):
+        endpoint = self._endpoints.get(name)
+        if endpoint is None:
+            priority = self.priorities.get(name, self.default_priority)
+            endpoint = self._endpoints[name] = EndpointLimit(priority, **self.limit_options)
+        return endpoint
+
+    def acquire(self, name):
+        """Take a slot for a request to endpoint ``name``; ``False`` when it must be shed."""
+        with self._lock:
+            endpoint = self._endpoint(name)
+            share = self.priority_shares.get(endpoint.priority, 1.0)
+            if endpoint.in_flight >= endpoint.limit or self.in_flight >= self.max_in_flight * share:
+                endpoint.rejected += 1
+                return False
+            endpoint.in_flight += 1
+            endpoint.admitted += 1
+            endpoint.peak_in_flight = max(endpoint.peak_in_flight, endpoint.in_flight)
+            self.in_flight += 1
+            self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+            return True
+
+    def release(self, name, latency):
+        """Free the slot taken by ``acquire`` and feed the request latency to the endpoint limit."""
+        with self._lock:
+            endpoint = self._endpoints[name]
+            endpoint.record(latency, endpoint.in_flight)
+            endpoint.in_flight -= 1
+            self.in_flight -= 1
+
+    def stats(self):
+        with self._lock:
+            endpoints = {name: endpoint.stats() for name, endpoint in sorted(self._endpoints.items())}
+            return {
+                'max_in_flight': self.max_in_flight,
+                'in_flight': self.in_flight,
+                'peak_in_flight': self.peak_in_flight,
+                'admitted': sum(endpoint['admitted'] for endpoint in endpoints.values()),
+                'rejected': sum(endpoint['rejected'] for endpoint in endpoints.values()),
+                'endpoints': endpoints,
+            }
+
+
+_controller = None
+_controller_lock = threading.Lock()
+
+
+def get_admission_controller():
+    """Return the configured ``AdmissionController``, or ``None`` when disabled."""
+    global _controller
+    config = getattr(settings, 'ADMISSION_CONTROL', {})
+    if not config.get('ENABLED', False):
+        return None
+    if _controller is None:
+        with _controller_lock:
+            if _controller is None:
+                _controller = AdmissionController(
+                    max_in_flight=config.get('MAX_IN_FLIGHT', 64),
+                    priorities=config.get('PRIORITIES', {}),
+                    default_priority=config.get('DEFAULT_PRIORITY', 'normal'),
+                    priority_shares=config.get('PRIORITY_SHARES', {}),
+                    initial_limit=config.get('INITIAL_LIMIT', 20),
+                    min_limit=config.get('MIN_LIMIT', 1),
+                    max_limit=config.get('MAX_LIMIT', 200),
+                    tolerance=config.get('TOLERANCE', 2.0),
+                    smoothing=config.get('SMOOTHING', 0.2),
+                )
+    return _controller
+
+
+def check_worker_concurrency(worker_class):
+    """
+    Raise ``ImproperlyConfigured`` when admission control is enabled but
+    ``worker_class`` (gunicorn's resolved worker class) serves one request
+    at a time: every endpoint would always have one request in flight, so
+    nothing would ever be shed.
+    """
+    config = getattr(settings, 'ADMISSION_CONTROL', {})
+    if config.get('ENABLED', False) and worker_class in ('sync', 'gunicorn.workers.sync.SyncWorker'):
+        raise ImproperlyConfigured(
+            'ADMISSION_CONTROL needs workers serving concurrent requests: set GUNICORN_THREADS above 1, '
+            'or use an async worker class.'
+        )
+
+
+@receiver(setting_changed)
+def reset_admission_controller(*, setting, **kwargs):
+    global _controller
+    if setting == 'ADMISSION_CONTROL':
+        _controller = None
@@ -0,0 +1,91 @@
+import copy
+
+from django.conf import settings
+from django.contrib.auth.models import AnonymousUser
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+from rest_framework.authentication import TokenAuthentication, get_authorization_header
+from rest_framework.exceptions import APIException
+from rest_framework.request import Request
+from rest_framework.settings import api_settings
+
+from task.cache import TTLCache
+from task.concurrency import run_sync
+
+
+def _token_cache_options():
+    config = getattr(settings, 'TOKEN_AUTH_CACHE', {})
+    return {'ttl': config.get('TTL', 60), 'max_entries': config.get('MAX_ENTRIES', 10000)}
+
+
+token_cache = TTLCache(**_token_cache_options())
+
+
+@receiver(setting_changed)
+def reset_token_cache(*, setting, **kwargs):
+    # Reconfigured in place: signals and the admin hold a reference to it.
+    if setting == 'TOKEN_AUTH_CACHE':
+        for name, value in _token_cache_options().items():
+            setattr(token_cache, name, value)
+        token_cache.clear()
+
+
+def get_cached_credentials(key):
+    """Return ``(user, token)`` for a cached token key, or ``None``."""
+    cached = token_cache.get(key)
+    if cached is None:
+        return None
+    user, token = cached
+    user = copy.copy(user)
+    user.is_cached_credential = True
+    return user, token
+
+
+class CachedTokenAuthentication(TokenAuthentication):
+    """
+    ``TokenAuthentication`` with an in-process TTL cache in front of the token
+    lookup, so a repeat request is authenticated by a dict lookup instead of
+    a query (and never by a password hash like ``BasicAuthentication``).
+
+    The cache is per process: deleting a token or saving its user drops the
+    entries of the worker doing it only. Every other worker keeps accepting
+    the revoked token, or the user as it was, until its entry expires, i.e.
+    for up to ``TOKEN_AUTH_CACHE['TTL']`` seconds; a TTL of 0 turns the cache
+    off. Users returned from the cache are flagged with
+    ``is_cached_credential`` since fields updated through
+    ``QuerySet.update`` (e.g. ``catalog_version``) may be stale.
+    """
+
+    def authenticate_credentials(self, key):
+        cached = get_cached_credentials(key)
+        if cached is not None:
+            return cached
+        user, token = super().authenticate_credentials(key)
+        if token_cache.ttl > 0:
+            token_cache.set(key, (user, token))
+        return user, token
+
+
+def _authenticate_sync(request):
+    authenticators = [auth() for auth in api_settings.DEFAULT_AUTHENTICATION_CLASSES]
+    return Request(request, authenticators=authenticators).user
+
+
+async def aauthenticate(request):
+    """
+    Authenticate a plain Django request from an async view.
+
+    A token found in the in-process cache is resolved on the event loop with
+    no thread hop; everything else (token cache misses, Basic, session) runs
+    the configured DRF authenticators on the bounded sync pool. Returns an
+    ``AnonymousUser`` when no or invalid credentials are given.
+    """
+    auth = get_authorization_header(request).split()
+    if len(auth) == 2 and auth[0].lower() == CachedTokenAuthentication.keyword.lower().encode():
+        cached = get_cached_credentials(auth[1].decode('latin-1'))
+        if cached is not None:
+            return cached[0]
+    try:
+        return await run_sync(_authenticate_sync, request)
+    except APIException:
+        return AnonymousUser()
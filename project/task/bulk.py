@@ -0,0 +1,138 @@
+import time
+
+from django.conf import settings
+from django.db import connections, transaction
+from django.utils.translation import gettext as _
+from rest_framework.exceptions import ValidationError
+
+from task.models import Product, User
+from task.serializers import ProductBulkRowSerializer
+from task.signals import seller_catalog_changed
+from task.stats import apply_seller_stats_deltas, product_deltas, queryset_deltas
+
+
+def get_bulk_create_setting(name):
+    return settings.PRODUCT_BULK_CREATE[name]
+
+
+def too_many_rows(max_rows):
+    """The error of an import over ``MAX_ROWS``, whichever path it takes."""
+    return ValidationError({'non_field_errors': [
+        _('A bulk import accepts at most %(max_rows)d rows.') % {'max_rows': max_rows}]})
+
+
+def _chunks(rows, size):
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def bulk_create_products(rows, chunk_size=None, max_rows=None):
+    """
+    Validate and insert ``rows`` (an iterable of dicts) in chunks.
+
+    Invalid rows are skipped and reported with their zero-based index; valid
+    rows are inserted with ``bulk_create`` inside a single transaction. Since
+    ``bulk_create`` bypasses model signals, the affected sellers' stats and
+    catalog versions are updated once at the end.
+    """
+    chunk_size = chunk_size or get_bulk_create_setting('CHUNK_SIZE')
+    max_rows = max_rows or get_bulk_create_setting('MAX_ROWS')
+    row_serializer = ProductBulkRowSerializer()
+    errors = []
+    created = 0
+    received = 0
+    changes = []
+    started = time.perf_counter()
+
+    with transaction.atomic():
+        for chunk in _chunks(rows, chunk_size):
+            if received + len(chunk) > max_rows:
+                raise too_many_rows(max_rows)
+            validated = []
+            for offset, row in enumerate(chunk):
+                index = received + offset
+                if not isinstance(row, dict):
+                    errors.append({'index': index, 'errors': {'non_field_errors': [_('Expected a JSON object.')]}})
+                    continue
+                try:
+                    validated.append((index, row_serializer.run_validation(row)))
+                except ValidationError as exc:
+                    errors.append({'index': index, 'errors': exc.detail})
+            received += len(chunk)
+
+            seller_ids = {data['seller'] for _index, data in validated if data.get('seller') is not None}
+            existing = set(User.objects.filter(pk__in=seller_ids).values_list('pk', flat=True)) if seller_ids else set()
+            products = []
+            for index, data in validated:
+                seller_id = data.pop('seller', None)
+                if seller_id is not None and seller_id not in existing:
+                    errors.append({'index': index, 'errors': {'seller': [
+                        _('Invalid pk "%(pk_value)s" - object does not exist.') % {'pk_value': seller_id}]}})
+                    continue
+                products.append(Product(seller_id=seller_id, **data))
+            Product.objects.bulk_create(products, batch_size=chunk_size)
+            created += len(products)
+            changes.extend((product.seller_id, product.price, 1) for product in products)
+
+        deltas = product_deltas(changes)
+        apply_seller_stats_deltas(deltas)
+        seller_catalog_changed(*deltas)
+
+    elapsed = time.perf_counter() - started
+    errors.sort(key=lambda error: error['index'])
+    return {
+        'received': received,
+        'created': created,
+        'failed': len(errors),
+        'errors': errors,
+        'elapsed_ms': round(elapsed * 1000, 3),
+        'rows_per_second': round(created / elapsed, 1) if elapsed else None,
+    }
+
+
+def delete_products(products):
+    """
+    Delete ``products`` with a single DELETE statement. ``QuerySet.delete()``
+    would load every row to send its delete signals; instead the affected
+    sellers' stats and catalog versions are updated once from a grouped
+    aggregate. Returns the number of rows deleted.
+    """
+    connection = connections[products.db]
+    with transaction.atomic(using=products.db):
+        deltas = queryset_deltas(products, sign=-1)
+        # A raw DELETE of the matching primary keys sends no signals, which is
+        # the point: the stats are adjusted above. Nothing references a
+        # product, so there's nothing for the collector to cascade either.
+        pks, params = products.order_by().values('pk').query.get_compiler(connection=connection).as_sql()
+        with connection.cursor() as cursor:
+            cursor.execute('DELETE FROM {} WHERE {} IN ({})'.format(
+                connection.ops.quote_name(Product._meta.db_table),
+                connection.ops.quote_name(Product._meta.pk.column), pks,
+            ), params)
+            deleted = cursor.rowcount
+        apply_seller_stats_deltas(deltas)
+        seller_catalog_changed(*deltas)
+    return deleted
+
+
+def clear_product_prices(products):
+    """
+    Set the price of ``products`` to NULL with a single UPDATE statement and
+    adjust the sellers' stats to match. Returns the number of rows updated.
+    """
+    with transaction.atomic(using=products.db):
+        # The products stay, only their priced count and price sum go away.
+        deltas = {
+            seller_id: (0, priced_count, price_sum)
+            for seller_id, (_count, priced_count, price_sum) in queryset_deltas(products, sign=-1).items()
+        }
+        updated = products.update(price=None)
+        apply_seller_stats_deltas(deltas)
+        seller_catalog_changed(*deltas)
+    return updated
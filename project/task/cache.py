@@ -0,0 +1,208 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+from django.utils.module_loading import import_string
+
+
+class LocMemLRUBackend:
+    """
+    Process-local LRU store bounded by entry count and total bytes.
+
+    The least recently used entries are evicted first once either bound is
+    exceeded. Values must be ``bytes`` (or ``str``) so their size is known.
+    """
+
+    def __init__(self, max_entries=1024, max_bytes=64 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._data = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            try:
+                self._data.move_to_end(key)
+            except KeyError:
+                return None
+            return self._data[key]
+
+    def set(self, key, value):
+        size = len(value)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            old = self._data.pop(key, None)
+            if old is not None:
+                self._size -= len(old)
+            self._data[key] = value
+            self._size += size
+            while len(self._data) > self.max_entries or self._size > self.max_bytes:
+                _, evicted = self._data.popitem(last=False)
+                self._size -= len(evicted)
+
+    def delete(self, key):
+        with self._lock:
+            old = self._data.pop(key, None)
+            if old is not None:
+                self._size -= len(old)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self._size = 0
+
+
+class DjangoCacheBackend:
+    """
+    Adapter over a ``settings.CACHES`` alias, so the file-based, memcached or
+    Redis cache backends can hold the rendered listings.
+    """
+
+    def __init__(self, alias='default', timeout=None):
+        self.cache = caches[alias]
+        self.timeout = timeout
+
+    def get(self, key):
+        return self.cache.get(key)
+
+    def set(self, key, value):
+        self.cache.set(key, value, self.timeout)
+
+    def delete(self, key):
+        self.cache.delete(key)
+
+    def clear(self):
+        self.cache.clear()
+
+
+class TTLCache:
+    """
+    Process-local mapping whose entries expire ``ttl`` seconds after being set.
+
+    Bounded to ``max_entries``; when full, the entry inserted first is dropped.
+    """
+
+    def __init__(self, ttl=60, max_entries=10000):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return None
+            value, expires_at = item
+            if expires_at <= time.monotonic():
+                del self._data[key]
+                return None
+            return value
+
+    def set(self, key, value):
+        with self._lock:
+            self._data.pop(key, None)
+            self._data[key] = (value, time.monotonic() + self.ttl)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def delete_where(self, predicate):
+        """Drop every entry whose value matches ``predicate``."""
+        with self._lock:
+            for key in [key for key, (value, _) in self._data.items() if predicate(value)]:
+                del self._data[key]
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+
+class ProductListCache:
+    """
+    Rendered ``ProductListView`` responses keyed by seller, catalog version,
+    request URL and accepted media type.
+
+    The catalog version is the seller's ``User.catalog_version``, read from
+    the database and bumped on every product write, so an entry can't
+    outlive the catalog it was rendered from in any worker, even with a
+    process-local backend. Entries of older versions are never read again
+    and are reclaimed by the backend's eviction.
+    """
+    key_prefix = 'product-list'
+
+    def __init__(self, backend):
+        self.backend = backend
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def make_key(self, seller_id, catalog_version, url, media_type):
+        # The media type's params (e.g. ``indent``) change the body too.
+        digest = hashlib.sha1('{} {}'.format(url, media_type).encode('utf-8')).hexdigest()
+        return '{}:{}:{}:{}'.format(self.key_prefix, seller_id, catalog_version, digest)
+
+    def get(self, key):
+        content = self.backend.get(key)
+        with self._lock:
+            if content is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return content
+
+    def set(self, key, content):
+        self.backend.set(key, content)
+
+    def clear(self):
+        self.backend.clear()
+        with self._lock:
+            self.hits = self.misses = 0
+
+    def stats(self):
+        with self._lock:
+            hits, misses = self.hits, self.misses
+        total = hits + misses
+        return {
+            'hits': hits,
+            'misses': misses,
+            'hit_ratio': hits / total if total else 0.0,
+        }
+
+
+_product_list_cache = None
+_product_list_cache_lock = threading.Lock()
+
+
+def get_product_list_cache():
+    """Return the configured ``ProductListCache``, or ``None`` when disabled."""
+    global _product_list_cache
+    config = getattr(settings, 'PRODUCT_LIST_CACHE', {})
+    if not config.get('ENABLED', False):
+        return None
+    if _product_list_cache is None:
+        with _product_list_cache_lock:
+            if _product_list_cache is None:
+                backend_class = import_string(config.get('BACKEND', 'task.cache.LocMemLRUBackend'))
+                _product_list_cache = ProductListCache(backend_class(**config.get('OPTIONS', {})))
+    return _product_list_cache
+
+
+@receiver(setting_changed)
+def reset_product_list_cache(*, setting, **kwargs):
+    global _product_list_cache
+    if setting == 'PRODUCT_LIST_CACHE':
+        _product_list_cache = None
@@ -0,0 +1,110 @@
+import asyncio
+import contextvars
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor, TimeoutError
+
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+from django.core.signals import setting_changed
+from django.db import close_old_connections
+from django.dispatch import receiver
+from django.utils.translation import gettext_lazy as _
+from rest_framework import status
+from rest_framework.exceptions import APIException
+
+from task.db.pool import get_connection_pool
+
+_executor = None
+_executor_lock = threading.Lock()
+_password_executor = None
+
+
+def get_executor():
+    """
+    Thread pool that runs the ORM and other blocking work of the async views.
+
+    Every thread keeps its own database connection, so with the connection
+    pool enabled there is one thread per pool slot.
+    """
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                pool = get_connection_pool()
+                max_workers = pool.max_size if pool else getattr(settings, 'ASYNC_SYNC_WORKERS', 8)
+                _executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='task-sync')
+    return _executor
+
+
+def _call_with_connection_cleanup(func, *args, **kwargs):
+    try:
+        return func(*args, **kwargs)
+    finally:
+        # Pool threads never see request_finished; honor CONN_MAX_AGE ourselves.
+        close_old_connections()
+
+
+async def run_sync(func, *args, **kwargs):
+    """
+    Await ``func(*args, **kwargs)`` on the bounded thread pool.
+
+    Unlike ``sync_to_async(thread_sensitive=True)``, calls don't queue behind a
+    single shared thread; unlike an unbounded executor, at most
+    ``ASYNC_SYNC_WORKERS`` database connections are held by the pool. With
+    ``DATABASE_POOL`` enabled, callers wait for a slot with a timeout and get
+    a 503 ``PoolTimeout`` instead of queueing without limit.
+    """
+    loop = asyncio.get_running_loop()
+    context = contextvars.copy_context()
+    call = functools.partial(context.run, _call_with_connection_cleanup, func, *args, **kwargs)
+    pool = get_connection_pool()
+    if pool is None:
+        return await loop.run_in_executor(get_executor(), call)
+    async with pool.slot():
+        return await loop.run_in_executor(get_executor(), call)
+
+
+class HashingBusy(APIException):
+    status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    default_detail = _('Too many signups in progress, try again later.')
+    default_code = 'hashing_busy'
+
+
+def get_password_executor():
+    """
+    Thread pool doing the password hashing of signups.
+
+    PBKDF2 releases the GIL, so each worker keeps one core busy; capping the
+    workers keeps a signup spike from taking every core away from the
+    product endpoints.
+    """
+    global _password_executor
+    if _password_executor is None:
+        with _executor_lock:
+            if _password_executor is None:
+                workers = getattr(settings, 'PASSWORD_HASHING', {}).get('WORKERS', 2)
+                _password_executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='task-hash')
+    return _password_executor
+
+
+def hash_password(password):
+    """
+    ``make_password(password)`` on the bounded hashing pool. Raises
+    ``HashingBusy`` (503) when no worker frees up within
+    ``PASSWORD_HASHING['TIMEOUT']`` seconds.
+    """
+    future = get_password_executor().submit(make_password, password)
+    try:
+        return future.result(timeout=getattr(settings, 'PASSWORD_HASHING', {}).get('TIMEOUT', 10.0))
+    except TimeoutError:
+        future.cancel()
+        raise HashingBusy()
+
+
+@receiver(setting_changed)
+def reset_password_executor(*, setting, **kwargs):
+    global _password_executor
+    if setting == 'PASSWORD_HASHING' and _password_executor is not None:
+        _password_executor.shutdown(wait=False)
+        _password_executor = None
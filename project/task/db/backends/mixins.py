@@ -0,0 +1,44 @@
+class HealthCheckMixin:
+    """
+    Health checks for persistent connections (``CONN_MAX_AGE > 0``).
+
+    With ``CONN_HEALTH_CHECKS`` set in the database settings, a connection
+    reused from a previous request is pinged with ``is_usable()`` right before
+    its first query or transaction in the new request, and replaced if the
+    server dropped it. New connections and later queries in the same request
+    skip the ping.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.health_check_enabled = self.settings_dict.get('CONN_HEALTH_CHECKS', False)
+        self.health_check_done = False
+
+    def connect(self):
+        # New connections are healthy; connect() itself calls set_autocommit().
+        self.health_check_done = True
+        super().connect()
+
+    def close_if_health_check_failed(self):
+        if self.connection is None or not self.health_check_enabled or self.health_check_done:
+            return
+        if not self.is_usable():
+            self.close()
+        self.health_check_done = True
+
+    def _cursor(self, name=None):
+        self.close_if_health_check_failed()
+        return super()._cursor(name)
+
+    def set_autocommit(self, autocommit, force_begin_transaction_with_broken_autocommit=False):
+        # A request may start with transaction.atomic(): check before BEGIN, but
+        # never close a connection from inside an atomic block.
+        self.validate_no_atomic_block()
+        self.close_if_health_check_failed()
+        super().set_autocommit(autocommit, force_begin_transaction_with_broken_autocommit)
+
+    def close_if_unusable_or_obsolete(self):
+        # Called at the start and end of every request: the next reuse gets a new check.
+        if self.connection is not None:
+            self.health_check_done = False
+        super().close_if_unusable_or_obsolete()
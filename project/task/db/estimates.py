@@ -0,0 +1,26 @@
+from django.db import connections
+
+
+def estimate_row_count(model, using='default'):
+    """
+    Row count of ``model``'s table from the database statistics, without
+    scanning it, or ``None`` when the backend keeps none. The estimate is as
+    fresh as the last ANALYZE (autovacuum on Postgres).
+    """
+    connection = connections[using]
+    table = model._meta.db_table
+    if connection.vendor == 'postgresql':
+        sql = 'SELECT reltuples FROM pg_class WHERE oid = %s::regclass'
+        params = [connection.ops.quote_name(table)]
+    elif connection.vendor == 'mysql':
+        sql = 'SELECT table_rows FROM information_schema.tables WHERE table_schema = DATABASE() AND table_name = %s'
+        params = [table]
+    else:
+        return None
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        row = cursor.fetchone()
+    # Postgres reports -1 for a table that was never analyzed.
+    if row is None or row[0] is None or row[0] < 0:
+        return None
+    return int(row[0])
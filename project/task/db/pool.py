@@ -0,0 +1,116 @@
+import asyncio
+import threading
+import time
+import weakref
+from contextlib import asynccontextmanager
+
+from django.conf import settings
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+from django.utils.translation import gettext_lazy as _
+from rest_framework import status
+from rest_framework.exceptions import APIException
+
+
+class PoolTimeout(APIException):
+    status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    default_detail = _('Database connection pool exhausted, try again later.')
+    default_code = 'pool_timeout'
+
+
+class ConnectionPool:
+    """
+    Caps how many database connections the async views use at once.
+
+    Each slot is one pool thread holding a persistent connection; callers
+    past ``max_size`` wait up to ``timeout`` seconds for a free slot and get
+    ``PoolTimeout`` (503) instead of queueing forever.
+    """
+
+    def __init__(self, max_size=8, timeout=5.0):
+        self.max_size = max_size
+        self.timeout = timeout
+        self.in_use = 0
+        self.waiting = 0
+        self.peak_in_use = 0
+        self.peak_waiting = 0
+        self.acquired = 0
+        self.timeouts = 0
+        self.total_wait = 0.0
+        self._semaphores = weakref.WeakKeyDictionary()
+        self._lock = threading.Lock()
+
+    def _semaphore(self):
+        # asyncio primitives belong to one event loop; keep one per loop.
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            semaphore = self._semaphores.get(loop)
+            if semaphore is None:
+                semaphore = self._semaphores[loop] = asyncio.Semaphore(self.max_size)
+            return semaphore
+
+    @asynccontextmanager
+    async def slot(self):
+        semaphore = self._semaphore()
+        started = time.perf_counter()
+        with self._lock:
+            self.waiting += 1
+            self.peak_waiting = max(self.peak_waiting, self.waiting)
+        try:
+            await asyncio.wait_for(semaphore.acquire(), self.timeout)
+        except asyncio.TimeoutError:
+            with self._lock:
+                self.timeouts += 1
+            raise PoolTimeout()
+        finally:
+            with self._lock:
+                self.waiting -= 1
+        with self._lock:
+            self.in_use += 1
+            self.acquired += 1
+            self.total_wait += time.perf_counter() - started
+            self.peak_in_use = max(self.peak_in_use, self.in_use)
+        try:
+            yield
+        finally:
+            with self._lock:
+                self.in_use -= 1
+            semaphore.release()
+
+    def stats(self):
+        with self._lock:
+            return {
+                'max_size': self.max_size,
+                'in_use': self.in_use,
+                'waiting': self.waiting,
+                'peak_in_use': self.peak_in_use,
+                'peak_waiting': self.peak_waiting,
+                'saturation': self.in_use / self.max_size,
+                'acquired': self.acquired,
+                'timeouts': self.timeouts,
+                'avg_wait_ms': round(self.total_wait / self.acquired * 1000, 3) if self.acquired else 0.0,
+            }
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_connection_pool():
+    """Return the configured ``ConnectionPool``, or ``None`` when disabled."""
+    global _pool
+    config = getattr(settings, 'DATABASE_POOL', {})
+    if not config.get('ENABLED', False):
+        return None
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = ConnectionPool(max_size=config.get('MAX_SIZE', 8), timeout=config.get('TIMEOUT', 5.0))
+    return _pool
+
+
+@receiver(setting_changed)
+def reset_connection_pool(*, setting, **kwargs):
+    global _pool
+    if setting == 'DATABASE_POOL':
+        _pool = None
@@ -0,0 +1,78 @@
+import csv
+import json
+import os
+import time
+
+from django.conf import settings
+from django.db.models import F
+
+from task.models import Product
+from task.serializers import format_price
+
+EXPORT_FIELDS = ('name', 'price', 'seller')
+
+
+class Echo:
+    """File-like object whose ``write`` returns the value, for streaming ``csv.writer`` output."""
+
+    def write(self, value):
+        return value
+
+
+def export_rows(queryset):
+    """
+    Yield ``(name, price, seller_id)`` tuples straight from a server-side cursor.
+
+    ``values_list`` skips model instantiation, and ``iterator`` keeps only one
+    chunk of rows in memory at a time.
+    """
+    chunk_size = getattr(settings, 'PRODUCT_EXPORT_CHUNK_SIZE', 2000)
+    return (
+        queryset.order_by(F('price').asc(nulls_last=True), 'id')
+        .values_list('name', 'price', 'seller_id')
+        .iterator(chunk_size=chunk_size)
+    )
+
+
+def iter_ndjson(rows):
+    dumps = json.JSONEncoder(ensure_ascii=False, separators=(',', ':')).encode
+    for name, price, seller_id in rows:
+        yield dumps({
+            'name': name,
+            'price': format_price(price),
+            'seller': seller_id,
+        }) + '\n'
+
+
+def iter_csv(rows):
+    writer = csv.writer(Echo())
+    yield writer.writerow(EXPORT_FIELDS)
+    for name, price, seller_id in rows:
+        yield writer.writerow((name, '' if price is None else format_price(price), '' if seller_id is None else seller_id))
+
+
+EXPORT_FORMATS = {
+    'ndjson': ('application/x-ndjson', iter_ndjson),
+    'csv': ('text/csv', iter_csv),
+}
+
+
+def export_catalog(seller_id, export_format='ndjson'):
+    """
+    Write a seller's catalog to a file in ``JOB_QUEUE['EXPORT_DIR']``; the
+    background counterpart of ``ProductExportView``. The result names the
+    file relative to that directory, for ``get_export_path``.
+    """
+    _content_type, render_rows = EXPORT_FORMATS[export_format]
+    export_dir = settings.JOB_QUEUE['EXPORT_DIR']
+    os.makedirs(export_dir, exist_ok=True)
+    file_name = 'products-{}-{}.{}'.format(seller_id, int(time.time() * 1000), export_format)
+    path = os.path.join(export_dir, file_name)
+    with open(path, 'w', newline='', encoding='utf-8') as output:
+        output.writelines(render_rows(export_rows(Product.objects.filter(seller_id=seller_id))))
+    return {'file': file_name, 'format': export_format, 'size': os.path.getsize(path)}
+
+
+def get_export_path(result):
+    """Server path of the file written by ``export_catalog``, given its job result."""
+    return os.path.join(settings.JOB_QUEUE['EXPORT_DIR'], os.path.basename(result['file']))
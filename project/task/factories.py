@@ -1,5 +1,7 @@
 import factory
+import itertools
 import random
+from django.contrib.auth.hashers import make_password
 from task.models import Product, User
 
 
@@ -20,5 +22,44 @@ class UserFactory(factory.django.DjangoModelFactory):
     username = factory.lazy_attribute(
         lambda obj: '{}.{}.{}'.format(obj.first_name, obj.last_name, random.randrange(1, 1000)))
     email = factory.lazy_attribute(lambda obj: '{}@advance.com'.format(obj.username))
-    password = factory.PostGenerationMethodCall('set_password', 'secret')
+    # Hashed at build time so the user is written with one INSERT;
+    # a post-generation set_password() call would save it a second time.
+    password = factory.LazyFunction(lambda: make_password('secret'))
     is_superuser = True
+
+
+_user_sequence = itertools.count()
+
+
+def create_users(count, password='secret', **kwargs):
+    """
+    Build ``count`` users with ``UserFactory`` and insert them with one
+    ``bulk_create``. The password is hashed once and shared by every user.
+    """
+    password_hash = make_password(password)
+    # Overriding password skips hashing it once per user.
+    users = UserFactory.build_batch(count, password=password_hash, **kwargs)
+    for user in users:
+        # Random usernames can collide in large batches; the sequence keeps them unique.
+        user.username = '{}.{}'.format(user.username, next(_user_sequence))
+        user.email = '{}@advance.com'.format(user.username)
+    users = User.objects.bulk_create(users)
+    if users and users[0].pk is None:
+        # Backends that can't return ids from a bulk insert (SQLite on Django 3.2).
+        emails = [user.email for user in users]
+        users = [
+            user
+            for start in range(0, len(emails), 500)
+            for user in User.objects.filter(email__in=emails[start:start + 500])
+        ]
+    return users
+
+
+def create_products(sellers, per_seller, batch_size=1000, **kwargs):
+    """Build ``per_seller`` products for each seller and insert them with ``bulk_create``."""
+    products = [
+        product
+        for seller in sellers
+        for product in ProductFactory.build_batch(per_seller, seller=seller, **kwargs)
+    ]
+    return Product.objects.bulk_create(products, batch_size=batch_size)
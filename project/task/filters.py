@@ -0,0 +1,29 @@
+import django_filters
+
+from task.models import Product
+from task.pagination import PRODUCT_ORDERINGS, get_product_ordering
+
+
+class ProductFilter(django_filters.FilterSet):
+    """
+    Query params of the listing endpoint.
+
+    ``search`` (substring) and ``name`` (prefix) are case-insensitive and
+    served by the trigram index on Postgres; on SQLite they scan the seller's
+    range of the covering listing index. Price bounds and ``ordering`` map
+    onto the (seller, price, id) and (seller, name, id) indexes.
+    """
+    search = django_filters.CharFilter(field_name='name', lookup_expr='icontains')
+    name = django_filters.CharFilter(field_name='name', lookup_expr='istartswith')
+    min_price = django_filters.NumberFilter(field_name='price', lookup_expr='gte')
+    max_price = django_filters.NumberFilter(field_name='price', lookup_expr='lte')
+    ordering = django_filters.ChoiceFilter(
+        choices=[(ordering, ordering) for ordering in PRODUCT_ORDERINGS], method='filter_ordering',
+    )
+
+    class Meta:
+        model = Product
+        fields = ['search', 'name', 'min_price', 'max_price', 'ordering']
+
+    def filter_ordering(self, queryset, name, value):
+        return queryset.order_by(*get_product_ordering(value))
@@ -0,0 +1,38 @@
+from django.conf import settings
+from django.contrib.auth import hashers
+
+
+def _cost(name, default):
+    return getattr(settings, 'PASSWORD_HASHING', {}).get(name, default)
+
+
+class PBKDF2PasswordHasher(hashers.PBKDF2PasswordHasher):
+    """
+    ``pbkdf2_sha256`` with the iteration count taken from
+    ``PASSWORD_HASHING['PBKDF2_ITERATIONS']``. Hashes made with another count
+    are re-hashed the next time their user logs in.
+    """
+
+    @property
+    def iterations(self):
+        return _cost('PBKDF2_ITERATIONS', hashers.PBKDF2PasswordHasher.iterations)
+
+
+class Argon2PasswordHasher(hashers.Argon2PasswordHasher):
+    """
+    ``argon2`` (requires ``argon2-cffi``) with the costs taken from the
+    ``PASSWORD_HASHING['ARGON2_*']`` settings.
+    """
+
+    @property
+    def time_cost(self):
+        return _cost('ARGON2_TIME_COST', hashers.Argon2PasswordHasher.time_cost)
+
+    @property
+    def memory_cost(self):
+        return _cost('ARGON2_MEMORY_COST', hashers.Argon2PasswordHasher.memory_cost)
+
+    @property
+    def parallelism(self):
+        return _cost('ARGON2_PARALLELISM', hashers.Argon2PasswordHasher.parallelism)
+
@@ -0,0 +1,127 @@
+import os
+import socket
+import traceback
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import F
+from django.utils import timezone
+from django.utils.module_loading import import_string
+from rest_framework.exceptions import ValidationError
+
+from task.models import Job
+
+# Job kinds and the functions running them, called with the job payload as
+# keyword arguments. Results must be JSON serializable.
+JOB_FUNCTIONS = {
+    'products.bulk_import': 'task.bulk.bulk_create_products',
+    'products.export': 'task.export.export_catalog',
+    'stats.rebuild': 'task.stats.rebuild_seller_stats',
+    'sessions.purge': 'task.sessions.purge_expired_sessions',
+}
+
+# Errors that would fail the same way on every attempt.
+PERMANENT_ERRORS = (ValidationError, TypeError)
+
+
+def get_job_queue_setting(name):
+    return settings.JOB_QUEUE[name]
+
+
+def worker_name():
+    return '{}:{}'.format(socket.gethostname(), os.getpid())
+
+
+def enqueue(kind, payload=None, owner=None, max_attempts=None):
+    """Store a job for the ``run_jobs`` worker and return it."""
+    if kind not in JOB_FUNCTIONS:
+        raise ValueError('Unknown job kind {!r}.'.format(kind))
+    return Job.objects.create(
+        kind=kind,
+        payload=payload or {},
+        owner=owner,
+        max_attempts=max_attempts or get_job_queue_setting('MAX_ATTEMPTS'),
+    )
+
+
+def retry_delay(attempts):
+    """Seconds before retrying a job that failed ``attempts`` times: doubled per attempt, capped."""
+    backoff = get_job_queue_setting('RETRY_BACKOFF')
+    return min(backoff * 2 ** (attempts - 1), get_job_queue_setting('RETRY_BACKOFF_MAX'))
+
+
+def claim_jobs(limit, locked_by=None):
+    """
+    Mark up to ``limit`` due jobs as running and return their ids.
+
+    Candidates are read from the (status, run_after) index; each is then taken
+    with a conditional UPDATE that only one worker can win, so several workers
+    can poll the same table without a broker or table locks. On Postgres the
+    candidates are also read with SKIP LOCKED so concurrent workers do not
+    even contend for the same rows.
+    """
+    now = timezone.now()
+    candidates = Job.objects.filter(status=Job.QUEUED, run_after__lte=now).order_by('run_after', 'id')
+    if connection.features.has_select_for_update_skip_locked:
+        candidates = candidates.select_for_update(skip_locked=True)
+    claimed = []
+    with transaction.atomic():
+        for pk in candidates.values_list('pk', flat=True)[:limit]:
+            taken = Job.objects.filter(pk=pk, status=Job.QUEUED).update(
+                status=Job.RUNNING,
+                attempts=F('attempts') + 1,
+                locked_by=locked_by or worker_name(),
+                started_at=now,
+            )
+            if taken:
+                claimed.append(pk)
+    return claimed
+
+
+def fail_job(job, error, permanent=False):
+    """
+    Record a failed attempt of a running ``job``: queue it again after
+    ``retry_delay()``, or fail it for good when the error is permanent or the
+    job is out of attempts. Returns the job's new status.
+    """
+    if permanent or job.attempts >= job.max_attempts:
+        Job.objects.filter(pk=job.pk).update(
+            status=Job.FAILED, error=error, locked_by='', finished_at=timezone.now())
+        return Job.FAILED
+    Job.objects.filter(pk=job.pk).update(
+        status=Job.QUEUED,
+        error=error,
+        locked_by='',
+        run_after=timezone.now() + timedelta(seconds=retry_delay(job.attempts)),
+    )
+    return Job.QUEUED
+
+
+def run_job(job_id):
+    """Run a claimed job and record its outcome. Returns the job's new status."""
+    job = Job.objects.get(pk=job_id)
+    try:
+        result = import_string(JOB_FUNCTIONS[job.kind])(**job.payload)
+    except Exception as exc:
+        return fail_job(job, traceback.format_exc(), permanent=isinstance(exc, PERMANENT_ERRORS))
+    Job.objects.filter(pk=job.pk).update(
+        status=Job.SUCCEEDED, result=result, error='', locked_by='', finished_at=timezone.now())
+    return Job.SUCCEEDED
+
+
+def requeue_stale_jobs():
+    """
+    Give jobs left running for more than ``STALE_AFTER`` seconds, e.g. by a
+    worker that was killed, back to the queue, or fail them when they are out
+    of attempts. Returns the number of jobs released.
+    """
+    now = timezone.now()
+    stale = Job.objects.filter(
+        status=Job.RUNNING,
+        started_at__lt=now - timedelta(seconds=get_job_queue_setting('STALE_AFTER')),
+    )
+    failed = stale.filter(attempts__gte=F('max_attempts')).update(
+        status=Job.FAILED, error='Worker lost.', locked_by='', finished_at=now)
+    requeued = stale.update(status=Job.QUEUED, error='Worker lost.', locked_by='', run_after=now)
+    return failed + requeued
@@ -0,0 +1,151 @@
+import base64
+import itertools
+import json
+import math
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test.utils import CaptureQueriesContext, setup_databases, teardown_databases
+from django.urls import reverse
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+from task.factories import create_products, create_users
+
+PASSWORD = 'secret'
+
+
+def percentile(sorted_values, fraction):
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return None
+    rank = max(1, math.ceil(fraction * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+class Command(BaseCommand):
+    help = (
+        'Seed a throwaway test database and report per-endpoint latency '
+        'percentiles, throughput and query counts as JSON.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=50)
+        parser.add_argument('--products', type=int, default=200, help='Products per user.')
+        parser.add_argument('--requests', type=int, default=500, help='Requests per endpoint.')
+        parser.add_argument('--concurrency', type=int, default=8)
+        parser.add_argument('--endpoints', nargs='+', default=['signup', 'login', 'listing', 'create'])
+        parser.add_argument('--output', help='Write the JSON report to this file.')
+        parser.add_argument('--baseline', help='A previous JSON report to compare against.')
+
+    def handle(self, *args, **options):
+        old_config = setup_databases(verbosity=0, interactive=False)
+        try:
+            report = self.run(options)
+        finally:
+            teardown_databases(old_config, verbosity=0)
+
+        if options['baseline']:
+            with open(options['baseline']) as baseline_file:
+                report['comparison'] = self.compare(json.load(baseline_file), report)
+        output = json.dumps(report, indent=2)
+        if options['output']:
+            with open(options['output'], 'w') as output_file:
+                output_file.write(output)
+        self.stdout.write(output)
+
+    def run(self, options):
+        started = time.perf_counter()
+        users = create_users(options['users'], password=PASSWORD)
+        create_products(users, options['products'])
+        tokens = Token.objects.bulk_create([Token(key=Token.generate_key(), user=user) for user in users])
+        seed_seconds = time.perf_counter() - started
+
+        self.users = users
+        self.tokens = [token.key for token in tokens]
+        self.sequence = itertools.count()
+        self.local = threading.local()
+
+        endpoints = {}
+        for name in options['endpoints']:
+            endpoints[name] = self.drive(getattr(self, 'request_' + name), options['requests'], options['concurrency'])
+        return {
+            'config': {key: options[key] for key in ('users', 'products', 'requests', 'concurrency')},
+            'seed_seconds': round(seed_seconds, 3),
+            'endpoints': endpoints,
+        }
+
+    def client(self):
+        client = getattr(self.local, 'client', None)
+        if client is None:
+            # Server errors are counted in the report instead of aborting the run.
+            client = self.local.client = APIClient(raise_request_exception=False)
+        return client
+
+    def request_signup(self, client, index):
+        # One address per signup, as many clients would; a single one is throttled.
+        email = 'bench{}@bench.com'.format(index)
+        return client.post(reverse('signup'), {
+            'username': 'bench{}'.format(index), 'email': email,
+            'password': PASSWORD, 'confirm_password': PASSWORD,
+        }, format='json', REMOTE_ADDR='10.{}.{}.{}'.format(index >> 16 & 255, index >> 8 & 255, index & 255))
+
+    def request_login(self, client, index):
+        user = self.users[index % len(self.users)]
+        credentials = base64.b64encode('{}:{}'.format(user.email, PASSWORD).encode()).decode()
+        return client.get(reverse('login'), HTTP_AUTHORIZATION='Basic ' + credentials)
+
+    def request_listing(self, client, index):
+        token = self.tokens[index % len(self.tokens)]
+        return client.get(reverse('task:listing'), HTTP_AUTHORIZATION='Token ' + token)
+
+    def request_create(self, client, index):
+        token = self.tokens[index % len(self.tokens)]
+        seller = self.users[index % len(self.users)]
+        return client.post(reverse('task:create'), {'name': 'bench', 'price': '9.99', 'seller': seller.pk},
+                           format='json', HTTP_AUTHORIZATION='Token ' + token)
+
+    def timed_request(self, request):
+        index = next(self.sequence)
+        with CaptureQueriesContext(connection) as queries:
+            started = time.perf_counter()
+            response = request(self.client(), index)
+            elapsed = time.perf_counter() - started
+        return elapsed, len(queries), response.status_code
+
+    def drive(self, request, count, concurrency):
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            results = list(executor.map(lambda _: self.timed_request(request), range(count)))
+        wall = time.perf_counter() - started
+
+        latencies = sorted(elapsed for elapsed, _, _ in results)
+        query_counts = [queries for _, queries, _ in results]
+        errors = sum(1 for _, _, status_code in results if status_code >= 400)
+        to_ms = lambda seconds: None if seconds is None else round(seconds * 1000, 3)  # noqa: E731
+        return {
+            'requests': count,
+            'errors': errors,
+            'requests_per_second': round(count / wall, 1),
+            'p50_ms': to_ms(percentile(latencies, 0.50)),
+            'p95_ms': to_ms(percentile(latencies, 0.95)),
+            'p99_ms': to_ms(percentile(latencies, 0.99)),
+            'queries_per_request': round(sum(query_counts) / len(query_counts), 2),
+        }
+
+    def compare(self, baseline, report):
+        """Relative change of each metric against the baseline, in percent."""
+        comparison = {}
+        for name, metrics in report['endpoints'].items():
+            previous = baseline.get('endpoints', {}).get(name)
+            if not previous:
+                continue
+            comparison[name] = {
+                key: round((value - previous[key]) / previous[key] * 100, 1)
+                for key, value in metrics.items()
+                if key not in ('requests', 'errors') and previous.get(key) and value is not None
+            }
+        return comparison
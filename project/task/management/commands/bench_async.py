@@ -0,0 +1,131 @@
+import asyncio
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.handlers.asgi import ASGIHandler
+from django.core.handlers.wsgi import WSGIHandler
+from django.core.management.base import BaseCommand
+from django.test import RequestFactory
+from django.test.utils import setup_databases, teardown_databases
+from django.urls import reverse
+from rest_framework.authtoken.models import Token
+
+from task.factories import create_products, create_users
+
+
+class InFlight:
+    """Counts requests currently being served and remembers the peak."""
+
+    def __init__(self):
+        self.current = 0
+        self.peak = 0
+        self._lock = threading.Lock()
+
+    def __enter__(self):
+        with self._lock:
+            self.current += 1
+            self.peak = max(self.peak, self.current)
+
+    def __exit__(self, *exc_info):
+        with self._lock:
+            self.current -= 1
+
+
+class Command(BaseCommand):
+    help = (
+        'Compare how many concurrent slow clients one worker holds open on the '
+        'async listing (ASGI, one event loop) versus the sync listing (WSGI, a '
+        'fixed number of threads). Each client reads its response body slowly.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--clients', type=int, default=100)
+        parser.add_argument('--delay', type=float, default=0.5, help='Seconds each client takes to read the body.')
+        parser.add_argument('--wsgi-threads', type=int, default=4, help='Threads of the WSGI worker.')
+        parser.add_argument('--products', type=int, default=50)
+
+    def handle(self, *args, **options):
+        old_config = setup_databases(verbosity=0, interactive=False)
+        try:
+            user = create_users(1)[0]
+            create_products([user], options['products'])
+            self.token = Token.objects.create(user=user).key
+            report = {
+                'clients': options['clients'],
+                'delay_seconds': options['delay'],
+                'asgi': self.run_asgi(options['clients'], options['delay']),
+                'wsgi': self.run_wsgi(options['clients'], options['delay'], options['wsgi_threads']),
+            }
+        finally:
+            teardown_databases(old_config, verbosity=0)
+        self.stdout.write(json.dumps(report, indent=2))
+
+    def run_asgi(self, clients, delay):
+        application = ASGIHandler()
+        in_flight = InFlight()
+        path = reverse('task:async-listing')
+
+        async def client():
+            scope = {
+                'type': 'http', 'asgi': {'version': '3.0'}, 'http_version': '1.1',
+                'method': 'GET', 'scheme': 'http', 'path': path, 'query_string': b'',
+                'server': ('testserver', 80), 'client': ('127.0.0.1', 0),
+                'headers': [(b'host', b'testserver'), (b'authorization', 'Token {}'.format(self.token).encode())],
+            }
+            statuses = []
+
+            async def receive():
+                return {'type': 'http.request', 'body': b'', 'more_body': False}
+
+            async def send(message):
+                if message['type'] == 'http.response.start':
+                    statuses.append(message['status'])
+                elif message['type'] == 'http.response.body':
+                    await asyncio.sleep(delay)
+
+            with in_flight:
+                await application(scope, receive, send)
+            return statuses[0]
+
+        async def main():
+            return await asyncio.gather(*(client() for _ in range(clients)))
+
+        started = time.perf_counter()
+        statuses = asyncio.run(main())
+        return self.summary(statuses, time.perf_counter() - started, in_flight)
+
+    def run_wsgi(self, clients, delay, threads):
+        application = WSGIHandler()
+        in_flight = InFlight()
+        environ = RequestFactory()._base_environ(
+            PATH_INFO=reverse('task:listing'), REQUEST_METHOD='GET',
+            HTTP_AUTHORIZATION='Token {}'.format(self.token),
+        )
+
+        def client():
+            statuses = []
+
+            def start_response(status, headers, exc_info=None):
+                statuses.append(int(status.split()[0]))
+
+            with in_flight:
+                response = application(dict(environ), start_response)
+                for _chunk in response:
+                    # A sync worker blocks on the socket write while the client reads slowly.
+                    time.sleep(delay)
+                response.close()
+            return statuses[0]
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=threads) as executor:
+            statuses = list(executor.map(lambda _: client(), range(clients)))
+        return self.summary(statuses, time.perf_counter() - started, in_flight)
+
+    def summary(self, statuses, wall, in_flight):
+        return {
+            'wall_seconds': round(wall, 3),
+            'peak_in_flight': in_flight.peak,
+            'errors': sum(1 for status_code in statuses if status_code >= 400),
+        }
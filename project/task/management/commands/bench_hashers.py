@@ -0,0 +1,58 @@
+import json
+import statistics
+import time
+
+from django.conf import settings
+from django.contrib.auth.hashers import check_password, get_hasher, make_password
+from django.core.management.base import BaseCommand
+from django.test import override_settings
+
+PROFILES = {
+    'pbkdf2_sha256@100000': ('pbkdf2_sha256', {'PBKDF2_ITERATIONS': 100000}),
+    'pbkdf2_sha256@260000': ('pbkdf2_sha256', {'PBKDF2_ITERATIONS': 260000}),
+    'pbkdf2_sha256@390000': ('pbkdf2_sha256', {'PBKDF2_ITERATIONS': 390000}),
+    'argon2': ('argon2', {}),
+    'bcrypt_sha256': ('bcrypt_sha256', {}),
+}
+
+
+class Command(BaseCommand):
+    help = (
+        'Report the time to hash and to check one password for the configured '
+        'hasher and a set of algorithm/cost profiles. Profiles whose library '
+        'is not installed are reported as unavailable.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--repeat', type=int, default=10)
+
+    def handle(self, *args, **options):
+        report = {'configured': self.measure(get_hasher().algorithm, {}, options['repeat'])}
+        for name, (algorithm, costs) in PROFILES.items():
+            report[name] = self.measure(algorithm, costs, options['repeat'])
+        self.stdout.write(json.dumps(report, indent=2))
+
+    def measure(self, algorithm, costs, repeat):
+        hashing = dict(settings.PASSWORD_HASHING, **costs)
+        try:
+            with override_settings(PASSWORD_HASHING=hashing):
+                hasher = get_hasher(algorithm)
+                hash_times = []
+                check_times = []
+                for _ in range(repeat):
+                    started = time.perf_counter()
+                    encoded = make_password('correct horse battery staple', hasher=hasher)
+                    hash_times.append(time.perf_counter() - started)
+                    started = time.perf_counter()
+                    check_password('correct horse battery staple', encoded)
+                    check_times.append(time.perf_counter() - started)
+        except (ValueError, ImportError) as exc:
+            return {'available': False, 'error': str(exc)}
+        hash_ms = statistics.median(hash_times) * 1000
+        return {
+            'available': True,
+            'algorithm': algorithm,
+            'hash_ms': round(hash_ms, 3),
+            'check_ms': round(statistics.median(check_times) * 1000, 3),
+            'hashes_per_second_per_core': round(1000 / hash_ms, 1) if hash_ms else None,
+        }
@@ -0,0 +1,54 @@
+import gzip
+import json
+import random
+import time
+from decimal import Decimal
+
+import brotli
+from django.core.management.base import BaseCommand
+from rest_framework.renderers import JSONRenderer
+
+from task.renderers import MessagePackRenderer, ORJSONRenderer
+from task.serializers import ProductReadSerializer
+
+
+class Command(BaseCommand):
+    help = (
+        'Compare DRF\'s JSONRenderer, ORJSONRenderer and MessagePackRenderer on '
+        'an in-memory product list, with the gzip and brotli sizes of each body.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=100000)
+        parser.add_argument('--repeat', type=int, default=3)
+
+    def best_of(self, repeat, func):
+        timings = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            result = func()
+            timings.append(time.perf_counter() - started)
+        return min(timings), result
+
+    def handle(self, *args, **options):
+        rng = random.Random(0)
+        rows = [
+            (pk, 'product %d' % pk, None if pk % 50 == 0 else Decimal(rng.randrange(0, 10 ** 6)) / 100, pk % 97)
+            for pk in range(1, options['rows'] + 1)
+        ]
+        data = ProductReadSerializer(rows).data
+        renderers = {'drf_json': JSONRenderer(), 'orjson': ORJSONRenderer(), 'msgpack': MessagePackRenderer()}
+
+        report = {'rows': options['rows']}
+        bodies = {}
+        for name, renderer in renderers.items():
+            seconds, bodies[name] = self.best_of(options['repeat'], lambda: renderer.render(data))
+            report[name] = {'render_seconds': round(seconds, 4), 'bytes': len(bodies[name])}
+            seconds, compressed = self.best_of(
+                options['repeat'], lambda: gzip.compress(bodies[name], compresslevel=6, mtime=0))
+            report[name].update(gzip_seconds=round(seconds, 4), gzip_bytes=len(compressed))
+            seconds, compressed = self.best_of(options['repeat'], lambda: brotli.compress(bodies[name], quality=4))
+            report[name].update(brotli_seconds=round(seconds, 4), brotli_bytes=len(compressed))
+        report['orjson_speedup'] = round(report['drf_json']['render_seconds'] / report['orjson']['render_seconds'], 2)
+        report['identical_json'] = bodies['drf_json'] == bodies['orjson']
+        self.stdout.write(json.dumps(report, indent=2))
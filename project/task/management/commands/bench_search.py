@@ -0,0 +1,126 @@
+import json
+import statistics
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test.utils import CaptureQueriesContext, setup_databases, teardown_databases
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from task.factories import create_products, create_users
+from task.filters import ProductFilter
+from task.models import Product
+from task.pagination import (
+    DEFAULT_PRODUCT_ORDERING, PRODUCT_ORDERINGS, ProductKeysetPagination, get_product_ordering,
+)
+from task.serializers import ProductReadSerializer
+
+SHAPES = {
+    'all': {},
+    'search': {'search': 'an'},
+    'prefix': {'name': 'Jo'},
+    'price_range': {'min_price': '10', 'max_price': '20'},
+    'price_desc': {'ordering': '-price'},
+    'name': {'ordering': 'name'},
+    'name_desc': {'ordering': '-name'},
+    'search_by_name': {'search': 'an', 'ordering': 'name'},
+}
+
+
+class Command(BaseCommand):
+    help = (
+        'Seed one seller with a large catalog in a throwaway test database and '
+        'report the latency and query plan of a listing page for each search, '
+        'filter and sort option, at the start of the catalog and deep into it.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--products', type=int, default=200000)
+        parser.add_argument('--page-size', type=int, default=100)
+        parser.add_argument('--repeat', type=int, default=20)
+
+    def handle(self, *args, **options):
+        old_config = setup_databases(verbosity=0, interactive=False)
+        try:
+            report = self.run(options)
+        finally:
+            teardown_databases(old_config, verbosity=0)
+        self.stdout.write(json.dumps(report, indent=2))
+
+    def run(self, options):
+        started = time.perf_counter()
+        seller = create_users(1)[0]
+        for start in range(0, options['products'], 10000):
+            create_products([seller], min(10000, options['products'] - start))
+        with connection.cursor() as cursor:
+            # Fresh planner statistics, as a long-lived database would have.
+            cursor.execute('ANALYZE')
+        seed_seconds = time.perf_counter() - started
+
+        self.page_size = options['page_size']
+        self.products = Product.objects.filter(seller=seller)
+        shapes = {}
+        for name, params in SHAPES.items():
+            shapes[name] = {
+                'first_page': self.measure(params, None, options['repeat']),
+                'deep_page': self.measure(params, self.middle_position(params), options['repeat']),
+            }
+        return {
+            'vendor': connection.vendor,
+            'products': options['products'],
+            'page_size': options['page_size'],
+            'seed_seconds': round(seed_seconds, 3),
+            'shapes': shapes,
+        }
+
+    def page_request(self, params, position):
+        query = dict(params, page_size=self.page_size)
+        if position is not None:
+            query['cursor'] = ProductKeysetPagination().encode_cursor(*position)
+        return Request(APIRequestFactory().get('/task/', query))
+
+    def fetch_page(self, params, request):
+        """One page as the listing view fetches it: the filterset's rows through ``paginate_queryset``."""
+        queryset = ProductFilter(params, queryset=self.products).qs
+        return ProductKeysetPagination().paginate_queryset(ProductReadSerializer.get_rows(queryset), request)
+
+    def middle_position(self, params):
+        """The (sort value, id) half way through the matching rows, as a cursor would carry."""
+        sort = params.get('ordering', DEFAULT_PRODUCT_ORDERING)
+        field, _descending = PRODUCT_ORDERINGS[sort]
+        rows = ProductFilter(params, queryset=self.products).qs
+        count = rows.count()
+        if not count:
+            return None
+        return rows.order_by(*get_product_ordering(sort)).values_list(field, 'id')[count // 2]
+
+    def measure(self, params, position, repeat):
+        request = self.page_request(params, position)
+        timings = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            rows = self.fetch_page(params, request)
+            timings.append(time.perf_counter() - started)
+        # The page is a non-NULL range plus, when it runs out, the NULL tail:
+        # explain every statement the paginator ran.
+        with CaptureQueriesContext(connection) as captured:
+            self.fetch_page(params, request)
+        queries = []
+        with connection.cursor() as cursor:
+            for query in captured.captured_queries:
+                cursor.execute('{} {}'.format(connection.ops.explain_query_prefix(), query['sql']))
+                plan = '\n'.join(' '.join(str(column) for column in row) for row in cursor.fetchall())
+                queries.append({
+                    'sql': query['sql'],
+                    'index_only': 'COVERING INDEX' in plan or 'Index Only Scan' in plan,
+                    'sorts': 'TEMP B-TREE' in plan or 'Sort' in plan,
+                    'plan': plan.splitlines(),
+                })
+        return {
+            'rows': len(rows),
+            'median_ms': round(statistics.median(timings) * 1000, 3),
+            'index_only': all(query['index_only'] for query in queries),
+            'sorts': any(query['sorts'] for query in queries),
+            'queries': queries,
+        }
@@ -0,0 +1,49 @@
+import json
+import random
+import time
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand
+from rest_framework.renderers import JSONRenderer
+
+from task.models import Product
+from task.serializers import ProductSerializer, ProductReadSerializer
+
+
+class Command(BaseCommand):
+    help = 'Compare ProductSerializer and ProductReadSerializer on in-memory rows.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=100000)
+        parser.add_argument('--repeat', type=int, default=3)
+
+    def best_of(self, repeat, func):
+        timings = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            result = func()
+            timings.append(time.perf_counter() - started)
+        return min(timings), result
+
+    def handle(self, *args, **options):
+        rows = options['rows']
+        rng = random.Random(0)
+        tuples = [
+            (pk, 'product %d' % pk, None if pk % 50 == 0 else Decimal(rng.randrange(0, 10 ** 6)) / 100, pk % 97)
+            for pk in range(1, rows + 1)
+        ]
+        instances = [Product(id=pk, name=name, price=price, seller_id=seller_id) for pk, name, price, seller_id in tuples]
+        renderer = JSONRenderer()
+
+        drf_time, drf_json = self.best_of(
+            options['repeat'], lambda: renderer.render(ProductSerializer(instances, many=True).data))
+        fast_time, fast_json = self.best_of(
+            options['repeat'], lambda: renderer.render(ProductReadSerializer(tuples).data))
+
+        self.stdout.write(json.dumps({
+            'rows': rows,
+            'product_serializer_seconds': round(drf_time, 4),
+            'product_read_serializer_seconds': round(fast_time, 4),
+            'speedup': round(drf_time / fast_time, 2),
+            'identical_output': drf_json == fast_json,
+        }, indent=2))
@@ -0,0 +1,21 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from task.sessions import purge_expired_sessions
+
+
+class Command(BaseCommand):
+    help = (
+        'Delete expired sessions in small batches. Unlike clearsessions, no '
+        'single DELETE holds locks on the whole expired range.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000)
+        parser.add_argument('--sleep', type=float, default=0.0, help='Seconds to pause between batches.')
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        deleted = purge_expired_sessions(batch_size=options['batch_size'], sleep=options['sleep'])
+        self.stdout.write('Deleted {} expired sessions in {:.3f}s'.format(deleted, time.perf_counter() - started))
@@ -0,0 +1,27 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from task.jobs import enqueue
+from task.stats import rebuild_seller_stats
+
+
+class Command(BaseCommand):
+    help = (
+        'Recompute SellerStats from Product for every seller, or only the given '
+        'ones, e.g. after rows were changed with QuerySet.update() or raw SQL.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--seller', type=int, nargs='+', dest='sellers', help='Seller ids to rebuild.')
+        parser.add_argument('--batch-size', type=int, default=1000)
+        parser.add_argument('--background', action='store_true', help='Queue a job for run_jobs instead.')
+
+    def handle(self, *args, **options):
+        if options['background']:
+            job = enqueue('stats.rebuild', {'seller_ids': options['sellers'], 'batch_size': options['batch_size']})
+            self.stdout.write('Queued job {}'.format(job.pk))
+            return
+        started = time.perf_counter()
+        written = rebuild_seller_stats(options['sellers'], batch_size=options['batch_size'])
+        self.stdout.write('Rebuilt stats of {} sellers in {:.3f}s'.format(written, time.perf_counter() - started))
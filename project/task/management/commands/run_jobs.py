@@ -0,0 +1,125 @@
+import multiprocessing
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+
+import django
+from django.core.management.base import BaseCommand
+from django.db import DatabaseError, close_old_connections, connections
+
+from task.jobs import claim_jobs, fail_job, get_job_queue_setting, requeue_stale_jobs, run_job, worker_name
+from task.models import Job
+
+
+def _init_worker():
+    # Spawned (non-fork) children start from a fresh interpreter.
+    django.setup()
+
+
+def _run_job_in_worker(job_id):
+    try:
+        return run_job(job_id)
+    finally:
+        close_old_connections()
+
+
+class Command(BaseCommand):
+    help = (
+        'Run queued background jobs in a pool of worker processes. Jobs are '
+        'claimed from the task_job table, so any number of these commands can '
+        'run side by side without a message broker.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--workers', type=int, default=None,
+            help='Worker processes (default: JOB_QUEUE["WORKERS"]); 0 runs jobs in this process.')
+        parser.add_argument('--poll-interval', type=float, default=None)
+        parser.add_argument('--burst', action='store_true', help='Exit once no job is due.')
+
+    def handle(self, *args, **options):
+        workers = options['workers']
+        if workers is None:
+            workers = get_job_queue_setting('WORKERS')
+        poll_interval = options['poll_interval']
+        if poll_interval is None:
+            poll_interval = get_job_queue_setting('POLL_INTERVAL')
+        self.name = worker_name()
+        if workers:
+            self.run_pool(workers, poll_interval, options['burst'])
+        else:
+            self.run_inline(poll_interval, options['burst'])
+
+    def run_inline(self, poll_interval, burst):
+        while True:
+            job_ids = self.poll(1)
+            for job_id in job_ids:
+                self.report(job_id, run_job(job_id))
+            if not job_ids:
+                if burst:
+                    return
+                time.sleep(poll_interval)
+
+    def poll(self, limit):
+        """Claim up to ``limit`` due jobs; a database outage only skips this round."""
+        try:
+            requeue_stale_jobs()
+            return claim_jobs(limit, self.name)
+        except DatabaseError as exc:
+            self.stderr.write('Could not poll for jobs: {}'.format(exc))
+            connections.close_all()
+            return []
+
+    def create_pool(self, workers):
+        # Forked children must not share the parent's database sockets.
+        connections.close_all()
+        methods = multiprocessing.get_all_start_methods()
+        context = multiprocessing.get_context('fork' if 'fork' in methods else 'spawn')
+        pool = ProcessPoolExecutor(max_workers=workers, mp_context=context, initializer=_init_worker)
+        # Start the processes now, before the next query reopens a connection.
+        pool.submit(int).result()
+        return pool
+
+    def run_pool(self, workers, poll_interval, burst):
+        pool = self.create_pool(workers)
+        running = {}
+        try:
+            while True:
+                free = workers - len(running)
+                job_ids = self.poll(free) if free else []
+                broken = False
+                for job_id in job_ids:
+                    try:
+                        running[pool.submit(_run_job_in_worker, job_id)] = job_id
+                    except BrokenProcessPool as exc:
+                        broken = True
+                        self.report(job_id, fail_job(Job.objects.get(pk=job_id), repr(exc)))
+                if broken:
+                    pool = self.replace_pool(pool, workers)
+                    continue
+                if not running:
+                    if burst:
+                        return
+                    time.sleep(poll_interval)
+                    continue
+                done, _pending = wait(running, timeout=poll_interval, return_when=FIRST_COMPLETED)
+                for future in done:
+                    job_id = running.pop(future)
+                    try:
+                        self.report(job_id, future.result())
+                    except Exception as exc:
+                        broken = broken or isinstance(exc, BrokenProcessPool)
+                        self.report(job_id, fail_job(Job.objects.get(pk=job_id), repr(exc)))
+                if broken:
+                    pool = self.replace_pool(pool, workers)
+        finally:
+            pool.shutdown(wait=True)
+
+    def replace_pool(self, pool, workers):
+        # A worker process died. The pool's pending futures fail with
+        # BrokenProcessPool and are retried like any failed attempt.
+        pool.shutdown(wait=False)
+        return self.create_pool(workers)
+
+    def report(self, job_id, job_status):
+        self.stdout.write('Job {} {}'.format(job_id, job_status))
@@ -0,0 +1,131 @@
+import json
+import os
+import re
+import statistics
+import subprocess
+import sys
+import tempfile
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+# Run in a fresh interpreter: build the WSGI application as gunicorn does,
+# then serve one request through the whole middleware stack and URLconf.
+STARTUP_SCRIPT = '''
+import io, json, sys, time
+started = time.perf_counter()
+from django.core.wsgi import get_wsgi_application
+application = get_wsgi_application()
+ready = time.perf_counter()
+environ = {
+    'REQUEST_METHOD': 'GET', 'PATH_INFO': sys.argv[1], 'SCRIPT_NAME': '', 'QUERY_STRING': '',
+    'SERVER_NAME': 'localhost', 'SERVER_PORT': '80', 'HTTP_HOST': 'localhost',
+    'wsgi.input': io.BytesIO(), 'wsgi.errors': sys.stderr, 'wsgi.url_scheme': 'http',
+}
+statuses = []
+b''.join(application(environ, lambda status, headers, exc_info=None: statuses.append(status)))
+served = time.perf_counter()
+print(json.dumps({
+    'status': statuses[0],
+    'setup_ms': (ready - started) * 1000,
+    'first_request_ms': (served - ready) * 1000,
+    'total_ms': (served - started) * 1000,
+    'modules': len(sys.modules),
+}))
+'''
+
+# "import time: <self us> | <cumulative us> | <indent><module>" lines of -X importtime.
+IMPORT_TIME_LINE = re.compile(r'^import time:\s+(\d+) \|\s+(\d+) \| (\s*)(\S+)$')
+
+
+def parse_import_times(output):
+    """(module, self_us, cumulative_us, depth) for each module listed by ``python -X importtime``."""
+    modules = []
+    for line in output.splitlines():
+        match = IMPORT_TIME_LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, module = match.groups()
+            modules.append((module, int(self_us), int(cumulative_us), len(indent) // 2))
+    return modules
+
+
+class Command(BaseCommand):
+    help = (
+        'Start the WSGI application in fresh interpreters and report, as JSON, '
+        'the time to the first served request and the import cost per module '
+        'and per package, for one or more settings modules.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--settings-modules', nargs='+',
+            default=[os.environ.get('DJANGO_SETTINGS_MODULE', 'project.settings')],
+            help='Settings modules to compare, e.g. project.settings_production project.settings_api.',
+        )
+        parser.add_argument('--path', default='/task/', help='Path of the first request.')
+        parser.add_argument('--repeat', type=int, default=5, help='Timed starts per settings module.')
+        parser.add_argument('--limit', type=int, default=20, help='Modules and packages listed.')
+        parser.add_argument(
+            '--no-bytecode-cache', action='store_true',
+            help='Ignore existing .pyc files, as in an image that ships none.',
+        )
+        parser.add_argument('--output', help='Write the JSON report to this file.')
+
+    def start(self, settings_module, options, *python_options):
+        env = dict(os.environ, DJANGO_SETTINGS_MODULE=settings_module)
+        with tempfile.TemporaryDirectory() as pycache_prefix:
+            if options['no_bytecode_cache']:
+                env.update(PYTHONPYCACHEPREFIX=pycache_prefix, PYTHONDONTWRITEBYTECODE='1')
+            process = subprocess.run(
+                [sys.executable, *python_options, '-c', STARTUP_SCRIPT, options['path']],
+                cwd=str(settings.BASE_DIR), env=env, capture_output=True, text=True,
+            )
+        if process.returncode:
+            raise CommandError('{} failed to start:\n{}'.format(settings_module, process.stderr[-2000:]))
+        return json.loads(process.stdout.splitlines()[-1]), process.stderr
+
+    def profile(self, settings_module, options):
+        runs = [self.start(settings_module, options)[0] for _ in range(options['repeat'])]
+        first_run, import_times = self.start(settings_module, options, '-X', 'importtime')
+        modules = parse_import_times(import_times)
+
+        packages = defaultdict(int)
+        for module, self_us, _cumulative_us, _depth in modules:
+            packages[module.split('.')[0]] += self_us
+        slowest = sorted(modules, key=lambda module: module[1], reverse=True)[:options['limit']]
+        return {
+            'status': first_run['status'],
+            'modules_loaded': first_run['modules'],
+            **{
+                key: round(statistics.median(run[key] for run in runs), 1)
+                for key in ('setup_ms', 'first_request_ms', 'total_ms')
+            },
+            'import_ms': round(sum(module[1] for module in modules) / 1000, 1),
+            'packages_ms': {
+                package: round(self_us / 1000, 1)
+                for package, self_us in sorted(packages.items(), key=lambda item: item[1], reverse=True)
+                [:options['limit']]
+            },
+            'modules_ms': [
+                {'module': module, 'self': round(self_us / 1000, 1), 'cumulative': round(cumulative_us / 1000, 1)}
+                for module, self_us, cumulative_us, _depth in slowest
+            ],
+        }
+
+    def handle(self, *args, **options):
+        if options['repeat'] < 1:
+            raise CommandError('--repeat must be at least 1.')
+        report = {
+            'path': options['path'],
+            'bytecode_cache': not options['no_bytecode_cache'],
+            'profiles': {
+                settings_module: self.profile(settings_module, options)
+                for settings_module in options['settings_modules']
+            },
+        }
+        output = json.dumps(report, indent=2)
+        if options['output']:
+            with open(options['output'], 'w') as output_file:
+                output_file.write(output)
+        self.stdout.write(output)
@@ -0,0 +1,85 @@
+import contextvars
+import time
+from collections import Counter
+from contextlib import contextmanager
+
+_current_metrics = contextvars.ContextVar('request_metrics', default=None)
+
+
+class RequestMetrics:
+    """Timings collected while one request is being handled."""
+
+    def __init__(self):
+        self.query_count = 0
+        self.db_time = 0.0
+        self.timings = {}
+        self.statements = Counter()
+
+    def record_query(self, sql, duration):
+        self.query_count += 1
+        self.db_time += duration
+        self.statements[sql] += 1
+
+    def add_timing(self, name, duration):
+        self.timings[name] = self.timings.get(name, 0.0) + duration
+
+    def repeated_statements(self, threshold):
+        """SQL templates executed at least ``threshold`` times, the usual N+1 signature."""
+        return {sql: count for sql, count in self.statements.items() if count >= threshold}
+
+    def __call__(self, execute, sql, params, many, context):
+        # Signature of a connection.execute_wrapper().
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.record_query(sql, time.perf_counter() - started)
+
+
+def get_current_metrics():
+    return _current_metrics.get()
+
+
+def record_query(execute, sql, params, many, context):
+    """
+    ``connection.execute_wrapper()`` adding the query to the metrics of the
+    request it runs for. The request is found through the context, which
+    ``sync_to_async`` copies to the thread running the query, so queries are
+    counted right under ASGI too, where concurrent requests share the
+    connections of one thread.
+    """
+    metrics = _current_metrics.get()
+    if metrics is None:
+        return execute(sql, params, many, context)
+    return metrics(execute, sql, params, many, context)
+
+
+def install_query_recorder(connection, **kwargs):
+    """Add ``record_query`` to the wrappers of ``connection``; a ``connection_created`` receiver."""
+    if record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_query)
+
+
+def activate(metrics):
+    return _current_metrics.set(metrics)
+
+
+def deactivate(token):
+    _current_metrics.reset(token)
+
+
+@contextmanager
+def timing(name):
+    """
+    Add the time spent in the block to the current request's metrics under
+    ``name``. A no-op when metrics are not being collected.
+    """
+    metrics = _current_metrics.get()
+    if metrics is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        metrics.add_timing(name, time.perf_counter() - started)
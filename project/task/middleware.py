@@ -0,0 +1,391 @@
+import asyncio
+import gzip
+import hashlib
+import json
+import logging
+import time
+import zlib
+
+import brotli
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.sessions.middleware import SessionMiddleware as BaseSessionMiddleware
+from django.core.cache import caches
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.http import HttpResponse
+from django.utils.cache import patch_vary_headers
+
+from task import metrics, routers
+from task.admission import Overloaded, get_admission_controller
+from task.renderers import ORJSONRenderer
+from task.sessions import check_session_cache
+
+logger = logging.getLogger('task.metrics')
+
+
+class AsyncCapableMiddleware:
+    """
+    Base of the middlewares below. As with Django's ``MiddlewareMixin``, the
+    instance runs in the mode of the next handler: under ASGI ``__call__``
+    returns the coroutine of ``acall``, so requests aren't handed to a thread
+    for each middleware; under WSGI it runs ``call``.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if asyncio.iscoroutinefunction(get_response):
+            # Makes Django's handler see the instance as a coroutine function.
+            self._is_coroutine = asyncio.coroutines._is_coroutine
+
+    def __call__(self, request):
+        if asyncio.iscoroutinefunction(self.get_response):
+            return self.acall(request)
+        return self.call(request)
+
+    def call(self, request):
+        raise NotImplementedError
+
+    async def acall(self, request):
+        raise NotImplementedError
+
+
+class RequestMetricsMiddleware(AsyncCapableMiddleware):
+    """
+    Measure query count, DB time, serializer time and total time per request.
+
+    Results are sent as a ``Server-Timing`` header and one structured log line
+    on the ``task.metrics`` logger. When ``REQUEST_METRICS['ENABLED']`` is
+    false the middleware removes itself from the stack at startup, so it
+    costs nothing.
+    """
+
+    def __init__(self, get_response):
+        config = getattr(settings, 'REQUEST_METRICS', {})
+        if not config.get('ENABLED', False):
+            raise MiddlewareNotUsed
+        super().__init__(get_response)
+        self.n_plus_one_threshold = config.get('N_PLUS_ONE_THRESHOLD')
+        # Queries are recorded by a wrapper on every connection, which adds
+        # them to the metrics of the current request, if any.
+        connection_created.connect(metrics.install_query_recorder)
+        for connection in connections.all():
+            metrics.install_query_recorder(connection)
+
+    def call(self, request):
+        request_metrics = metrics.RequestMetrics()
+        token = metrics.activate(request_metrics)
+        started = time.perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            metrics.deactivate(token)
+        return self.report(request, response, request_metrics, time.perf_counter() - started)
+
+    async def acall(self, request):
+        request_metrics = metrics.RequestMetrics()
+        token = metrics.activate(request_metrics)
+        started = time.perf_counter()
+        try:
+            response = await self.get_response(request)
+        finally:
+            metrics.deactivate(token)
+        return self.report(request, response, request_metrics, time.perf_counter() - started)
+
+    def report(self, request, response, request_metrics, total):
+        response['Server-Timing'] = self.server_timing(request_metrics, total)
+        self.log(request, response, request_metrics, total)
+        return response
+
+    def server_timing(self, request_metrics, total):
+        entries = ['db;dur={:.3f};desc="{} queries"'.format(request_metrics.db_time * 1000, request_metrics.query_count)]
+        for name, duration in request_metrics.timings.items():
+            entries.append('{};dur={:.3f}'.format(name, duration * 1000))
+        entries.append('total;dur={:.3f}'.format(total * 1000))
+        return ', '.join(entries)
+
+    def log(self, request, response, request_metrics, total):
+        record = {
+            'method': request.method,
+            'path': request.path,
+            'status': response.status_code,
+            'queries': request_metrics.query_count,
+            'db_ms': round(request_metrics.db_time * 1000, 3),
+            'total_ms': round(total * 1000, 3),
+        }
+        for name, duration in request_metrics.timings.items():
+            record['{}_ms'.format(name)] = round(duration * 1000, 3)
+
+        repeated = {}
+        if self.n_plus_one_threshold:
+            repeated = request_metrics.repeated_statements(self.n_plus_one_threshold)
+        if repeated:
+            record['n_plus_one'] = repeated
+            logger.warning(json.dumps(record))
+        else:
+            logger.info(json.dumps(record))
+
+
+class AdmissionControlMiddleware(AsyncCapableMiddleware):
+    """
+    Shed requests with ``503`` and ``Retry-After`` before their view runs
+    when their endpoint or the process is at its concurrency limit, rather
+    than letting them queue behind slow ones; see ``task.admission``.
+    Endpoints are URL names, given priorities by
+    ``ADMISSION_CONTROL['PRIORITIES']``. Unloads itself when
+    ``ADMISSION_CONTROL['ENABLED']`` is false.
+
+    A request holds its slot until its response is closed, once the whole
+    body is sent, so streamed exports count while they stream. Limits only
+    apply between requests served concurrently by one process: run threaded
+    or async workers (gunicorn refuses single-threaded sync workers, see
+    ``task.admission.check_worker_concurrency``).
+    """
+
+    def __init__(self, get_response):
+        config = getattr(settings, 'ADMISSION_CONTROL', {})
+        if not config.get('ENABLED', False):
+            raise MiddlewareNotUsed
+        super().__init__(get_response)
+        self.retry_after = config.get('RETRY_AFTER', 1)
+
+    def call(self, request):
+        started = time.perf_counter()
+        try:
+            response = self.get_response(request)
+        except BaseException:
+            self.release(request, started)
+            raise
+        return self.release_on_close(request, response, started)
+
+    async def acall(self, request):
+        started = time.perf_counter()
+        try:
+            response = await self.get_response(request)
+        except BaseException:
+            self.release(request, started)
+            raise
+        return self.release_on_close(request, response, started)
+
+    def release(self, request, started):
+        admitted = getattr(request, '_admitted_endpoint', None)
+        if admitted is not None:
+            request._admitted_endpoint = None
+            controller, endpoint = admitted
+            controller.release(endpoint, time.perf_counter() - started)
+
+    def release_on_close(self, request, response, started):
+        if getattr(request, '_admitted_endpoint', None) is None:
+            return response
+        close = response.close
+
+        def close_and_release():
+            try:
+                close()
+            finally:
+                self.release(request, started)
+
+        response.close = close_and_release
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        controller = get_admission_controller()
+        if controller is None:
+            return None
+        endpoint = request.resolver_match.view_name
+        if controller.acquire(endpoint):
+            request._admitted_endpoint = (controller, endpoint)
+            return None
+        exc = Overloaded()
+        response = HttpResponse(
+            ORJSONRenderer().render({'detail': exc.detail}), status=exc.status_code, content_type='application/json')
+        response['Retry-After'] = str(self.retry_after)
+        return response
+
+
+class ReadYourWritesMiddleware(AsyncCapableMiddleware):
+    """
+    Pin requests to the primary database when a replica could serve stale rows.
+
+    A request is pinned when its method is unsafe, its view sets
+    ``read_from_primary = True``, or the same client (Authorization header,
+    else session cookie, else address) wrote within the last
+    ``READ_REPLICAS['STICKY_SECONDS']``. Recent writers are remembered in the
+    ``READ_REPLICAS['CACHE']`` cache, which must be shared across workers to
+    hold across processes. Unloads itself when no replica is configured.
+    """
+
+    safe_methods = ('GET', 'HEAD', 'OPTIONS')
+
+    def __init__(self, get_response):
+        config = getattr(settings, 'READ_REPLICAS', {})
+        if not config.get('DATABASES'):
+            raise MiddlewareNotUsed
+        super().__init__(get_response)
+        self.sticky_seconds = config.get('STICKY_SECONDS', 5)
+        self.cache = caches[config.get('CACHE', 'default')]
+
+    def call(self, request):
+        key = self.client_key(request)
+        pinned = request.method not in self.safe_methods or self.cache.get(key) is not None
+        state = routers.RoutingState(pinned=pinned)
+        token = routers.activate(state)
+        try:
+            response = self.get_response(request)
+        finally:
+            routers.deactivate(token)
+        if state.wrote and self.sticky_seconds:
+            self.cache.set(key, True, self.sticky_seconds)
+        return response
+
+    async def acall(self, request):
+        # The cache may be a network round trip: keep it off the event loop.
+        key = self.client_key(request)
+        pinned = (request.method not in self.safe_methods
+                  or await sync_to_async(self.cache.get, thread_sensitive=False)(key) is not None)
+        state = routers.RoutingState(pinned=pinned)
+        token = routers.activate(state)
+        try:
+            response = await self.get_response(request)
+        finally:
+            routers.deactivate(token)
+        if state.wrote and self.sticky_seconds:
+            await sync_to_async(self.cache.set, thread_sensitive=False)(key, True, self.sticky_seconds)
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        view_class = getattr(view_func, 'cls', None) or getattr(view_func, 'view_class', None)
+        if getattr(view_class, 'read_from_primary', False):
+            routers.get_current_routing().pinned = True
+
+    def client_key(self, request):
+        client = (
+            request.META.get('HTTP_AUTHORIZATION')
+            or request.COOKIES.get(settings.SESSION_COOKIE_NAME)
+            or request.META.get('REMOTE_ADDR', '')
+        )
+        return 'db-pin:' + hashlib.sha1(client.encode()).hexdigest()
+
+
+class CompressionMiddleware(AsyncCapableMiddleware):
+    """
+    Compress response bodies with brotli or gzip, picking the coding the
+    client's ``Accept-Encoding`` ranks highest, ties going to the order of
+    ``RESPONSE_COMPRESSION['ALGORITHMS']``.
+
+    Bodies under ``MIN_SIZE`` bytes are sent as they are, since compressing
+    them costs more CPU than it saves on the wire. Streaming responses, such
+    as exports, are compressed chunk by chunk. Strong ETags are weakened
+    because the compressed bytes differ from the identity ones. When
+    ``RESPONSE_COMPRESSION['ENABLED']`` is false the middleware unloads
+    itself.
+    """
+
+    incompressible_types = ('image/', 'video/', 'audio/', 'application/zip', 'application/gzip')
+
+    def __init__(self, get_response):
+        config = getattr(settings, 'RESPONSE_COMPRESSION', {})
+        if not config.get('ENABLED', False):
+            raise MiddlewareNotUsed
+        super().__init__(get_response)
+        self.min_size = config.get('MIN_SIZE', 1024)
+        self.gzip_level = config.get('GZIP_LEVEL', 6)
+        self.brotli_quality = config.get('BROTLI_QUALITY', 4)
+        self.algorithms = [
+            algorithm for algorithm in config.get('ALGORITHMS', ['br', 'gzip'])
+            if algorithm in ('br', 'gzip')
+        ]
+
+    def call(self, request):
+        return self.compress_response(request, self.get_response(request))
+
+    async def acall(self, request):
+        return self.compress_response(request, await self.get_response(request))
+
+    def compress_response(self, request, response):
+        if response.has_header('Content-Encoding') or response.get('Content-Type', '').startswith(self.incompressible_types):
+            return response
+        if not response.streaming and len(response.content) < self.min_size:
+            return response
+        patch_vary_headers(response, ('Accept-Encoding',))
+        algorithm = self.negotiate(request.META.get('HTTP_ACCEPT_ENCODING', ''))
+        if algorithm is None:
+            return response
+
+        if response.streaming:
+            response.streaming_content = self.compress_stream(algorithm, response.streaming_content)
+            del response['Content-Length']
+        else:
+            content = self.compress(algorithm, response.content)
+            if len(content) >= len(response.content):
+                return response
+            response.content = content
+            response['Content-Length'] = str(len(content))
+        etag = response.get('ETag')
+        if etag and etag.startswith('"'):
+            response['ETag'] = 'W/' + etag
+        response['Content-Encoding'] = algorithm
+        return response
+
+    def negotiate(self, accept_encoding):
+        qualities = {}
+        for coding in accept_encoding.split(','):
+            name, _, params = coding.strip().partition(';')
+            quality = 1.0
+            params = params.strip()
+            if params.startswith('q='):
+                try:
+                    quality = float(params[2:])
+                except ValueError:
+                    quality = 0.0
+            qualities[name.strip().lower()] = quality
+        ranked = [
+            (qualities.get(algorithm, qualities.get('*', 0.0)), -index, algorithm)
+            for index, algorithm in enumerate(self.algorithms)
+        ]
+        quality, _index, algorithm = max(ranked, default=(0.0, 0, None))
+        return algorithm if quality > 0 else None
+
+    def compress(self, algorithm, content):
+        if algorithm == 'br':
+            return brotli.compress(content, quality=self.brotli_quality)
+        return gzip.compress(content, compresslevel=self.gzip_level, mtime=0)
+
+    def compress_stream(self, algorithm, chunks):
+        if algorithm == 'br':
+            compressor = brotli.Compressor(quality=self.brotli_quality)
+            compress, finish = compressor.process, compressor.finish
+        else:
+            compressor = zlib.compressobj(self.gzip_level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+            compress, finish = compressor.compress, compressor.flush
+        for chunk in chunks:
+            data = compress(chunk)
+            if data:
+                yield data
+        yield finish()
+
+
+class SessionMiddleware(BaseSessionMiddleware):
+    """
+    ``SessionMiddleware`` that does not save a session marked modified whose
+    key and data are what was loaded, with the stores of ``task.sessions``.
+    An unchanged session then costs no write and no ``Set-Cookie``.
+
+    Refuses to start with a cache-backed engine whose cache is local to the
+    process; see ``task.sessions.check_session_cache``.
+    """
+
+    def __init__(self, get_response):
+        super().__init__(get_response)
+        check_session_cache(self.SessionStore)
+
+    def process_response(self, request, response):
+        session = getattr(request, 'session', None)
+        if (session is not None and session.modified and not settings.SESSION_SAVE_EVERY_REQUEST
+                and hasattr(session, 'has_changed') and not session.has_changed()):
+            session.modified = False
+        return super().process_response(request, response)
@@ -0,0 +1,17 @@
+# Generated by Django 3.2.8 on 2026-10-18 16:07
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('task', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='product',
+            index=models.Index(fields=['seller', 'price', 'id'], name='product_seller_price_idx'),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 3.2.8 on 2026-10-18 16:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('task', '0002_product_seller_price_idx'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='user',
+            name='catalog_updated_at',
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='user',
+            name='catalog_version',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+    ]
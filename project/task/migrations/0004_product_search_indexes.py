@@ -0,0 +1,43 @@
+# Generated by Django 3.2.8 on 2026-10-18 16:31
+
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations, models
+
+TRIGRAM_INDEX = 'product_name_trgm_idx'
+
+
+def create_trigram_index(apps, schema_editor):
+    # Serves icontains/istartswith (UPPER(name) LIKE ...) on Postgres; SQLite has no equivalent.
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute(
+            'CREATE INDEX IF NOT EXISTS {} ON task_product USING gin (UPPER(name) gin_trgm_ops)'.format(TRIGRAM_INDEX)
+        )
+
+
+def drop_trigram_index(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute('DROP INDEX IF EXISTS {}'.format(TRIGRAM_INDEX))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('task', '0003_user_catalog_version'),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        migrations.RemoveIndex(
+            model_name='product',
+            name='product_seller_price_idx',
+        ),
+        migrations.AddIndex(
+            model_name='product',
+            index=models.Index(fields=['seller', 'price', 'id', 'name'], name='product_seller_price_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='product',
+            index=models.Index(fields=['seller', 'name', 'id', 'price'], name='product_seller_name_idx'),
+        ),
+        migrations.RunPython(create_trigram_index, drop_trigram_index),
+    ]
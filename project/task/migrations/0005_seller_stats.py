@@ -0,0 +1,50 @@
+# Generated by Django 3.2.8 on 2026-10-18 16:37
+
+from django.db import migrations, models
+from django.db.models import Count, Max, Min, Sum
+import django.db.models.deletion
+
+
+def backfill_seller_stats(apps, schema_editor):
+    Product = apps.get_model('task', 'Product')
+    SellerStats = apps.get_model('task', 'SellerStats')
+    aggregates = (
+        Product.objects.using(schema_editor.connection.alias)
+        .filter(seller__isnull=False)
+        .values('seller_id')
+        .annotate(
+            product_count=Count('id'), priced_count=Count('price'), price_sum=Sum('price'),
+            min_price=Min('price'), max_price=Max('price'),
+        )
+        .order_by()
+    )
+    SellerStats.objects.using(schema_editor.connection.alias).bulk_create(
+        [SellerStats(**dict(row, price_sum=row['price_sum'] or 0)) for row in aggregates.iterator()],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('task', '0004_product_search_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SellerStats',
+            fields=[
+                ('seller', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='stats', serialize=False, to='task.user')),
+                ('product_count', models.PositiveIntegerField(default=0)),
+                ('priced_count', models.PositiveIntegerField(default=0)),
+                ('price_sum', models.DecimalField(decimal_places=2, default=0, max_digits=20)),
+                ('min_price', models.DecimalField(blank=True, decimal_places=2, max_digits=10, null=True)),
+                ('max_price', models.DecimalField(blank=True, decimal_places=2, max_digits=10, null=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name_plural': 'seller stats',
+            },
+        ),
+        migrations.RunPython(backfill_seller_stats, migrations.RunPython.noop),
+    ]
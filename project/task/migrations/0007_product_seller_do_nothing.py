@@ -0,0 +1,20 @@
+# Generated by Django 3.2.8 on 2026-10-18 17:35
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('task', '0006_job'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='product',
+            name='seller',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.DO_NOTHING, related_name='product_seller', to=settings.AUTH_USER_MODEL),
+        ),
+    ]
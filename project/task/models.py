@@ -2,6 +2,7 @@ from django.db import models
 from django.contrib.auth.base_user import AbstractBaseUser, BaseUserManager
 from django.contrib.auth.models import AbstractUser
 from django.contrib.auth.validators import UnicodeUsernameValidator
+from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 
 
@@ -48,12 +49,94 @@ class User(AbstractUser):
     username_validator = UnicodeUsernameValidator()
     email = models.EmailField(_('email address'), unique=True, blank=False, null=False)
     email_verified_at = models.DateTimeField(blank=True, null=True)
+    # Bumped on every write to the user's products; drives listing ETags.
+    catalog_version = models.PositiveIntegerField(default=0, editable=False)
+    catalog_updated_at = models.DateTimeField(blank=True, null=True, editable=False)
 
 
 class Product(models.Model):
     name = models.CharField(_('name'), max_length=20)
     price = models.DecimalField(max_digits=10, decimal_places=2, verbose_name=_('price'), blank=True, null=True)
-    seller = models.ForeignKey(User, related_name='product_seller', on_delete=models.CASCADE, blank=True, null=True)
+    # Deleting a seller deletes its products in one statement, in
+    # task.signals.delete_seller_catalog, instead of the collector loading
+    # every one of them.
+    seller = models.ForeignKey(User, related_name='product_seller', on_delete=models.DO_NOTHING, blank=True, null=True)
+
+    class Meta:
+        indexes = [
+            # Listing access paths: filter by seller, sort by price or name, id as
+            # tie-breaker. The trailing column makes each index cover the listing
+            # rows, so searches and pages are answered from the index alone.
+            # Postgres also gets a trigram index on UPPER(name) (migration 0004).
+            models.Index(fields=['seller', 'price', 'id', 'name'], name='product_seller_price_idx'),
+            models.Index(fields=['seller', 'name', 'id', 'price'], name='product_seller_name_idx'),
+        ]
 
     def __str__(self):
         return self.name
+
+
+class SellerStats(models.Model):
+    """
+    Catalog aggregates of one seller, kept in step with ``Product`` writes by
+    ``task.stats`` so dashboards read one row instead of aggregating.
+    """
+    seller = models.OneToOneField(User, primary_key=True, related_name='stats', on_delete=models.CASCADE)
+    product_count = models.PositiveIntegerField(default=0)
+    # Products with a price; the average ignores NULL prices like Avg() does.
+    priced_count = models.PositiveIntegerField(default=0)
+    price_sum = models.DecimalField(max_digits=20, decimal_places=2, default=0)
+    min_price = models.DecimalField(max_digits=10, decimal_places=2, blank=True, null=True)
+    max_price = models.DecimalField(max_digits=10, decimal_places=2, blank=True, null=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name_plural = _('seller stats')
+
+    @property
+    def avg_price(self):
+        if not self.priced_count:
+            return None
+        return self.price_sum / self.priced_count
+
+
+class Job(models.Model):
+    """
+    A unit of background work run by the ``run_jobs`` worker; ``task.jobs``
+    maps ``kind`` to the function called with ``payload`` as its keyword
+    arguments.
+    """
+    QUEUED = 'queued'
+    RUNNING = 'running'
+    SUCCEEDED = 'succeeded'
+    FAILED = 'failed'
+    STATUS_CHOICES = [
+        (QUEUED, _('queued')),
+        (RUNNING, _('running')),
+        (SUCCEEDED, _('succeeded')),
+        (FAILED, _('failed')),
+    ]
+
+    kind = models.CharField(max_length=50)
+    payload = models.JSONField(default=dict)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=QUEUED)
+    owner = models.ForeignKey(User, related_name='jobs', on_delete=models.CASCADE, blank=True, null=True)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    max_attempts = models.PositiveSmallIntegerField(default=3)
+    # Not picked up before this time; pushed back after each failed attempt.
+    run_after = models.DateTimeField(default=timezone.now)
+    result = models.JSONField(blank=True, null=True)
+    error = models.TextField(blank=True)
+    locked_by = models.CharField(max_length=100, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(blank=True, null=True)
+    finished_at = models.DateTimeField(blank=True, null=True)
+
+    class Meta:
+        indexes = [
+            # Workers poll for due jobs of one status, oldest first.
+            models.Index(fields=['status', 'run_after'], name='job_status_run_after_idx'),
+        ]
+
+    def __str__(self):
+        return '{} #{}'.format(self.kind, self.pk)
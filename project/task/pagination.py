@@ -0,0 +1,179 @@
+import base64
+import json
+from decimal import Decimal, InvalidOperation
+
+from django.conf import settings
+from django.core.paginator import Paginator
+from django.db.models import F, Q
+from django.utils.functional import cached_property
+from django.utils.translation import gettext_lazy as _
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+from task.db.estimates import estimate_row_count
+
+# Sort options of the listing: value of ``?ordering=`` -> (field, descending).
+# Each one is backed by a (seller, field, id) index.
+PRODUCT_ORDERINGS = {
+    'price': ('price', False),
+    '-price': ('price', True),
+    'name': ('name', False),
+    '-name': ('name', True),
+}
+DEFAULT_PRODUCT_ORDERING = 'price'
+
+
+def get_product_ordering(ordering=DEFAULT_PRODUCT_ORDERING):
+    """``order_by()`` arguments of a sort option; NULLs last, id breaks ties."""
+    field, descending = PRODUCT_ORDERINGS[ordering]
+    if descending:
+        return (F(field).desc(nulls_last=True), '-id')
+    return (F(field).asc(nulls_last=True), 'id')
+
+
+def get_index_ordering(ordering=DEFAULT_PRODUCT_ORDERING):
+    """
+    ``order_by()`` arguments of a sort option as a forward or backward scan
+    of its (seller, field, id) index. Where NULLs land depends on the
+    database and the direction, so callers keep NULLs out of these ranges.
+    """
+    field, descending = PRODUCT_ORDERINGS[ordering]
+    if descending:
+        return ('-' + field, '-id')
+    return (field, 'id')
+
+
+class ProductKeysetPagination(BasePagination):
+    """
+    Keyset (seek) pagination over ``(sort field, id)``, price by default.
+
+    Each page is fetched with a ``WHERE (price, id) > (last_price, last_id)``
+    predicate instead of an OFFSET, so the cost of a page does not depend on
+    how deep into the catalog the client is. NULL prices sort last in both
+    directions: non-NULL rows and the NULL tail (by id) are read as two
+    ranges of the index, each in plain index order, because a DESC NULLS
+    LAST sort can't be read off an ascending Postgres index.
+    """
+    cursor_query_param = 'cursor'
+    page_size_query_param = 'page_size'
+    ordering_query_param = 'ordering'
+    page_size = 100
+    max_page_size = 1000
+    invalid_cursor_message = _('Invalid cursor')
+
+    def is_requested(self, request):
+        params = request.query_params
+        return self.cursor_query_param in params or self.page_size_query_param in params
+
+    def get_sort(self, request):
+        ordering = request.query_params.get(self.ordering_query_param)
+        return ordering if ordering in PRODUCT_ORDERINGS else DEFAULT_PRODUCT_ORDERING
+
+    def get_ordering(self, sort=DEFAULT_PRODUCT_ORDERING):
+        return get_index_ordering(sort)
+
+    def get_page_size(self, request):
+        try:
+            page_size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        if page_size <= 0:
+            return self.page_size
+        return min(page_size, self.max_page_size)
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        self.sort = self.get_sort(request)
+
+        position = self.decode_cursor(request)
+        field, _descending = PRODUCT_ORDERINGS[self.sort]
+        queryset = queryset.order_by(*self.get_ordering(self.sort))
+        nullable = queryset.model._meta.get_field(field).null
+
+        # Fetch one extra row to know whether a next page exists.
+        results = []
+        if position is None or position[0] is not None:
+            page = queryset.filter(**{field + '__isnull': False}) if nullable else queryset
+            if position is not None:
+                page = page.filter(self.get_seek_filter(*position, sort=self.sort))
+            results = list(page[:self.page_size + 1])
+        if nullable and len(results) <= self.page_size:
+            # The non-NULL range is exhausted; NULLs follow it, by id.
+            nulls = queryset.filter(**{field + '__isnull': True})
+            if position is not None and position[0] is None:
+                nulls = nulls.filter(self.get_seek_filter(*position, sort=self.sort))
+            results += list(nulls[:self.page_size + 1 - len(results)])
+        self.has_next = len(results) > self.page_size
+        self.page = results[:self.page_size]
+        return self.page
+
+    def get_seek_filter(self, value, pk, sort=DEFAULT_PRODUCT_ORDERING):
+        """
+        Rows after ``(value, pk)`` in ``sort`` order, written as a range on the
+        index so the scan starts at the cursor. NULLs after a non-NULL
+        position are fetched separately by ``paginate_queryset``.
+        """
+        field, descending = PRODUCT_ORDERINGS[sort]
+        after = 'lt' if descending else 'gt'
+        if value is None:
+            return Q(**{field + '__isnull': True, 'id__' + after: pk})
+        return (
+            Q(**{field + '__' + after + 'e': value})
+            & (Q(**{field + '__' + after: value}) | Q(**{'id__' + after: pk}))
+        )
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        last = self.page[-1]
+        url = self.request.build_absolute_uri()
+        url = replace_query_param(url, self.page_size_query_param, self.page_size)
+        field, _descending = PRODUCT_ORDERINGS[self.sort]
+        return replace_query_param(url, self.cursor_query_param, self.encode_cursor(getattr(last, field), last.id))
+
+    def get_paginated_response(self, data):
+        return Response({
+            'next': self.get_next_link(),
+            'results': data,
+        })
+
+    def encode_cursor(self, value, pk):
+        payload = json.dumps({'p': None if value is None else str(value), 'i': pk}, separators=(',', ':'))
+        return base64.urlsafe_b64encode(payload.encode('ascii')).decode('ascii').rstrip('=')
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            padded = encoded + '=' * (-len(encoded) % 4)
+            payload = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')).decode('ascii'))
+            value = payload['p']
+            if value is not None and PRODUCT_ORDERINGS[self.get_sort(request)][0] == 'price':
+                value = Decimal(value)
+            pk = int(payload['i'])
+        except (TypeError, ValueError, KeyError, InvalidOperation, UnicodeError):
+            raise NotFound(self.invalid_cursor_message)
+        return value, pk
+
+
+class EstimatedCountPaginator(Paginator):
+    """
+    Admin paginator that takes the row count of an unfiltered change list
+    from the database statistics once the table holds more than
+    ``ADMIN_ESTIMATED_COUNT_THRESHOLD`` rows, instead of running an exact
+    ``COUNT(*)`` over the whole table on every page load. Filtered and
+    searched lists are still counted exactly.
+    """
+
+    @cached_property
+    def count(self):
+        query = getattr(self.object_list, 'query', None)
+        if query is not None and not query.where:
+            estimate = estimate_row_count(self.object_list.model, self.object_list.db)
+            if estimate is not None and estimate >= settings.ADMIN_ESTIMATED_COUNT_THRESHOLD:
+                return estimate
+        return super().count
@@ -0,0 +1,74 @@
+import json
+
+import msgpack
+import orjson
+from django.conf import settings
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import BaseParser, JSONParser
+
+
+def _is_utf8(encoding):
+    return encoding.lower().replace('-', '') == 'utf8'
+
+
+def loads(content, encoding='utf-8'):
+    """Decode one JSON document from bytes, with ``orjson`` when it is UTF-8."""
+    if _is_utf8(encoding):
+        return orjson.loads(content)
+    return json.loads(content.decode(encoding))
+
+
+class ORJSONParser(JSONParser):
+    """
+    ``JSONParser`` decoding with ``orjson``. Like the strict stdlib parser
+    it rejects NaN and Infinity; bodies in another charset than UTF-8 are
+    left to the stdlib.
+    """
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        encoding = (parser_context or {}).get('encoding', settings.DEFAULT_CHARSET)
+        if not _is_utf8(encoding):
+            return super().parse(stream, media_type, parser_context)
+        try:
+            return orjson.loads(stream.read())
+        except orjson.JSONDecodeError as exc:
+            raise ParseError('JSON parse error - %s' % exc)
+
+
+class MessagePackParser(BaseParser):
+    """MessagePack request bodies (``Content-Type: application/msgpack``)."""
+    media_type = 'application/msgpack'
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        try:
+            return msgpack.unpackb(stream.read(), raw=False)
+        except (ValueError, msgpack.UnpackException) as exc:
+            raise ParseError('MessagePack parse error - %s' % exc)
+
+
+class NDJSONParser(BaseParser):
+    """
+    Parses newline-delimited JSON lazily.
+
+    ``request.data`` is a generator yielding one decoded value per non-blank
+    line, so large imports are consumed line by line instead of being
+    materialized in memory first.
+    """
+    media_type = 'application/x-ndjson'
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        parser_context = parser_context or {}
+        encoding = parser_context.get('encoding', settings.DEFAULT_CHARSET)
+        return self._iter_rows(stream, encoding)
+
+    def _iter_rows(self, stream, encoding):
+        if stream is None:
+            return
+        for line_number, line in enumerate(stream, start=1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield loads(line, encoding)
+            except ValueError as exc:
+                raise ParseError('NDJSON parse error on line %d - %s' % (line_number, exc))
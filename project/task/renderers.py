@@ -0,0 +1,61 @@
+import msgpack
+import orjson
+from rest_framework import renderers
+from rest_framework.utils.encoders import JSONEncoder
+
+_json_default = JSONEncoder().default
+
+
+def _encode_default(obj):
+    """
+    Convert what orjson and msgpack are told not to encode themselves.
+
+    Subclasses of builtins are passed through because both libraries read
+    their C-level storage, which some subclasses don't use: Django's
+    ``ErrorList`` keeps its messages in ``.data`` and would come out empty.
+    They become their plain builtin here, read through their Python API.
+    Other types (Decimal, lazy strings, querysets...) and datetimes are
+    converted the way DRF's JSONRenderer does.
+    """
+    if isinstance(obj, str):
+        return str(obj)
+    if isinstance(obj, dict):
+        return dict(obj)
+    if isinstance(obj, (list, tuple)):
+        return list(obj)
+    if isinstance(obj, int) and not isinstance(obj, bool):
+        return int(obj)
+    if isinstance(obj, float):
+        return float(obj)
+    return _json_default(obj)
+
+
+class ORJSONRenderer(renderers.JSONRenderer):
+    """
+    ``JSONRenderer`` producing the same bytes with ``orjson``: compact
+    separators, UTF-8 output, U+2028/U+2029 escaped, and Decimals, datetimes
+    and lazy strings encoded by DRF's encoder. Indented output (``Accept:
+    application/json; indent=4``) uses the stdlib renderer.
+    """
+    options = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_SUBCLASS | orjson.OPT_NON_STR_KEYS
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        if self.get_indent(accepted_media_type, renderer_context or {}):
+            return super().render(data, accepted_media_type, renderer_context)
+        content = orjson.dumps(data, default=_encode_default, option=self.options)
+        return content.replace(b'\xe2\x80\xa8', b'\\u2028').replace(b'\xe2\x80\xa9', b'\\u2029')
+
+
+class MessagePackRenderer(renderers.BaseRenderer):
+    """MessagePack bodies for clients sending ``Accept: application/msgpack``."""
+    media_type = 'application/msgpack'
+    format = 'msgpack'
+    charset = None
+    render_style = 'binary'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        return msgpack.packb(data, default=_encode_default, use_bin_type=True, strict_types=True)
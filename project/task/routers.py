@@ -0,0 +1,73 @@
+import contextvars
+import random
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+
+_current_routing = contextvars.ContextVar('db_routing', default=None)
+
+
+class RoutingState:
+    """Read routing of one request: pinned to the primary or free to use a replica."""
+
+    def __init__(self, pinned=False):
+        self.pinned = pinned
+        self.wrote = False
+
+
+def get_current_routing():
+    return _current_routing.get()
+
+
+def activate(state):
+    return _current_routing.set(state)
+
+
+def deactivate(token):
+    _current_routing.reset(token)
+
+
+def get_replicas():
+    return getattr(settings, 'READ_REPLICAS', {}).get('DATABASES', [])
+
+
+def get_replicated_models():
+    return getattr(settings, 'READ_REPLICAS', {}).get('MODELS', ['task.Product'])
+
+
+class PrimaryReplicaRouter:
+    """
+    Send writes to ``default`` and reads of ``READ_REPLICAS['MODELS']`` (the
+    product listing and export) to one of ``READ_REPLICAS['DATABASES']``.
+
+    Other models, such as users, tokens and sessions, are always read from
+    the primary: a lagging replica would reject a token issued by the
+    previous request. Product reads stay on the primary too when no replica
+    is configured, inside a transaction on the primary, and for requests
+    pinned by ``ReadYourWritesMiddleware`` (unsafe methods, views flagged
+    with ``read_from_primary`` and clients that wrote within the sticky
+    window).
+    """
+
+    def db_for_read(self, model, **hints):
+        replicas = get_replicas()
+        if not replicas:
+            return None
+        if model._meta.label not in get_replicated_models():
+            return DEFAULT_DB_ALIAS
+        state = _current_routing.get()
+        if state is not None and (state.pinned or state.wrote):
+            return DEFAULT_DB_ALIAS
+        if connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            return DEFAULT_DB_ALIAS
+        return random.choice(replicas)
+
+    def db_for_write(self, model, **hints):
+        state = _current_routing.get()
+        if state is not None:
+            state.wrote = True
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Every alias is the primary or one of its replicas, all holding the same rows.
+        return obj1._state.db in settings.DATABASES and obj2._state.db in settings.DATABASES
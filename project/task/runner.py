@@ -0,0 +1,105 @@
+import json
+import sys
+import time
+import unittest
+
+from django.test.runner import DiscoverRunner, default_test_processes
+
+
+class TimedTextTestResult(unittest.TextTestResult):
+    """Text result recording how long each test took."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.durations = []
+
+    def startTest(self, test):
+        self._started_at = time.perf_counter()
+        super().startTest(test)
+
+    def stopTest(self, test):
+        super().stopTest(test)
+        self.durations.append((test.id(), time.perf_counter() - self._started_at))
+
+
+class TimedTestRunner(DiscoverRunner):
+    """
+    ``DiscoverRunner`` that runs on every core unless ``--parallel`` says
+    otherwise, and reports where the suite's wall time went: database set
+    up, tests and tear down, plus the slowest tests when run serially.
+    ``--timing-report`` appends the numbers as a JSON line to a file so
+    runs can be compared over time.
+    """
+
+    def __init__(self, timing_report=None, slowest=10, **kwargs):
+        super().__init__(**kwargs)
+        self.timing_report = timing_report
+        self.slowest = slowest
+        self.phases = {}
+        self.result = None
+
+    @classmethod
+    def add_arguments(cls, parser):
+        super().add_arguments(parser)
+        parser.set_defaults(parallel=default_test_processes())
+        parser.add_argument(
+            '--timing-report', metavar='PATH',
+            help='Append the suite timings as a JSON line to PATH.')
+        parser.add_argument(
+            '--slowest', type=int, default=10,
+            help='Number of slowest tests to report on serial runs (default: 10).')
+
+    def get_resultclass(self):
+        resultclass = super().get_resultclass()
+        if resultclass is None and self.parallel <= 1:
+            # Parallel runs replay results in the parent once a worker is done,
+            # which makes per-test durations meaningless there.
+            return TimedTextTestResult
+        return resultclass
+
+    def timed(self, phase, func, *args, **kwargs):
+        started = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            self.phases[phase] = self.phases.get(phase, 0) + time.perf_counter() - started
+
+    def setup_databases(self, **kwargs):
+        return self.timed('databases', super().setup_databases, **kwargs)
+
+    def run_suite(self, suite, **kwargs):
+        self.result = self.timed('tests', super().run_suite, suite, **kwargs)
+        return self.result
+
+    def teardown_databases(self, old_config, **kwargs):
+        return self.timed('teardown', super().teardown_databases, old_config, **kwargs)
+
+    def run_tests(self, *args, **kwargs):
+        started = time.perf_counter()
+        failures = super().run_tests(*args, **kwargs)
+        self.report(time.perf_counter() - started)
+        return failures
+
+    def report(self, wall_time):
+        durations = sorted(getattr(self.result, 'durations', []), key=lambda item: item[1], reverse=True)
+        slowest = durations[:self.slowest]
+        lines = ['Suite wall time: {:.2f}s ({}) on {} process{}'.format(
+            wall_time,
+            ', '.join('{} {:.2f}s'.format(phase, seconds) for phase, seconds in self.phases.items()),
+            self.parallel, 'es' if self.parallel > 1 else '',
+        )]
+        if slowest:
+            lines.append('Slowest tests:')
+            lines.extend('  {:.3f}s {}'.format(seconds, test_id) for test_id, seconds in slowest)
+        sys.stderr.write('\n'.join(lines) + '\n')
+
+        if self.timing_report:
+            with open(self.timing_report, 'a') as report:
+                report.write(json.dumps({
+                    'finished_at': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+                    'wall_time': round(wall_time, 3),
+                    'phases': {phase: round(seconds, 3) for phase, seconds in self.phases.items()},
+                    'processes': self.parallel,
+                    'tests': self.result.testsRun if self.result else 0,
+                    'slowest': [[test_id, round(seconds, 3)] for test_id, seconds in slowest],
+                }) + '\n')
@@ -1,9 +1,24 @@
+import decimal
+
 from django.contrib.auth import get_user_model
+from django.db import IntegrityError
+from django.db.models import Q
+from django.urls import reverse
 from django.utils.translation import gettext as _
 from rest_framework import serializers
 from rest_framework.exceptions import ValidationError
+from rest_framework.settings import api_settings
+
+from task.concurrency import hash_password
+from task.models import Job, Product, SellerStats, User
 
-from task.models import Product, User
+
+def _unique_error_message(field_name):
+    """The message DRF's ``UniqueValidator`` would give for a taken ``User`` field."""
+    model_field = User._meta.get_field(field_name)
+    return model_field.error_messages['unique'] % {
+        'model_name': User._meta.verbose_name, 'field_label': model_field.verbose_name,
+    }
 
 
 class UserSerializer(serializers.ModelSerializer):
@@ -13,9 +28,34 @@ class UserSerializer(serializers.ModelSerializer):
     class Meta:
         model = get_user_model()
         fields = ['username', 'email', 'password', 'confirm_password']
-        extra_kwargs = {"password": {"write_only": True}}
+        extra_kwargs = {
+            "password": {"write_only": True},
+            # Uniqueness of both fields is checked with one query in validate().
+            "username": {"validators": [User.username_validator]},
+            "email": {"validators": []},
+        }
+
+    def validate_unique_identity(self, attrs):
+        lookups = Q()
+        for field_name in ('email', 'username'):
+            if field_name in attrs:
+                lookups |= Q(**{field_name: attrs[field_name]})
+        if not lookups:
+            return
+        taken = User.objects.filter(lookups)
+        if self.instance is not None:
+            taken = taken.exclude(pk=self.instance.pk)
+        errors = {}
+        for email, username in taken.values_list('email', 'username')[:2]:
+            if email == attrs.get('email'):
+                errors['email'] = [_unique_error_message('email')]
+            if username == attrs.get('username'):
+                errors['username'] = [_unique_error_message('username')]
+        if errors:
+            raise ValidationError(errors)
 
     def validate(self, attrs):
+        self.validate_unique_identity(attrs)
         if self.context.get('is_created'):
             if 'password' not in attrs and 'confirm_password' in attrs:
                 raise ValidationError({"password": _("password field is required")})
@@ -40,23 +80,24 @@ class UserSerializer(serializers.ModelSerializer):
 
     def create(self, validated_data):
         validated_data.pop('confirm_password')
-        return super(UserSerializer, self).create(validated_data)
+        # Hashed before the INSERT, so a signup is a single write.
+        validated_data['password'] = hash_password(validated_data['password'])
+        try:
+            return super(UserSerializer, self).create(validated_data)
+        except IntegrityError:
+            # Lost a race with a concurrent signup for the same email or username.
+            raise ValidationError({'non_field_errors': [_('A user with that email or username already exists.')]})
 
     def update(self, instance, validated_data):
-        try:
-            validated_data.pop('confirm_password')
-        except:
-            pass
+        validated_data.pop('confirm_password', None)
+        if 'password' in validated_data:
+            validated_data['password'] = hash_password(validated_data['password'])
         return super(UserSerializer, self).update(instance, validated_data)
 
     def save(self, **kwargs):
         if 'is_created' not in self.context:
             raise ValueError('is_created does not exist')
-        user = super(UserSerializer, self).save()
-        if 'password' in self.validated_data:
-            user.set_password(self.validated_data["password"])
-            user.save()
-        return user
+        return super(UserSerializer, self).save(**kwargs)
 
 
 class ProductSerializer(serializers.ModelSerializer):
@@ -65,3 +106,86 @@ class ProductSerializer(serializers.ModelSerializer):
     class Meta:
         model = Product
         fields = ['name', 'price', 'seller']
+
+
+_price_field = Product._meta.get_field('price')
+PRICE_QUANTUM = decimal.Decimal('.1') ** _price_field.decimal_places
+PRICE_CONTEXT = decimal.Context(prec=_price_field.max_digits)
+
+
+def format_price(value):
+    """Format a ``Product.price`` exactly like ``ProductSerializer``'s DecimalField does."""
+    if value is None:
+        return None
+    quantized = value.quantize(PRICE_QUANTUM, context=PRICE_CONTEXT)
+    if not api_settings.COERCE_DECIMAL_TO_STRING:
+        return quantized
+    return '{:f}'.format(quantized)
+
+
+class ProductReadSerializer:
+    """
+    Read-only counterpart of ``ProductSerializer`` for listing many products.
+
+    Works on ``values_list`` rows instead of model instances and builds the
+    output dicts directly, skipping the per-field machinery of
+    ``ModelSerializer``. The rendered JSON is identical to
+    ``ProductSerializer(many=True)``.
+    """
+    values_fields = ('id', 'name', 'price', 'seller_id')
+
+    def __init__(self, rows):
+        self.rows = rows
+
+    @classmethod
+    def get_rows(cls, queryset):
+        return queryset.values_list(*cls.values_fields, named=True)
+
+    @property
+    def data(self):
+        return [
+            {'name': name, 'price': format_price(price), 'seller': seller_id}
+            for _pk, name, price, seller_id in self.rows
+        ]
+
+
+class ProductBulkRowSerializer(serializers.ModelSerializer):
+    """
+    Validates one row of a bulk import without touching the database.
+
+    ``seller`` is a plain integer here; bulk imports resolve the sellers of a
+    whole batch with a single query instead of one per row.
+    """
+    seller = serializers.IntegerField(required=False, allow_null=True)
+
+    class Meta:
+        model = Product
+        fields = ['name', 'price', 'seller']
+
+
+class SellerStatsSerializer(serializers.ModelSerializer):
+    avg_price = serializers.DecimalField(max_digits=10, decimal_places=2, read_only=True)
+
+    class Meta:
+        model = SellerStats
+        fields = ['product_count', 'min_price', 'max_price', 'avg_price', 'updated_at']
+
+
+class JobSerializer(serializers.ModelSerializer):
+    result = serializers.SerializerMethodField()
+
+    class Meta:
+        model = Job
+        fields = ['id', 'kind', 'status', 'attempts', 'max_attempts', 'result', 'error',
+                  'created_at', 'started_at', 'finished_at']
+
+    def get_result(self, job):
+        # Finished exports are downloaded through the API; their server path stays private.
+        if job.kind == 'products.export' and job.status == Job.SUCCEEDED and job.result:
+            url = reverse('task:job-download', args=[job.pk])
+            request = self.context.get('request')
+            return {
+                'size': job.result['size'],
+                'url': request.build_absolute_uri(url) if request is not None else url,
+            }
+        return job.result
@@ -0,0 +1,77 @@
+import copy
+import time
+from importlib import import_module
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+from django.core.exceptions import ImproperlyConfigured
+from django.utils import timezone
+
+
+class UnchangedSessionMixin:
+    """
+    Session store remembering the key and data it loaded, so
+    ``task.middleware.SessionMiddleware`` can skip the save (and the
+    ``Set-Cookie``) of a session that was marked modified but holds what it
+    held before, e.g. a view assigning a value the session already had.
+    """
+
+    def _get_session(self, no_load=False):
+        loaded = hasattr(self, '_session_cache')
+        session = super()._get_session(no_load)
+        if not loaded:
+            self._loaded_state = (self.session_key, copy.deepcopy(session))
+        return session
+
+    _session = property(_get_session)
+
+    def has_changed(self):
+        if not hasattr(self, '_loaded_state'):
+            return self.modified
+        return self._loaded_state != (self.session_key, self._session)
+
+
+def check_session_cache(store):
+    """
+    Raise ``ImproperlyConfigured`` when ``store`` keeps sessions in a cache
+    that is not shared by every worker. A logout or key rotation would then
+    only drop the session from one worker's memory, and the others would
+    keep accepting the old cookie.
+    """
+    if not getattr(store, 'requires_shared_cache', False):
+        return
+    cache = caches[settings.SESSION_CACHE_ALIAS]
+    if isinstance(cache, (LocMemCache, DummyCache)):
+        raise ImproperlyConfigured(
+            '{} needs CACHES[{!r}] to be shared by every worker (Redis, Memcached...), not {}.'.format(
+                settings.SESSION_ENGINE, settings.SESSION_CACHE_ALIAS, type(cache).__name__))
+
+
+def purge_expired_sessions(batch_size=1000, sleep=0.0):
+    """
+    Delete expired sessions of the configured engine and return how many
+    were deleted.
+
+    Database-backed engines are purged ``batch_size`` rows at a time, each
+    batch being its own short DELETE by primary key, so the table is never
+    locked for the length of a single huge DELETE as with
+    ``clearsessions``. ``sleep`` seconds between batches leave room for
+    other writers and for replicas to catch up. Engines that expire
+    sessions by themselves (cache, signed cookies) delete nothing.
+    """
+    store = import_module(settings.SESSION_ENGINE).SessionStore
+    if not hasattr(store, 'get_model_class'):
+        store.clear_expired()
+        return 0
+    sessions = store.get_model_class().objects
+    now = timezone.now()
+    deleted = 0
+    while True:
+        keys = list(sessions.filter(expire_date__lt=now).values_list('pk', flat=True)[:batch_size])
+        if not keys:
+            return deleted
+        deleted += sessions.filter(pk__in=keys).delete()[0]
+        if sleep and len(keys) == batch_size:
+            time.sleep(sleep)
@@ -0,0 +1,7 @@
+from django.contrib.sessions.backends import cache
+
+from task.sessions import UnchangedSessionMixin
+
+
+class SessionStore(UnchangedSessionMixin, cache.SessionStore):
+    requires_shared_cache = True
@@ -0,0 +1,7 @@
+from django.contrib.sessions.backends import cached_db
+
+from task.sessions import UnchangedSessionMixin
+
+
+class SessionStore(UnchangedSessionMixin, cached_db.SessionStore):
+    requires_shared_cache = True
@@ -0,0 +1,7 @@
+from django.contrib.sessions.backends import db
+
+from task.sessions import UnchangedSessionMixin
+
+
+class SessionStore(UnchangedSessionMixin, db.SessionStore):
+    pass
@@ -0,0 +1,7 @@
+from django.contrib.sessions.backends import signed_cookies
+
+from task.sessions import UnchangedSessionMixin
+
+
+class SessionStore(UnchangedSessionMixin, signed_cookies.SessionStore):
+    pass
@@ -0,0 +1,78 @@
+from django.db import connections
+from django.db.models import F
+from django.db.models.signals import post_delete, post_save, pre_delete, pre_save
+from django.dispatch import receiver
+from django.utils import timezone
+from rest_framework.authtoken.models import Token
+
+from task.authentication import token_cache
+from task.models import Product, User
+from task.stats import apply_seller_stats_deltas, product_deltas
+
+
+def seller_catalog_changed(*seller_ids):
+    """
+    Bump the catalog version of the given sellers, which changes their
+    listing ETags and product list cache keys.
+    """
+    seller_ids = {seller_id for seller_id in seller_ids if seller_id is not None}
+    if not seller_ids:
+        return
+    User.objects.filter(pk__in=seller_ids).update(
+        catalog_version=F('catalog_version') + 1,
+        catalog_updated_at=timezone.now(),
+    )
+
+
+@receiver(pre_save, sender=Product)
+def remember_previous_state(sender, instance, **kwargs):
+    instance._previous_state = None
+    if not instance._state.adding and instance.pk is not None:
+        instance._previous_state = Product.objects.filter(pk=instance.pk).values_list('seller_id', 'price').first()
+
+
+@receiver(post_save, sender=Product)
+def product_saved(sender, instance, **kwargs):
+    changes = [(instance.seller_id, instance.price, 1)]
+    previous = getattr(instance, '_previous_state', None)
+    if previous is not None:
+        changes.append((*previous, -1))
+    apply_seller_stats_deltas(product_deltas(changes))
+    seller_catalog_changed(instance.seller_id, previous[0] if previous else None)
+
+
+@receiver(post_delete, sender=Product)
+def product_deleted(sender, instance, **kwargs):
+    apply_seller_stats_deltas(product_deltas([(instance.seller_id, instance.price, -1)]))
+    seller_catalog_changed(instance.seller_id)
+
+
+@receiver(pre_delete, sender=User)
+def delete_seller_catalog(sender, instance, using, **kwargs):
+    """
+    Delete the products of a seller being deleted with a single statement.
+
+    ``Product.seller`` doesn't cascade: as ``product_deleted`` listens to
+    deletes, the collector would load every product and update the stats
+    and catalog version once per product, all of which go with the seller.
+    A raw DELETE sends no signals; the stats row is then fast-deleted by
+    the collector with the user.
+    """
+    connection = connections[using]
+    quote = connection.ops.quote_name
+    with connection.cursor() as cursor:
+        cursor.execute('DELETE FROM {} WHERE {} = %s'.format(
+            quote(Product._meta.db_table), quote(Product._meta.get_field('seller').column),
+        ), [instance.pk])
+
+
+@receiver(post_delete, sender=Token)
+def forget_deleted_token(sender, instance, **kwargs):
+    token_cache.delete(instance.key)
+
+
+@receiver(post_save, sender=User)
+def forget_user_tokens(sender, instance, **kwargs):
+    # Password changes and deactivation must not outlive the cached credentials.
+    if len(token_cache):
+        token_cache.delete_where(lambda cached: cached[0].pk == instance.pk)
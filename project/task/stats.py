@@ -0,0 +1,120 @@
+import itertools
+from collections import defaultdict
+from decimal import Decimal
+
+from django.db import transaction
+from django.db.models import Count, F, Max, Min, Subquery, Sum
+from django.utils import timezone
+
+from task.models import Product, SellerStats, User
+
+
+def product_deltas(changes):
+    """
+    Sum ``(seller_id, price, sign)`` product changes into
+    ``{seller_id: (count, priced_count, price_sum)}``. ``sign`` is 1 for an
+    added product and -1 for a removed one; an update is both.
+    """
+    deltas = defaultdict(lambda: [0, 0, Decimal(0)])
+    for seller_id, price, sign in changes:
+        if seller_id is None:
+            continue
+        delta = deltas[seller_id]
+        delta[0] += sign
+        if price is not None:
+            delta[1] += sign
+            delta[2] += sign * Decimal(str(price))
+    return {seller_id: tuple(delta) for seller_id, delta in deltas.items()}
+
+
+def queryset_deltas(products, sign=1):
+    """
+    ``product_deltas()`` of every product in ``products`` with the same
+    ``sign``, summed by the database in one grouped query instead of
+    loading the rows.
+    """
+    rows = (
+        products.filter(seller__isnull=False)
+        .values('seller_id')
+        .annotate(count=Count('id'), priced_count=Count('price'), price_sum=Sum('price'))
+        .order_by()
+    )
+    return {
+        row['seller_id']: (sign * row['count'], sign * row['priced_count'], sign * (row['price_sum'] or Decimal(0)))
+        for row in rows
+    }
+
+
+def _price_bound(seller_id, ordering):
+    prices = Product.objects.filter(seller_id=seller_id, price__isnull=False).order_by(ordering)
+    return Subquery(prices.values('price')[:1])
+
+
+def apply_seller_stats_deltas(deltas):
+    """
+    Apply ``product_deltas()`` to the sellers' stats rows in place.
+
+    Counts and the price sum are incremented with ``F()`` expressions and the
+    price bounds are re-read from the (seller, price) index, so each seller
+    costs one UPDATE whatever the size of its catalog. A seller's first
+    product creates its empty row with an insert that concurrent first
+    writes can't collide on, then gets the same UPDATE.
+    """
+    for seller_id, (count, priced_count, price_sum) in deltas.items():
+        if not (count or priced_count or price_sum):
+            continue
+        updates = {
+            'product_count': F('product_count') + count,
+            'priced_count': F('priced_count') + priced_count,
+            'price_sum': F('price_sum') + price_sum,
+            'min_price': _price_bound(seller_id, 'price'),
+            'max_price': _price_bound(seller_id, '-price'),
+            'updated_at': timezone.now(),
+        }
+        stats = SellerStats.objects.filter(seller_id=seller_id)
+        # Removals without a row come from a seller being deleted along with
+        # its stats; there is nothing left to update.
+        if not stats.update(**updates) and count >= 0:
+            SellerStats.objects.bulk_create([SellerStats(seller_id=seller_id)], ignore_conflicts=True)
+            stats.update(**updates)
+
+
+def rebuild_seller_stats(seller_ids=None, batch_size=1000):
+    """
+    Recompute stats rows from ``Product`` with one grouped aggregate, for all
+    sellers or only ``seller_ids``. Returns the number of rows written.
+    """
+    sellers = User.objects.all() if seller_ids is None else User.objects.filter(pk__in=seller_ids)
+    aggregates = (
+        Product.objects.filter(seller__in=sellers)
+        .values('seller_id')
+        .annotate(
+            product_count=Count('id'), priced_count=Count('price'), price_sum=Sum('price'),
+            min_price=Min('price'), max_price=Max('price'),
+        )
+        .order_by()
+    )
+    stats = (
+        SellerStats(**dict(row, price_sum=row['price_sum'] or 0))
+        for row in aggregates.iterator()
+    )
+    if seller_ids is not None:
+        # Sellers left without products keep an empty row rather than a stale one.
+        with_products = set(aggregates.values_list('seller_id', flat=True))
+        stats = itertools.chain(stats, (
+            SellerStats(seller_id=seller_id)
+            for seller_id in sellers.values_list('pk', flat=True)
+            if seller_id not in with_products
+        ))
+
+    written = 0
+    with transaction.atomic():
+        stale = SellerStats.objects.all() if seller_ids is None else SellerStats.objects.filter(seller_id__in=seller_ids)
+        stale.delete()
+        while True:
+            batch = list(itertools.islice(stats, batch_size))
+            if not batch:
+                break
+            SellerStats.objects.bulk_create(batch)
+            written += len(batch)
+    return written
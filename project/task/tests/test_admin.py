@@ -0,0 +1,161 @@
+from unittest import mock
+
+from django.contrib.admin import helpers
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from task.authentication import token_cache
+from task.factories import UserFactory, ProductFactory, create_products, create_users
+from task.models import Product, SellerStats, User
+from task.pagination import EstimatedCountPaginator
+
+
+class EstimatedCountPaginatorTestCase(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        create_products(create_users(1), 3)
+
+    @override_settings(ADMIN_ESTIMATED_COUNT_THRESHOLD=1000)
+    def test_it_uses_the_estimate_for_large_unfiltered_tables(self):
+        """
+            set Up :
+              - the database statistics report more rows than the threshold
+
+            result : the estimate is used and no COUNT(*) runs
+        """
+        with mock.patch('task.pagination.estimate_row_count', return_value=2500000):
+            paginator = EstimatedCountPaginator(Product.objects.order_by('pk'), 50)
+            with self.assertNumQueries(0):
+                self.assertEquals(paginator.count, 2500000)
+
+    @override_settings(ADMIN_ESTIMATED_COUNT_THRESHOLD=1000)
+    def test_it_counts_small_or_filtered_tables_exactly(self):
+        """
+            set Up :
+              - the estimate is under the threshold, then the list is filtered
+
+            result : the exact count is returned
+        """
+        with mock.patch('task.pagination.estimate_row_count', return_value=10):
+            self.assertEquals(EstimatedCountPaginator(Product.objects.order_by('pk'), 50).count, 3)
+        with mock.patch('task.pagination.estimate_row_count', return_value=2500000) as estimate:
+            paginator = EstimatedCountPaginator(Product.objects.filter(price__gte=0).order_by('pk'), 50)
+            self.assertEquals(paginator.count, 3)
+        estimate.assert_not_called()
+
+    def test_sqlite_has_no_estimate(self):
+        """
+            set Up :
+              - we are paginating on SQLite, which keeps no row statistics
+
+            result : the exact count is returned
+        """
+        self.assertEquals(EstimatedCountPaginator(Product.objects.order_by('pk'), 50).count, 3)
+
+
+class ProductAdminTestCase(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = UserFactory(is_staff=True)
+        cls.seller = UserFactory()
+
+    def setUp(self):
+        self.client.force_login(self.admin)
+        self.products = [ProductFactory(seller=self.seller, price=price) for price in (10, 20, 30)]
+
+    def post_action(self, action, products):
+        return self.client.post(reverse('admin:task_product_changelist'), {
+            'action': action,
+            helpers.ACTION_CHECKBOX_NAME: [product.pk for product in products],
+        })
+
+    def test_change_list_queries_do_not_grow_with_rows(self):
+        """
+            set Up :
+              - we are loading the change list before and after adding products of other sellers
+
+            result : the same number of queries runs; sellers come from the same query as products
+        """
+        url = reverse('admin:task_product_changelist')
+        # session, user, one COUNT(*) and the page joined to its sellers
+        with self.assertNumQueries(4) as before:
+            self.client.get(url)
+        create_products(create_users(3), 5)
+        with self.assertNumQueries(len(before.captured_queries)):
+            response = self.client.get(url)
+        self.assertEquals(response.status_code, 200)
+
+    def test_change_form_uses_an_autocomplete_for_the_seller(self):
+        """
+            set Up :
+              - we are opening the edit form of a product
+
+            result : sellers are not listed as <option>s, except the current one
+        """
+        response = self.client.get(reverse('admin:task_product_change', args=[self.products[0].pk]))
+        self.assertContains(response, 'admin-autocomplete')
+        self.assertNotContains(response, '<option value="{}"'.format(self.admin.pk))
+
+    def test_seller_autocomplete_searches_by_email(self):
+        """
+            set Up :
+              - we are typing the start of the seller's email in the autocomplete
+
+            result : the seller is suggested
+        """
+        response = self.client.get(reverse('admin:autocomplete'), {
+            'term': self.seller.email[:5], 'app_label': 'task', 'model_name': 'product', 'field_name': 'seller',
+        })
+        self.assertIn(str(self.seller.pk), [result['id'] for result in response.json()['results']])
+
+    def test_delete_action_runs_one_delete_and_keeps_stats(self):
+        """
+            set Up :
+              - we are deleting two products with the bulk action
+
+            result : a single DELETE statement runs and the seller's stats follow
+        """
+        with CaptureQueriesContext(connection) as queries:
+            response = self.post_action('delete_products', self.products[:2])
+        self.assertEquals(response.status_code, 302)
+        deletes = [query['sql'] for query in queries if query['sql'].startswith('DELETE')]
+        self.assertEquals(len(deletes), 1)
+        self.assertEquals(list(Product.objects.values_list('pk', flat=True)), [self.products[2].pk])
+        stats = SellerStats.objects.get(seller=self.seller)
+        self.assertEquals((stats.product_count, stats.min_price, stats.max_price), (1, 30, 30))
+
+    def test_clear_prices_action_runs_one_update_and_keeps_stats(self):
+        """
+            set Up :
+              - we are clearing the price of the two cheapest products
+
+            result : their price is NULL and the seller's stats only count the remaining price
+        """
+        self.post_action('clear_prices', self.products[:2])
+        self.assertEquals(Product.objects.filter(price__isnull=True).count(), 2)
+        stats = SellerStats.objects.get(seller=self.seller)
+        self.assertEquals((stats.product_count, stats.priced_count, stats.avg_price), (3, 1, 30))
+
+
+class UserAdminTestCase(TestCase):
+    def setUp(self):
+        self.admin = UserFactory(is_staff=True)
+        self.client.force_login(self.admin)
+
+    def test_deactivate_action_drops_cached_tokens(self):
+        """
+            set Up :
+              - a user with a cached API token is deactivated from the admin
+
+            result : the user is inactive and the token is no longer cached
+        """
+        user = UserFactory()
+        token_cache.set('key', (user, None))
+        self.addCleanup(token_cache.clear)
+        self.client.post(reverse('admin:task_user_changelist'), {
+            'action': 'deactivate_users', helpers.ACTION_CHECKBOX_NAME: [user.pk],
+        })
+        self.assertFalse(User.objects.get(pk=user.pk).is_active)
+        self.assertIsNone(token_cache.get('key'))
@@ -0,0 +1,218 @@
+import asyncio
+
+from django.core.exceptions import ImproperlyConfigured
+from django.http import HttpResponse
+from django.test import AsyncClient, SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+from task.admission import AdmissionController, EndpointLimit, check_worker_concurrency, get_admission_controller
+from task.authentication import token_cache
+from task.factories import UserFactory
+from task.middleware import AdmissionControlMiddleware
+
+ADMISSION_CONTROL = {
+    'ENABLED': True,
+    'MAX_IN_FLIGHT': 4,
+    'RETRY_AFTER': 2,
+    'PRIORITIES': {'login': 'critical', 'task:export': 'low'},
+    'DEFAULT_PRIORITY': 'normal',
+    'PRIORITY_SHARES': {'critical': 1.0, 'normal': 0.75, 'low': 0.5},
+}
+
+
+class EndpointLimitTestCase(SimpleTestCase):
+    def feed(self, limit, latency, count, in_flight=None):
+        for _ in range(count):
+            limit.record(latency, limit.limit if in_flight is None else in_flight)
+
+    def test_it_grows_while_latency_is_steady(self):
+        """
+            set Up :
+              - a busy endpoint keeps answering in 10ms
+
+            result : its limit grows up to MAX_LIMIT
+        """
+        limit = EndpointLimit('normal', initial_limit=10, max_limit=50)
+        self.feed(limit, 0.010, 100)
+        self.assertEquals(limit.limit, 50)
+
+    def test_it_shrinks_when_latency_climbs(self):
+        """
+            set Up :
+              - an endpoint answering in 10ms starts taking 100ms
+
+            result : its limit goes down
+        """
+        limit = EndpointLimit('normal', initial_limit=20)
+        self.feed(limit, 0.010, 100, in_flight=5)
+        self.feed(limit, 0.100, 20)
+        self.assertLess(limit.limit, 20)
+        self.assertGreaterEqual(limit.limit, 1)
+
+    def test_it_does_not_grow_while_idle(self):
+        """
+            set Up :
+              - fast requests come one at a time
+
+            result : the limit stays where it was
+        """
+        limit = EndpointLimit('normal', initial_limit=20)
+        self.feed(limit, 0.010, 100, in_flight=1)
+        self.assertEquals(limit.limit, 20)
+
+
+class AdmissionControllerTestCase(SimpleTestCase):
+    def test_it_sheds_past_the_endpoint_limit(self):
+        """
+            set Up :
+              - an endpoint limited to two requests gets a third one
+
+            result : the third one is rejected, and admitted again once a slot frees up
+        """
+        controller = AdmissionController(initial_limit=2)
+        self.assertTrue(controller.acquire('task:listing'))
+        self.assertTrue(controller.acquire('task:listing'))
+        self.assertFalse(controller.acquire('task:listing'))
+        controller.release('task:listing', 0.01)
+        self.assertTrue(controller.acquire('task:listing'))
+        stats = controller.stats()
+        self.assertEquals((stats['admitted'], stats['rejected'], stats['in_flight']), (3, 1, 2))
+
+    def test_low_priorities_are_shed_first(self):
+        """
+            set Up :
+              - half of the process' slots are in use
+
+            result : low priority requests are rejected, critical ones still admitted
+        """
+        controller = AdmissionController(
+            max_in_flight=4, priorities=ADMISSION_CONTROL['PRIORITIES'],
+            priority_shares=ADMISSION_CONTROL['PRIORITY_SHARES'],
+        )
+        controller.acquire('task:listing')
+        controller.acquire('task:listing')
+        self.assertFalse(controller.acquire('task:export'))
+        self.assertTrue(controller.acquire('task:listing'))
+        self.assertFalse(controller.acquire('task:listing'))
+        self.assertTrue(controller.acquire('login'))
+        self.assertFalse(controller.acquire('login'))
+        self.assertEquals(controller.stats()['endpoints']['task:export']['priority'], 'low')
+
+
+@override_settings(ADMISSION_CONTROL=ADMISSION_CONTROL)
+class AdmissionControlMiddlewareTestCase(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = UserFactory(is_staff=True)
+        cls.token = Token.objects.create(user=cls.user)
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.controller = get_admission_controller()
+
+    def test_admitted_requests_release_their_slot(self):
+        """
+            set Up :
+              - we are requesting the listing while the process is idle
+
+            result : the request is served and counted, and its slot is free again
+        """
+        response = self.client.get(reverse('task:listing'))
+        self.assertEquals(response.status_code, status.HTTP_200_OK)
+        listing = self.controller.stats()['endpoints']['task:listing']
+        self.assertEquals((listing['admitted'], listing['in_flight']), (1, 0))
+        self.assertIsNotNone(listing['latency_ms'])
+
+    def test_overloaded_requests_get_a_503(self):
+        """
+            set Up :
+              - two requests are in progress when an export and a login come in
+
+            result : the export is shed with Retry-After, the login goes through
+        """
+        self.controller.acquire('task:listing')
+        self.controller.acquire('task:listing')
+        response = self.client.get(reverse('task:export', args=['ndjson']))
+        self.assertEquals(response.status_code, status.HTTP_503_SERVICE_UNAVAILABLE)
+        self.assertEquals(response['Retry-After'], '2')
+        self.assertEquals(response.json()['detail'], 'Server overloaded, try again later.')
+
+        response = self.client.post(reverse('login'), {'username': self.user.username, 'password': 'wrong'})
+        self.assertNotEquals(response.status_code, status.HTTP_503_SERVICE_UNAVAILABLE)
+
+        self.controller.release('task:listing', 0.01)
+        self.controller.release('task:listing', 0.01)
+        stats = self.client.get(reverse('metrics')).data['admission_control']
+        self.assertEquals(stats['endpoints']['task:export']['rejected'], 1)
+        self.assertEquals(stats['endpoints']['login']['admitted'], 1)
+
+    def test_streaming_response_holds_its_slot_until_closed(self):
+        """
+            set Up :
+              - we are streaming an export
+
+            result : its slot stays taken while the body is sent, and is freed once the response is closed
+        """
+        response = self.client.get(reverse('task:export', args=['ndjson']))
+        self.assertEquals(response.status_code, status.HTTP_200_OK)
+        self.assertEquals(self.controller.stats()['endpoints']['task:export']['in_flight'], 1)
+        b''.join(response.streaming_content)
+        self.assertEquals(self.controller.stats()['endpoints']['task:export']['in_flight'], 0)
+
+    async def test_it_runs_under_the_async_handler(self):
+        """
+            set Up :
+              - we are requesting the listing through the ASGI handler
+
+            result : the middleware runs as a coroutine, the request is served and its slot freed
+        """
+        async def get_response(request):
+            return HttpResponse()
+
+        self.assertTrue(asyncio.iscoroutinefunction(AdmissionControlMiddleware(get_response)))
+
+        token_cache.clear()
+        response = await AsyncClient().get(reverse('task:listing'), authorization='Token ' + self.token.key)
+        self.assertEquals(response.status_code, status.HTTP_200_OK)
+        listing = self.controller.stats()['endpoints']['task:listing']
+        self.assertEquals((listing['admitted'], listing['in_flight']), (1, 0))
+
+    @override_settings(ADMISSION_CONTROL={'ENABLED': False})
+    def test_disabled_controller_admits_everything(self):
+        """
+            set Up :
+              - admission control is disabled
+
+            result : no controller, and requests are served
+        """
+        self.assertIsNone(get_admission_controller())
+        self.assertEquals(self.client.get(reverse('task:listing')).status_code, status.HTTP_200_OK)
+
+
+class WorkerConcurrencyCheckTestCase(SimpleTestCase):
+    @override_settings(ADMISSION_CONTROL=ADMISSION_CONTROL)
+    def test_single_threaded_workers_are_refused(self):
+        """
+            set Up :
+              - admission control is enabled and gunicorn starts sync, threaded or async workers
+
+            result : only single-threaded sync workers are refused
+        """
+        with self.assertRaisesMessage(ImproperlyConfigured, 'GUNICORN_THREADS'):
+            check_worker_concurrency('sync')
+        check_worker_concurrency('gthread')
+        check_worker_concurrency('uvicorn.workers.UvicornWorker')
+
+    @override_settings(ADMISSION_CONTROL={'ENABLED': False})
+    def test_any_worker_is_accepted_when_disabled(self):
+        """
+            set Up :
+              - admission control is disabled and gunicorn starts sync workers
+
+            result : they are accepted
+        """
+        check_worker_concurrency('sync')
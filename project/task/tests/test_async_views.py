@@ -0,0 +1,160 @@
+import json
+
+import msgpack
+from django.test import AsyncClient, TransactionTestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+from task.authentication import token_cache
+from task.factories import UserFactory, ProductFactory
+from task.models import Product
+
+
+class AsyncProductViewsTestCase(TransactionTestCase):
+    """
+        The async views run their queries on pool threads with their own
+        connections, so the data must be committed: TransactionTestCase.
+    """
+
+    def setUp(self):
+        token_cache.clear()
+        self.user = UserFactory()
+        self.token = Token.objects.create(user=self.user)
+        ProductFactory(seller=self.user, price=20)
+        ProductFactory(seller=self.user, price=10)
+        self.client = AsyncClient()
+        # AsyncClient in Django 3.2 takes raw header names.
+        self.headers = {'authorization': 'Token ' + self.token.key}
+
+    async def test_it_returns_401_when_user_is_not_authenticated(self):
+        """
+            set Up :
+              - we are requesting the async listing with no credentials
+
+            result : returning unauthorized response 401
+        """
+        response = await self.client.get(reverse('task:async-listing'))
+        self.assertEquals(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    async def test_it_lists_same_json_as_sync_view(self):
+        """
+            set Up :
+              - we are requesting the sync and async listings with the same token
+
+            result : both return the same JSON
+        """
+        sync_response = await self.client.get(reverse('task:listing'), **self.headers)
+        response = await self.client.get(reverse('task:async-listing'), **self.headers)
+        self.assertEquals(response.status_code, status.HTTP_200_OK)
+        self.assertEquals(json.loads(response.content), json.loads(sync_response.content))
+        self.assertEquals([item['price'] for item in json.loads(response.content)], ['10.00', '20.00'])
+
+    async def test_it_filters_like_sync_view(self):
+        """
+            set Up :
+              - we are requesting both listings with a price bound and an ordering
+
+            result : both return the same filtered, ordered JSON
+        """
+        query = '?min_price=15&ordering=-price'
+        sync_response = await self.client.get(reverse('task:listing') + query, **self.headers)
+        response = await self.client.get(reverse('task:async-listing') + query, **self.headers)
+        self.assertEquals(json.loads(response.content), json.loads(sync_response.content))
+        self.assertEquals([item['price'] for item in json.loads(response.content)], ['20.00'])
+
+    async def test_it_returns_422_for_invalid_filters(self):
+        """
+            set Up :
+              - we are requesting the async listing with an unknown ordering
+
+            result : returning response 422, as the sync listing does
+        """
+        response = await self.client.get(reverse('task:async-listing') + '?ordering=cost', **self.headers)
+        self.assertEquals(response.status_code, status.HTTP_422_UNPROCESSABLE_ENTITY)
+        self.assertIn('ordering', json.loads(response.content))
+
+    def test_async_and_sync_listing_match(self):
+        """
+            set Up :
+              - we are requesting both listings from the sync test client
+
+            result : both bodies are byte-identical
+        """
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION='Token ' + self.token.key)
+        sync_body = client.get(reverse('task:listing')).content
+        async_body = client.get(reverse('task:async-listing')).content
+        self.assertEquals(async_body, sync_body)
+
+    async def test_it_paginates(self):
+        """
+            set Up :
+              - we are requesting one item per page
+
+            result : a page with a next link
+        """
+        response = await self.client.get(reverse('task:async-listing') + '?page_size=1', **self.headers)
+        data = json.loads(response.content)
+        self.assertEquals(len(data['results']), 1)
+        self.assertIsNotNone(data['next'])
+
+    async def test_it_creates_product(self):
+        """
+            set Up :
+              - we are posting a product to the async create view
+
+            result : returning response 201 and the product is saved
+        """
+        response = await self.client.post(
+            reverse('task:async-create'), {'name': 'car', 'price': 5, 'seller': self.user.pk},
+            content_type='application/json', **self.headers)
+        self.assertEquals(response.status_code, status.HTTP_201_CREATED)
+        self.assertEquals(json.loads(response.content), {'name': 'car', 'price': '5.00', 'seller': self.user.pk})
+
+    async def test_it_returns_422_when_insert_invalid_data(self):
+        """
+            set Up :
+              - we are posting an empty product
+
+            result : returning response 422
+        """
+        response = await self.client.post(
+            reverse('task:async-create'), {}, content_type='application/json', **self.headers)
+        self.assertEquals(response.status_code, status.HTTP_422_UNPROCESSABLE_ENTITY)
+
+    def test_async_and_sync_create_accept_the_same_bodies(self):
+        """
+            set Up :
+              - we are posting the same JSON, msgpack and form bodies to both create views
+
+            result : both answer the same status and body for each
+        """
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION='Token ' + self.token.key)
+        product = {'name': 'car', 'price': 5, 'seller': self.user.pk}
+        bodies = [
+            (json.dumps(product), 'application/json'),
+            (msgpack.packb(product), 'application/msgpack'),
+            ('name=car&price=5&seller={}'.format(self.user.pk), 'application/x-www-form-urlencoded'),
+        ]
+        for body, content_type in bodies:
+            with self.subTest(content_type=content_type):
+                sync = client.post(reverse('task:create'), body, content_type=content_type)
+                response = client.post(reverse('task:async-create'), body, content_type=content_type)
+                self.assertEquals(response.status_code, status.HTTP_201_CREATED)
+                self.assertEquals((response.status_code, json.loads(response.content)),
+                                  (sync.status_code, sync.json()))
+
+    def test_created_product_exists(self):
+        """
+            set Up :
+              - we are posting a product from the sync test client
+
+            result : the product is visible in the database
+        """
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION='Token ' + self.token.key)
+        client.post(reverse('task:async-create'), {'name': 'bike'}, format='json')
+        self.assertTrue(Product.objects.filter(name='bike').exists())
@@ -0,0 +1,146 @@
+import base64
+
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+from task.authentication import token_cache
+from task.factories import UserFactory, ProductFactory
+
+
+def _basic(username, password):
+    return 'Basic ' + base64.b64encode('{}:{}'.format(username, password).encode()).decode()
+
+
+class CachedTokenAuthenticationTestCase(TestCase):
+    def setUp(self):
+        token_cache.clear()
+        self.user = UserFactory()
+        self.token = Token.objects.create(user=self.user)
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION='Token ' + self.token.key)
+        self.url = reverse('task:listing')
+
+    def test_it_authenticates_with_token(self):
+        """
+            set Up :
+              - we are requesting the listing with a token header
+
+            result : returning response 200 ok
+        """
+        response = self.client.get(self.url)
+        self.assertEquals(response.status_code, status.HTTP_200_OK)
+
+    def test_it_returns_401_when_token_is_invalid(self):
+        """
+            set Up :
+              - we are requesting the listing with an unknown token
+
+            result : returning unauthorized response 401
+        """
+        self.client.credentials(HTTP_AUTHORIZATION='Token not-a-token')
+        response = self.client.get(self.url)
+        self.assertEquals(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_repeat_requests_skip_token_lookup(self):
+        """
+            set Up :
+              - we are sending two authenticated requests to the login view
+
+            result : the second request does not query the token table
+        """
+        url = reverse('login')
+        with self.assertNumQueries(2):
+            # token + user lookup, then get_or_create of the token
+            self.client.get(url)
+        with self.assertNumQueries(1):
+            response = self.client.get(url)
+        self.assertEquals(response.status_code, status.HTTP_200_OK)
+
+    @override_settings(TOKEN_AUTH_CACHE={'TTL': 0, 'MAX_ENTRIES': 10})
+    def test_zero_ttl_disables_the_cache(self):
+        """
+            set Up :
+              - the token cache TTL is set to 0
+
+            result : every request looks the token up and nothing is cached
+        """
+        url = reverse('login')
+        self.client.get(url)
+        with self.assertNumQueries(2):
+            self.client.get(url)
+        self.assertEquals(len(token_cache), 0)
+
+    def test_deleted_token_is_rejected(self):
+        """
+            set Up :
+              - we are deleting a token after it was cached
+
+            result : returning unauthorized response 401
+        """
+        self.client.get(self.url)
+        self.token.delete()
+        response = self.client.get(self.url)
+        self.assertEquals(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_deactivated_user_is_rejected(self):
+        """
+            set Up :
+              - we are deactivating the user after its token was cached
+
+            result : returning unauthorized response 401
+        """
+        self.client.get(self.url)
+        self.user.is_active = False
+        self.user.save()
+        response = self.client.get(self.url)
+        self.assertEquals(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_cached_user_does_not_serve_stale_etag(self):
+        """
+            set Up :
+              - we are creating a product after the token and the ETag were cached
+
+            result : the old ETag no longer matches
+        """
+        etag = self.client.get(self.url)['ETag']
+        ProductFactory(seller=self.user)
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEquals(response.status_code, status.HTTP_200_OK)
+        self.assertEquals(len(response.data), 1)
+
+
+class TokenIssuingTestCase(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+
+    def test_signup_returns_token(self):
+        """
+            set Up :
+              - we are signing up a new user
+
+            result : the response carries a token that authenticates the user
+        """
+        response = self.client.post(reverse('signup'), {
+            'username': 'test', 'email': 'test@test.com', 'password': 'secret', 'confirm_password': 'secret',
+        })
+        self.assertEquals(response.status_code, status.HTTP_201_CREATED)
+        self.client.credentials(HTTP_AUTHORIZATION='Token ' + response.data['token'])
+        self.assertEquals(self.client.get(reverse('task:listing')).status_code, status.HTTP_200_OK)
+
+    def test_login_returns_same_token(self):
+        """
+            set Up :
+              - we are logging in twice with basic credentials
+
+            result : the same token is returned each time
+        """
+        user = UserFactory()
+        self.client.credentials(HTTP_AUTHORIZATION=_basic(user.email, 'secret'))
+        first = self.client.get(reverse('login')).data['token']
+        second = self.client.get(reverse('login')).data['token']
+        self.assertEquals(first, second)
+        self.assertEquals(Token.objects.get(user=user).key, first)
+
@@ -0,0 +1,138 @@
+import json
+
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from task.factories import UserFactory
+from task.models import Job, Product, SellerStats
+
+
+class ProductBulkCreateTestCase(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = UserFactory()
+        self.client.login(username=self.user.email, password='secret')
+        self.url = reverse('task:bulk-create')
+
+    def test_it_returns_401_when_user_is_not_authenticated(self):
+        """
+            set Up :
+              - we are posting without credentials
+
+            result : returning unauthorized response 401
+        """
+        response = APIClient().post(self.url, [], format='json')
+        self.assertEquals(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_it_creates_products_from_json_array(self):
+        """
+            set Up :
+              - we are posting a JSON array of products with a small chunk size
+
+            result : all products are created and throughput numbers are returned
+        """
+        rows = [{'name': 'item %d' % i, 'price': i, 'seller': self.user.pk} for i in range(5)]
+        response = self.client.post(self.url + '?chunk_size=2', rows, format='json')
+        self.assertEquals(response.status_code, status.HTTP_201_CREATED)
+        self.assertEquals(response.data['created'], 5)
+        self.assertEquals(response.data['failed'], 0)
+        self.assertIn('rows_per_second', response.data)
+        self.assertEquals(Product.objects.filter(seller=self.user).count(), 5)
+
+    def test_it_creates_products_from_ndjson_stream(self):
+        """
+            set Up :
+              - we are posting newline-delimited JSON rows
+
+            result : every non blank line becomes a product
+        """
+        body = '\n'.join(json.dumps({'name': 'item %d' % i, 'price': '1.50'}) for i in range(3)) + '\n\n'
+        response = self.client.post(self.url, body, content_type='application/x-ndjson')
+        self.assertEquals(response.status_code, status.HTTP_201_CREATED)
+        self.assertEquals(response.data['created'], 3)
+
+    def test_it_reports_errors_per_row(self):
+        """
+            set Up :
+              - we are posting a mix of valid rows, invalid rows and an unknown seller
+
+            result : valid rows are created and each invalid row is reported by index
+        """
+        rows = [
+            {'name': 'ok', 'price': 1, 'seller': self.user.pk},
+            {'price': 1},
+            {'name': 'ghost', 'seller': 999999},
+            'not an object',
+            {'name': 'also ok'},
+        ]
+        response = self.client.post(self.url, rows, format='json')
+        self.assertEquals(response.status_code, status.HTTP_201_CREATED)
+        self.assertEquals(response.data['created'], 2)
+        self.assertEquals([error['index'] for error in response.data['errors']], [1, 2, 3])
+        self.assertIn('name', response.data['errors'][0]['errors'])
+        self.assertIn('seller', response.data['errors'][1]['errors'])
+
+    def test_seller_lookup_is_one_query_per_chunk(self):
+        """
+            set Up :
+              - we are importing many rows for the same seller in one chunk
+
+            result : sellers are resolved with a single query whatever the row count
+        """
+        rows = [{'name': 'item %d' % i, 'seller': self.user.pk} for i in range(50)]
+        SellerStats.objects.create(seller=self.user)
+        with self.assertNumQueries(8):
+            # session, user, savepoint, seller lookup, insert, seller stats, catalog version bump, release
+            response = self.client.post(self.url, rows, format='json')
+        self.assertEquals(response.data['created'], 50)
+
+    def test_bulk_create_bumps_catalog_version(self):
+        """
+            set Up :
+              - we are importing products for the logged in seller
+
+            result : the seller's catalog version changes so listing ETags are refreshed
+        """
+        self.client.post(self.url, [{'name': 'car', 'seller': self.user.pk}], format='json')
+        self.user.refresh_from_db()
+        self.assertEquals(self.user.catalog_version, 1)
+
+    def test_it_returns_422_when_payload_is_not_a_list(self):
+        """
+            set Up :
+              - we are posting a single object instead of a list
+
+            result : returning response 422
+        """
+        response = self.client.post(self.url, {'name': 'car'}, format='json')
+        self.assertEquals(response.status_code, status.HTTP_422_UNPROCESSABLE_ENTITY)
+
+    @override_settings(PRODUCT_BULK_CREATE={'CHUNK_SIZE': 2, 'MAX_CHUNK_SIZE': 2, 'MAX_ROWS': 3})
+    def test_it_rejects_imports_over_the_row_limit(self):
+        """
+            set Up :
+              - we are posting more rows than the configured maximum
+
+            result : returning response 422 and nothing is inserted
+        """
+        rows = [{'name': 'item %d' % i} for i in range(4)]
+        response = self.client.post(self.url, rows, format='json')
+        self.assertEquals(response.status_code, status.HTTP_422_UNPROCESSABLE_ENTITY)
+        self.assertEquals(response.json(), {'non_field_errors': ['A bulk import accepts at most 3 rows.']})
+        self.assertFalse(Product.objects.exists())
+
+    @override_settings(PRODUCT_BULK_CREATE={'CHUNK_SIZE': 2, 'MAX_CHUNK_SIZE': 2, 'MAX_ROWS': 3})
+    def test_it_rejects_background_imports_over_the_row_limit(self):
+        """
+            set Up :
+              - we are posting more rows than the configured maximum with ?background=1
+
+            result : returning the same 422 as the synchronous import and no job is queued
+        """
+        rows = [{'name': 'item %d' % i} for i in range(4)]
+        response = self.client.post(self.url + '?background=1', rows, format='json')
+        self.assertEquals(response.status_code, status.HTTP_422_UNPROCESSABLE_ENTITY)
+        self.assertEquals(response.json(), {'non_field_errors': ['A bulk import accepts at most 3 rows.']})
+        self.assertFalse(Job.objects.exists())
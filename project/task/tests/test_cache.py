@@ -0,0 +1,162 @@
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from task.cache import LocMemLRUBackend, ProductListCache, get_product_list_cache
+from task.factories import UserFactory, ProductFactory
+
+CACHE_ENABLED = {
+    'ENABLED': True,
+    'BACKEND': 'task.cache.LocMemLRUBackend',
+    'OPTIONS': {'max_entries': 16},
+}
+
+
+class LocMemLRUBackendTestCase(TestCase):
+    def test_it_evicts_least_recently_used_entry(self):
+        """
+            set Up :
+              - we are filling the backend over its entry limit after reading the first key
+
+            result : the untouched entry is evicted, the recently read one is kept
+        """
+        backend = LocMemLRUBackend(max_entries=2)
+        backend.set('a', b'1')
+        backend.set('b', b'2')
+        backend.get('a')
+        backend.set('c', b'3')
+        self.assertEquals(backend.get('a'), b'1')
+        self.assertIsNone(backend.get('b'))
+
+    def test_it_evicts_when_over_byte_budget(self):
+        """
+            set Up :
+              - we are storing values bigger than the byte budget allows together
+
+            result : oldest entries are evicted until the total fits
+        """
+        backend = LocMemLRUBackend(max_bytes=10)
+        backend.set('a', b'x' * 6)
+        backend.set('b', b'y' * 6)
+        self.assertIsNone(backend.get('a'))
+        self.assertEquals(backend.get('b'), b'y' * 6)
+
+    def test_it_counts_hits_and_misses(self):
+        """
+            set Up :
+              - we are reading a missing key and then a stored key
+
+            result : one miss and one hit are recorded
+        """
+        cache = ProductListCache(LocMemLRUBackend())
+        key = cache.make_key(1, 0, '/task/', 'application/json')
+        cache.get(key)
+        cache.set(key, b'[]')
+        cache.get(key)
+        self.assertEquals(cache.stats(), {'hits': 1, 'misses': 1, 'hit_ratio': 0.5})
+
+    def test_catalog_version_is_part_of_the_key(self):
+        """
+            set Up :
+              - we are building the key of the same url before and after a catalog version bump
+
+            result : the keys differ
+        """
+        cache = ProductListCache(LocMemLRUBackend())
+        self.assertNotEquals(cache.make_key(1, 1, '/task/', 'application/json'),
+                             cache.make_key(1, 2, '/task/', 'application/json'))
+
+
+@override_settings(PRODUCT_LIST_CACHE=CACHE_ENABLED)
+class ProductListCacheViewTestCase(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = UserFactory()
+        self.client.login(username=self.user.email, password='secret')
+        self.url = reverse('task:listing')
+        get_product_list_cache().clear()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.product = ProductFactory(seller=self.user, price=10)
+
+    def test_second_request_is_served_from_cache(self):
+        """
+            set Up :
+              - we are requesting the listing twice
+
+            result : the second response is a cache hit with the same body
+        """
+        first = self.client.get(self.url)
+        second = self.client.get(self.url)
+        self.assertEquals(first['X-Cache'], 'MISS')
+        self.assertEquals(second['X-Cache'], 'HIT')
+        self.assertEquals(first.content, second.content)
+        self.assertEquals(get_product_list_cache().stats()['hits'], 1)
+
+    def test_indented_listing_is_cached_separately(self):
+        """
+            set Up :
+              - we are requesting the listing compact, then with ``indent=4``
+
+            result : the indented request is a miss and renders indented
+        """
+        self.client.get(self.url)
+        response = self.client.get(self.url, HTTP_ACCEPT='application/json; indent=4')
+        self.assertEquals(response['X-Cache'], 'MISS')
+        self.assertIn(b'\n    ', response.content)
+
+    def test_create_view_invalidates_listing(self):
+        """
+            set Up :
+              - we are caching the listing and then creating a product through the create view
+
+            result : the next listing is a miss and contains the new product
+        """
+        self.client.get(self.url)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(reverse('task:create'), {'name': 'car', 'price': 5, 'seller': self.user.pk})
+        response = self.client.get(self.url)
+        self.assertEquals(response['X-Cache'], 'MISS')
+        self.assertEquals([item['name'] for item in response.json()], ['car', self.product.name])
+
+    def test_delete_and_seller_change_invalidate_listing(self):
+        """
+            set Up :
+              - we are moving a product to another seller, then deleting it
+
+            result : both sellers' cached listings are dropped each time
+        """
+        other = UserFactory()
+        self.client.get(self.url)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.product.seller = other
+            self.product.save()
+        self.assertEquals(self.client.get(self.url).json(), [])
+
+        self.client.get(self.url)
+        with self.captureOnCommitCallbacks(execute=True):
+            ProductFactory(seller=self.user, price=1).delete()
+        self.assertEquals(self.client.get(self.url)['X-Cache'], 'MISS')
+
+    def test_writes_from_other_workers_invalidate_listing(self):
+        """
+            set Up :
+              - another worker adds a product, leaving this worker's cache untouched
+
+            result : the next listing is a miss and contains the new product
+        """
+        self.client.get(self.url)
+        # Only the seller's catalog_version changes in the database; no cache entry is touched.
+        ProductFactory(seller=self.user, price=20, name='bike')
+        response = self.client.get(self.url)
+        self.assertEquals(response['X-Cache'], 'MISS')
+        self.assertIn('bike', [item['name'] for item in response.json()])
+
+    def test_paginated_pages_are_cached_separately(self):
+        """
+            set Up :
+              - we are requesting the full listing and one page of it
+
+            result : both are misses since query params are part of the key
+        """
+        self.assertEquals(self.client.get(self.url)['X-Cache'], 'MISS')
+        self.assertEquals(self.client.get(self.url, {'page_size': 1})['X-Cache'], 'MISS')
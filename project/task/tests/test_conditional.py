@@ -0,0 +1,105 @@
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from task.factories import UserFactory, ProductFactory
+
+
+class ProductListConditionalGetTestCase(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = UserFactory()
+        self.product = ProductFactory(seller=self.user)
+        self.client.login(username=self.user.email, password='secret')
+        self.url = reverse('task:listing')
+
+    def test_it_returns_etag_and_last_modified(self):
+        """
+            set Up :
+              - we are requesting the listing of a seller that has products
+
+            result : response carries ETag and Last-Modified headers
+        """
+        response = self.client.get(self.url)
+        self.assertEquals(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.has_header('ETag'))
+        self.assertTrue(response.has_header('Last-Modified'))
+
+    def test_it_returns_304_when_etag_matches(self):
+        """
+            set Up :
+              - we are sending back the ETag of a previous response
+
+            result : returning not modified response 304 without running the listing query
+        """
+        etag = self.client.get(self.url)['ETag']
+        with self.assertNumQueries(2):
+            # session + user lookups done by authentication only
+            response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEquals(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEquals(response.content, b'')
+
+    def test_it_returns_304_when_not_modified_since(self):
+        """
+            set Up :
+              - we are sending back the Last-Modified of a previous response
+
+            result : returning not modified response 304
+        """
+        last_modified = self.client.get(self.url)['Last-Modified']
+        response = self.client.get(self.url, HTTP_IF_MODIFIED_SINCE=last_modified)
+        self.assertEquals(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_etag_changes_after_product_write(self):
+        """
+            set Up :
+              - we are creating and deleting products after reading the ETag
+
+            result : the old ETag no longer matches and the full list is returned
+        """
+        etag = self.client.get(self.url)['ETag']
+        ProductFactory(seller=self.user)
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEquals(response.status_code, status.HTTP_200_OK)
+        self.assertEquals(len(response.data), 2)
+
+        etag = response['ETag']
+        self.product.delete()
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEquals(response.status_code, status.HTTP_200_OK)
+
+    def test_etag_depends_on_query_params(self):
+        """
+            set Up :
+              - we are requesting the full listing and one page of it
+
+            result : each one gets its own ETag
+        """
+        full = self.client.get(self.url)['ETag']
+        page = self.client.get(self.url, {'page_size': 1})['ETag']
+        self.assertNotEquals(full, page)
+
+    def test_etag_depends_on_media_type_params(self):
+        """
+            set Up :
+              - we are sending back the ETag of a compact listing while asking for ``indent=4``
+
+            result : the ETag does not match and the indented body is returned
+        """
+        etag = self.client.get(self.url)['ETag']
+        response = self.client.get(self.url, HTTP_ACCEPT='application/json; indent=4', HTTP_IF_NONE_MATCH=etag)
+        self.assertEquals(response.status_code, status.HTTP_200_OK)
+        self.assertNotEquals(response['ETag'], etag)
+
+    def test_other_sellers_writes_do_not_change_etag(self):
+        """
+            set Up :
+              - we are creating a product for another seller
+
+            result : the ETag still matches
+        """
+        etag = self.client.get(self.url)['ETag']
+        ProductFactory(seller=UserFactory())
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEquals(response.status_code, status.HTTP_304_NOT_MODIFIED)
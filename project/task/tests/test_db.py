@@ -0,0 +1,181 @@
+import asyncio
+import os
+import tempfile
+from unittest import mock
+
+from django.db import connections, transaction
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from task.db.pool import ConnectionPool, PoolTimeout
+from task.factories import UserFactory
+
+
+class HealthCheckBackendTestCase(SimpleTestCase):
+    databases = {'default'}
+
+    def setUp(self):
+        # A private, unregistered wrapper on a file database (closing an
+        # in-memory SQLite connection is a no-op), so the shared test
+        # connection is never touched.
+        self.directory = tempfile.TemporaryDirectory()
+        settings_dict = dict(
+            connections['default'].settings_dict, NAME=os.path.join(self.directory.name, 'health.sqlite3'),
+            CONN_MAX_AGE=None, CONN_HEALTH_CHECKS=True,
+        )
+        self.wrapper = connections['default'].__class__(settings_dict)
+
+    def tearDown(self):
+        self.wrapper.close()
+        self.directory.cleanup()
+
+    def test_reused_connection_is_replaced_when_unusable(self):
+        """
+            set Up :
+              - we are reusing a persistent connection in a new request after the server dropped it
+
+            result : the connection is checked once and replaced
+        """
+        self.wrapper.cursor()
+        old_connection = self.wrapper.connection
+        self.wrapper.close_if_unusable_or_obsolete()
+        with mock.patch.object(self.wrapper, 'is_usable', return_value=False) as is_usable:
+            self.wrapper.cursor()
+            self.wrapper.cursor()
+        self.assertEquals(is_usable.call_count, 1)
+        self.assertIsNot(self.wrapper.connection, old_connection)
+
+    def test_reused_connection_is_replaced_before_a_transaction(self):
+        """
+            set Up :
+              - we are reusing a dropped persistent connection and the new request starts with atomic()
+
+            result : the connection is replaced when autocommit is turned off, before BEGIN
+        """
+        self.wrapper.cursor()
+        old_connection = self.wrapper.connection
+        self.wrapper.close_if_unusable_or_obsolete()
+        old_connection.close()
+        with mock.patch.object(self.wrapper, 'is_usable', return_value=False) as is_usable:
+            # What atomic() does first on PostgreSQL; SQLite issues BEGIN through a cursor.
+            self.wrapper.set_autocommit(False)
+            self.assertIsNot(self.wrapper.connection, old_connection)
+            self.wrapper.set_autocommit(True)
+        self.assertEquals(is_usable.call_count, 1)
+
+    def test_transaction_runs_on_a_replaced_connection(self):
+        """
+            set Up :
+              - the server dropped a persistent connection and the next request's first access is atomic()
+
+            result : the block runs and commits on a new connection
+        """
+        self.wrapper.cursor()
+        old_connection = self.wrapper.connection
+        self.wrapper.close_if_unusable_or_obsolete()
+        old_connection.close()
+        with mock.patch.object(self.wrapper, 'is_usable', return_value=False), \
+                mock.patch('django.db.transaction.get_connection', return_value=self.wrapper):
+            with transaction.atomic():
+                self.wrapper.cursor().execute('CREATE TABLE t (id integer)')
+        self.assertIsNot(self.wrapper.connection, old_connection)
+        self.assertTrue(self.wrapper.get_autocommit())
+
+    def test_new_connection_is_not_checked(self):
+        """
+            set Up :
+              - we are opening a brand new connection
+
+            result : no health check query is issued
+        """
+        with mock.patch.object(self.wrapper, 'is_usable') as is_usable:
+            self.wrapper.cursor()
+        is_usable.assert_not_called()
+
+    def test_healthy_connection_is_kept(self):
+        """
+            set Up :
+              - we are reusing a working persistent connection in a new request
+
+            result : the same connection is used
+        """
+        self.wrapper.cursor()
+        old_connection = self.wrapper.connection
+        self.wrapper.close_if_unusable_or_obsolete()
+        self.wrapper.cursor()
+        self.assertIs(self.wrapper.connection, old_connection)
+
+
+class ConnectionPoolTestCase(SimpleTestCase):
+    def test_it_limits_concurrent_slots(self):
+        """
+            set Up :
+              - we are running more tasks than the pool has slots
+
+            result : never more than max_size tasks hold a slot at once
+        """
+        pool = ConnectionPool(max_size=2, timeout=1)
+
+        async def task():
+            async with pool.slot():
+                await asyncio.sleep(0.01)
+
+        async def main():
+            await asyncio.gather(*(task() for _ in range(6)))
+
+        asyncio.run(main())
+        stats = pool.stats()
+        self.assertEquals(stats['peak_in_use'], 2)
+        self.assertEquals(stats['acquired'], 6)
+        self.assertEquals(stats['in_use'], 0)
+
+    def test_it_raises_pool_timeout_when_saturated(self):
+        """
+            set Up :
+              - we are waiting for a slot while the only one is held
+
+            result : PoolTimeout is raised and counted
+        """
+        pool = ConnectionPool(max_size=1, timeout=0.01)
+
+        async def main():
+            async with pool.slot():
+                async with pool.slot():
+                    pass
+
+        with self.assertRaises(PoolTimeout):
+            asyncio.run(main())
+        self.assertEquals(pool.stats()['timeouts'], 1)
+
+
+@override_settings(DATABASE_POOL={'ENABLED': True, 'MAX_SIZE': 4, 'TIMEOUT': 1})
+class MetricsViewTestCase(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.url = reverse('metrics')
+
+    def test_it_returns_pool_stats_to_staff(self):
+        """
+            set Up :
+              - we are requesting the metrics as a staff user
+
+            result : returning response 200 with the pool counters
+        """
+        user = UserFactory(is_staff=True)
+        self.client.force_authenticate(user)
+        response = self.client.get(self.url)
+        self.assertEquals(response.status_code, status.HTTP_200_OK)
+        self.assertEquals(response.data['database_pool']['max_size'], 4)
+
+    def test_it_returns_403_to_non_staff(self):
+        """
+            set Up :
+              - we are requesting the metrics as a regular user
+
+            result : returning forbidden response 403
+        """
+        self.client.force_authenticate(UserFactory(is_staff=False))
+        response = self.client.get(self.url)
+        self.assertEquals(response.status_code, status.HTTP_403_FORBIDDEN)
@@ -0,0 +1,70 @@
+import csv
+import io
+import json
+
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from task.factories import UserFactory, ProductFactory
+
+
+class ProductExportTestCase(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = UserFactory()
+        ProductFactory(seller=cls.user, name='bike', price=20)
+        ProductFactory(seller=cls.user, name='car', price=None)
+        ProductFactory(seller=cls.user, name='book', price='3.5')
+        ProductFactory(seller=UserFactory(), name='other', price=1)
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.login(username=self.user.email, password='secret')
+
+    def test_it_returns_401_when_user_is_not_authenticated(self):
+        """
+            set Up :
+              - we are requesting the export with no credentials
+
+            result : returning unauthorized response 401
+        """
+        response = APIClient().get(reverse('task:export', args=['ndjson']))
+        self.assertEquals(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_it_streams_ndjson(self):
+        """
+            set Up :
+              - we are exporting the catalog as NDJSON
+
+            result : a streamed response with one JSON object per product of the user
+        """
+        response = self.client.get(reverse('task:export', args=['ndjson']))
+        self.assertEquals(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.streaming)
+        self.assertEquals(response['Content-Type'], 'application/x-ndjson')
+        rows = [json.loads(line) for line in b''.join(response.streaming_content).decode().splitlines()]
+        self.assertEquals(rows, [
+            {'name': 'book', 'price': '3.50', 'seller': self.user.pk},
+            {'name': 'bike', 'price': '20.00', 'seller': self.user.pk},
+            {'name': 'car', 'price': None, 'seller': self.user.pk},
+        ])
+
+    def test_it_streams_csv(self):
+        """
+            set Up :
+              - we are exporting the catalog as CSV
+
+            result : a header row followed by one row per product of the user
+        """
+        response = self.client.get(reverse('task:export', args=['csv']))
+        self.assertEquals(response['Content-Type'], 'text/csv')
+        self.assertIn('products.csv', response['Content-Disposition'])
+        rows = list(csv.reader(io.StringIO(b''.join(response.streaming_content).decode())))
+        self.assertEquals(rows[0], ['name', 'price', 'seller'])
+        self.assertEquals(rows[1:], [
+            ['book', '3.50', str(self.user.pk)],
+            ['bike', '20.00', str(self.user.pk)],
+            ['car', '', str(self.user.pk)],
+        ])
@@ -0,0 +1,32 @@
+from django.test import TestCase
+
+from task.factories import create_products, create_users
+from task.models import Product, User
+
+
+class BulkFactoriesTestCase(TestCase):
+    def test_create_users_inserts_users_with_usable_password(self):
+        """
+            set Up :
+              - we are creating a batch of users in bulk
+
+            result : every user is saved with a unique email and the shared password
+        """
+        users = create_users(5)
+        self.assertEquals(User.objects.count(), 5)
+        self.assertEquals(len({user.email for user in users}), 5)
+        self.assertTrue(all(user.pk for user in users))
+        self.assertTrue(User.objects.get(pk=users[0].pk).check_password('secret'))
+
+    def test_create_products_inserts_products_per_seller(self):
+        """
+            set Up :
+              - we are creating products in bulk for two sellers
+
+            result : each seller owns the requested number of products
+        """
+        sellers = create_users(2)
+        with self.assertNumQueries(1):
+            create_products(sellers, 3)
+        for seller in sellers:
+            self.assertEquals(Product.objects.filter(seller=seller).count(), 3)
@@ -0,0 +1,87 @@
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from task.factories import UserFactory, ProductFactory
+
+
+class ProductFilterTestCase(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = UserFactory()
+        for name, price in [('Blue chair', 30), ('blue lamp', 10), ('Red chair', 20), ('Sofa', None)]:
+            ProductFactory(seller=cls.user, name=name, price=price)
+        ProductFactory(seller=UserFactory(), name='Blue table', price=5)
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.login(username=self.user.email, password='secret')
+        self.url = reverse('task:listing')
+
+    def names(self, params):
+        response = self.client.get(self.url, params)
+        self.assertEquals(response.status_code, status.HTTP_200_OK)
+        return [item['name'] for item in response.data]
+
+    def test_it_searches_name_substring_ignoring_case(self):
+        """
+            set Up :
+              - we are searching the listing for part of a name
+
+            result : only the seller's products containing it are returned
+        """
+        self.assertEquals(self.names({'search': 'CHAIR'}), ['Red chair', 'Blue chair'])
+
+    def test_it_filters_name_prefix_ignoring_case(self):
+        """
+            set Up :
+              - we are filtering the listing by the start of a name
+
+            result : only the seller's products starting with it are returned
+        """
+        self.assertEquals(self.names({'name': 'blue'}), ['blue lamp', 'Blue chair'])
+
+    def test_it_filters_price_range(self):
+        """
+            set Up :
+              - we are giving a minimum and a maximum price
+
+            result : only products priced within the bounds are returned
+        """
+        self.assertEquals(self.names({'min_price': 15, 'max_price': 30}), ['Red chair', 'Blue chair'])
+
+    def test_it_sorts_by_the_given_ordering(self):
+        """
+            set Up :
+              - we are asking for the listing sorted by name descending
+
+            result : products are returned in that order
+        """
+        self.assertEquals(self.names({'ordering': '-name'}), ['blue lamp', 'Sofa', 'Red chair', 'Blue chair'])
+
+    def test_it_returns_422_when_filters_are_invalid(self):
+        """
+            set Up :
+              - we are sending an unknown ordering and a non numeric price
+
+            result : returning response 422 with an error per parameter
+        """
+        response = self.client.get(self.url, {'ordering': 'seller', 'min_price': 'cheap'})
+        self.assertEquals(response.status_code, status.HTTP_422_UNPROCESSABLE_ENTITY)
+        self.assertEquals(set(response.data), {'ordering', 'min_price'})
+
+    def test_filters_apply_to_paginated_listing(self):
+        """
+            set Up :
+              - we are walking a filtered and name sorted listing page by page
+
+            result : every matching product is returned once in name order
+        """
+        url = '{}?search=chair&ordering=name&page_size=1'.format(self.url)
+        names = []
+        while url:
+            response = self.client.get(url)
+            names.extend(item['name'] for item in response.data['results'])
+            url = response.data['next']
+        self.assertEquals(names, ['Blue chair', 'Red chair'])
@@ -0,0 +1,88 @@
+import base64
+import importlib
+import os
+import sys
+from unittest import mock
+
+from django.conf import settings
+from django.contrib.auth.hashers import identify_hasher, make_password
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from task.factories import UserFactory
+from task.hashers import PBKDF2PasswordHasher
+
+
+def pbkdf2_profile(iterations):
+    return override_settings(
+        PASSWORD_HASHERS=['task.hashers.PBKDF2PasswordHasher', 'django.contrib.auth.hashers.MD5PasswordHasher'],
+        PASSWORD_HASHING=dict(settings.PASSWORD_HASHING, ALGORITHM='pbkdf2_sha256', PBKDF2_ITERATIONS=iterations),
+    )
+
+
+class PasswordHasherProfileTestCase(TestCase):
+    def setUp(self):
+        self.user = UserFactory()
+
+    def login(self):
+        credentials = base64.b64encode('{}:secret'.format(self.user.email).encode()).decode()
+        response = APIClient().get(reverse('login'), HTTP_AUTHORIZATION='Basic ' + credentials)
+        self.assertEquals(response.status_code, status.HTTP_200_OK)
+        self.user.refresh_from_db()
+
+    def test_iterations_follow_the_profile(self):
+        """
+            set Up :
+              - we are hashing a password under a profile with a low PBKDF2 cost
+
+            result : the hash carries the configured iteration count
+        """
+        with pbkdf2_profile(1000):
+            self.assertEquals(PBKDF2PasswordHasher().decode(make_password('secret'))['iterations'], 1000)
+
+    def test_login_upgrades_hashes_of_another_algorithm(self):
+        """
+            set Up :
+              - the stored hash was made by MD5 and the profile now prefers PBKDF2
+
+            result : logging in re-hashes the password with PBKDF2
+        """
+        self.assertEquals(identify_hasher(self.user.password).algorithm, 'md5')
+        with pbkdf2_profile(1000):
+            self.login()
+            self.assertEquals(identify_hasher(self.user.password).algorithm, 'pbkdf2_sha256')
+
+    def test_login_upgrades_hashes_of_another_cost(self):
+        """
+            set Up :
+              - the PBKDF2 iteration count of the profile is raised
+
+            result : logging in re-hashes the password with the new count
+        """
+        with pbkdf2_profile(1000):
+            self.login()
+        with pbkdf2_profile(2000):
+            self.login()
+            self.assertEquals(PBKDF2PasswordHasher().decode(self.user.password)['iterations'], 2000)
+
+
+class PasswordHasherSettingsTestCase(SimpleTestCase):
+    def load_settings(self):
+        import project.settings
+        self.addCleanup(importlib.reload, project.settings)
+        with mock.patch.object(sys, 'argv', ['gunicorn']), mock.patch.dict(os.environ, SECRET_KEY='secret'):
+            return importlib.reload(project.settings)
+
+    def test_md5_is_not_accepted_outside_tests(self):
+        """
+            set Up :
+              - we are loading the settings the way a deployed worker does
+
+            result : the configured algorithm hashes new passwords and MD5 hashes are not accepted
+        """
+        deployed = self.load_settings()
+        self.assertEquals(deployed.PASSWORD_HASHERS[0], 'task.hashers.PBKDF2PasswordHasher')
+        self.assertNotIn('django.contrib.auth.hashers.MD5PasswordHasher', deployed.PASSWORD_HASHERS)
+        self.assertEquals(settings.PASSWORD_HASHERS[0], 'django.contrib.auth.hashers.MD5PasswordHasher')
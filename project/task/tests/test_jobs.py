@@ -0,0 +1,230 @@
+import os
+import tempfile
+from datetime import timedelta
+from concurrent.futures.process import BrokenProcessPool
+from io import StringIO
+from unittest import mock
+
+from django.conf import settings
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from task.factories import UserFactory, ProductFactory
+from task.jobs import claim_jobs, enqueue, requeue_stale_jobs, run_job
+from task.management.commands.run_jobs import Command as RunJobsCommand
+from task.models import Job, Product, SellerStats
+
+
+def run_jobs():
+    call_command('run_jobs', workers=0, burst=True, stdout=StringIO())
+
+
+class JobQueueTestCase(TestCase):
+    def setUp(self):
+        self.user = UserFactory()
+
+    def test_worker_runs_queued_jobs(self):
+        """
+            set Up :
+              - we are queuing a bulk import and running the worker until the queue is empty
+
+            result : the products are created and the job holds the import summary
+        """
+        rows = [{'name': 'item %d' % i, 'price': i, 'seller': self.user.pk} for i in range(3)]
+        job = enqueue('products.bulk_import', {'rows': rows}, owner=self.user)
+        run_jobs()
+        job.refresh_from_db()
+        self.assertEquals(job.status, Job.SUCCEEDED)
+        self.assertEquals(job.attempts, 1)
+        self.assertEquals(job.result['created'], 3)
+        self.assertEquals(Product.objects.filter(seller=self.user).count(), 3)
+
+    def test_a_job_is_claimed_once(self):
+        """
+            set Up :
+              - two workers poll the queue one after the other
+
+            result : only the first one gets the job
+        """
+        job = enqueue('stats.rebuild')
+        self.assertEquals(claim_jobs(5, 'first'), [job.pk])
+        self.assertEquals(claim_jobs(5, 'second'), [])
+        job.refresh_from_db()
+        self.assertEquals((job.status, job.locked_by), (Job.RUNNING, 'first'))
+
+    def test_failed_attempts_are_retried_with_backoff(self):
+        """
+            set Up :
+              - the job function fails on every attempt
+
+            result : the job is queued again further in the future each time, then fails
+        """
+        job = enqueue('stats.rebuild', max_attempts=3)
+        delays = []
+        with mock.patch('task.stats.rebuild_seller_stats', side_effect=RuntimeError('database is busy')):
+            for attempt in range(3):
+                Job.objects.filter(pk=job.pk).update(run_after=timezone.now())
+                claim_jobs(1)
+                started = timezone.now()
+                run_job(job.pk)
+                job.refresh_from_db()
+                delays.append((job.run_after - started).total_seconds())
+        self.assertEquals(job.status, Job.FAILED)
+        self.assertEquals(job.attempts, 3)
+        self.assertIn('database is busy', job.error)
+        backoff = settings.JOB_QUEUE['RETRY_BACKOFF']
+        self.assertAlmostEqual(delays[0], backoff, delta=1)
+        self.assertAlmostEqual(delays[1], backoff * 2, delta=1)
+
+    def test_jobs_are_not_run_before_their_retry_time(self):
+        """
+            set Up :
+              - a job is waiting for its next attempt
+
+            result : the worker leaves it alone
+        """
+        job = enqueue('stats.rebuild')
+        Job.objects.filter(pk=job.pk).update(run_after=timezone.now() + timedelta(minutes=1))
+        self.assertEquals(claim_jobs(1), [])
+
+    @override_settings(PRODUCT_BULK_CREATE=dict(settings.PRODUCT_BULK_CREATE, MAX_ROWS=1))
+    def test_invalid_jobs_are_not_retried(self):
+        """
+            set Up :
+              - a bulk import job has more rows than allowed
+
+            result : the job fails on its first attempt
+        """
+        rows = [{'name': 'item', 'price': 1}, {'name': 'item', 'price': 2}]
+        job = enqueue('products.bulk_import', {'rows': rows})
+        run_jobs()
+        job.refresh_from_db()
+        self.assertEquals((job.status, job.attempts), (Job.FAILED, 1))
+
+    def test_jobs_of_lost_workers_are_requeued(self):
+        """
+            set Up :
+              - a job has been running for longer than STALE_AFTER
+
+            result : it is queued again
+        """
+        job = enqueue('stats.rebuild')
+        claim_jobs(1)
+        Job.objects.filter(pk=job.pk).update(
+            started_at=timezone.now() - timedelta(seconds=settings.JOB_QUEUE['STALE_AFTER'] + 1))
+        self.assertEquals(requeue_stale_jobs(), 1)
+        job.refresh_from_db()
+        self.assertEquals(job.status, Job.QUEUED)
+
+    def test_broken_pool_is_replaced(self):
+        """
+            set Up :
+              - the worker pool breaks when a job is submitted to it
+
+            result : the attempt is failed for a retry and a new pool is started
+        """
+        job = enqueue('stats.rebuild')
+        broken_pool = mock.Mock(submit=mock.Mock(side_effect=BrokenProcessPool('worker died')))
+        with mock.patch.object(RunJobsCommand, 'create_pool', side_effect=[broken_pool, mock.Mock()]) as create_pool:
+            command = RunJobsCommand(stdout=StringIO())
+            command.name = 'test-worker'
+            command.run_pool(workers=1, poll_interval=0, burst=True)
+        self.assertEquals(create_pool.call_count, 2)
+        broken_pool.shutdown.assert_called_with(wait=False)
+        job.refresh_from_db()
+        self.assertEquals(job.status, Job.QUEUED)
+        self.assertIn('BrokenProcessPool', job.error)
+
+    def test_stats_rebuild_can_be_queued_from_the_command(self):
+        """
+            set Up :
+              - we are queuing a stats rebuild and running the worker
+
+            result : the seller's stats are rebuilt
+        """
+        ProductFactory(seller=self.user, price=5)
+        SellerStats.objects.all().delete()
+        call_command('rebuild_seller_stats', background=True, stdout=StringIO())
+        run_jobs()
+        self.assertEquals(SellerStats.objects.get(seller=self.user).product_count, 1)
+
+
+class JobViewsTestCase(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = UserFactory()
+        self.client.force_authenticate(self.user)
+
+    def test_bulk_import_in_background_returns_202(self):
+        """
+            set Up :
+              - we are posting products to the bulk create url with ?background=1
+
+            result : returning 202 with the job status url; nothing is created before the worker runs
+        """
+        rows = [{'name': 'item', 'price': 1, 'seller': self.user.pk}]
+        response = self.client.post(reverse('task:bulk-create') + '?background=1', rows, format='json')
+        self.assertEquals(response.status_code, status.HTTP_202_ACCEPTED)
+        self.assertEquals(response.data['status'], Job.QUEUED)
+        self.assertFalse(Product.objects.exists())
+
+        run_jobs()
+        response = self.client.get(response['Location'])
+        self.assertEquals(response.status_code, status.HTTP_200_OK)
+        self.assertEquals(response.data['status'], Job.SUCCEEDED)
+        self.assertEquals(response.data['result']['created'], 1)
+
+    def test_export_in_background_can_be_downloaded(self):
+        """
+            set Up :
+              - we are posting to the csv export url, running the worker and following the result url
+
+            result : the job result links to the file, without its server path, and the link streams it
+        """
+        ProductFactory(seller=self.user, name='lamp', price=3)
+        with tempfile.TemporaryDirectory() as export_dir:
+            with override_settings(JOB_QUEUE=dict(settings.JOB_QUEUE, EXPORT_DIR=export_dir)):
+                response = self.client.post(reverse('task:export', args=['csv']))
+                self.assertEquals(response.status_code, status.HTTP_202_ACCEPTED)
+                run_jobs()
+                result = self.client.get(response['Location']).data['result']
+                self.assertNotIn(export_dir, str(result))
+                self.assertEquals(result['url'], 'http://testserver' + reverse('task:job-download',
+                                                                              args=[response.data['id']]))
+                download = self.client.get(result['url'])
+                self.assertEquals(download.status_code, status.HTTP_200_OK)
+                self.assertEquals(download['Content-Type'], 'text/csv')
+                self.assertIn('attachment; filename="products.csv"', download['Content-Disposition'])
+                self.assertEquals(b''.join(download.streaming_content).decode().splitlines(),
+                                  ['name,price,seller', 'lamp,3.00,%d' % self.user.pk])
+                download.close()
+
+                other = APIClient()
+                other.force_authenticate(UserFactory())
+                self.assertEquals(other.get(result['url']).status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_unfinished_export_cannot_be_downloaded(self):
+        """
+            set Up :
+              - we are downloading an export that is still queued
+
+            result : returning 404
+        """
+        job = enqueue('products.export', {'seller_id': self.user.pk, 'export_format': 'csv'}, owner=self.user)
+        response = self.client.get(reverse('task:job-download', args=[job.pk]))
+        self.assertEquals(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_other_users_jobs_are_not_found(self):
+        """
+            set Up :
+              - we are asking for the status of another user's job
+
+            result : returning 404
+        """
+        job = enqueue('stats.rebuild', owner=UserFactory())
+        response = self.client.get(reverse('task:job', args=[job.pk]))
+        self.assertEquals(response.status_code, status.HTTP_404_NOT_FOUND)
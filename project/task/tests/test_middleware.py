@@ -0,0 +1,109 @@
+import json
+
+from asgiref.sync import sync_to_async
+from django.test import AsyncClient, TestCase, override_settings
+from django.urls import reverse
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+from task.authentication import token_cache
+from task.factories import UserFactory, ProductFactory
+from task.metrics import RequestMetrics, activate, deactivate, timing
+
+METRICS_ENABLED = {'ENABLED': True, 'N_PLUS_ONE_THRESHOLD': 3}
+
+
+@override_settings(REQUEST_METRICS=METRICS_ENABLED)
+class RequestMetricsMiddlewareTestCase(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = UserFactory()
+        ProductFactory(seller=self.user)
+        self.client.login(username=self.user.email, password='secret')
+        self.url = reverse('task:listing')
+
+    def test_it_adds_server_timing_header(self):
+        """
+            set Up :
+              - we are requesting the listing with metrics enabled
+
+            result : Server-Timing reports db, serializer and total durations
+        """
+        response = self.client.get(self.url)
+        header = response['Server-Timing']
+        self.assertIn('db;dur=', header)
+        self.assertIn('serializer;dur=', header)
+        self.assertIn('total;dur=', header)
+
+    def test_it_logs_query_count(self):
+        """
+            set Up :
+              - we are requesting the listing with metrics enabled
+
+            result : one structured log line carries the query count of the request
+        """
+        with self.assertLogs('task.metrics', level='INFO') as logs:
+            self.client.get(self.url)
+        record = json.loads(logs.records[-1].getMessage())
+        self.assertEquals(record['path'], self.url)
+        self.assertEquals(record['status'], 200)
+        self.assertEquals(record['queries'], 3)
+
+    async def test_it_counts_queries_under_the_async_handler(self):
+        """
+            set Up :
+              - we are requesting the listing through the ASGI handler
+
+            result : the token and listing queries, run on the sync view's thread, are counted for the request
+        """
+        token_cache.clear()
+        token = await sync_to_async(Token.objects.create)(user=self.user)
+        with self.assertLogs('task.metrics', level='INFO') as logs:
+            response = await AsyncClient().get(self.url, authorization='Token ' + token.key)
+        self.assertIn('serializer;dur=', response['Server-Timing'])
+        record = json.loads(logs.records[-1].getMessage())
+        self.assertEquals(record['queries'], 2)
+
+    def test_it_flags_repeated_statements(self):
+        """
+            set Up :
+              - we are collecting metrics for a request that repeats the same query
+
+            result : the repeated SQL is reported once it reaches the threshold
+        """
+        metrics = RequestMetrics()
+        for _ in range(3):
+            metrics.record_query('SELECT 1 WHERE id = %s', 0.001)
+        metrics.record_query('SELECT 2', 0.001)
+        self.assertEquals(metrics.repeated_statements(3), {'SELECT 1 WHERE id = %s': 3})
+
+
+@override_settings(REQUEST_METRICS={'ENABLED': False})
+class RequestMetricsDisabledTestCase(TestCase):
+    def test_it_does_not_add_header_when_disabled(self):
+        """
+            set Up :
+              - we are requesting a page with metrics disabled
+
+            result : no Server-Timing header is sent
+        """
+        response = APIClient().get(reverse('task:listing'))
+        self.assertFalse(response.has_header('Server-Timing'))
+
+    def test_timing_is_noop_without_active_metrics(self):
+        """
+            set Up :
+              - we are timing a block outside of a request and inside one
+
+            result : nothing is recorded outside, the duration is recorded inside
+        """
+        with timing('serializer'):
+            pass
+        metrics = RequestMetrics()
+        token = activate(metrics)
+        try:
+            with timing('serializer'):
+                pass
+        finally:
+            deactivate(token)
+        self.assertIn('serializer', metrics.timings)
@@ -0,0 +1,111 @@
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.request import Request
+from rest_framework.test import APIClient, APIRequestFactory
+
+from task.factories import UserFactory, ProductFactory
+from task.pagination import ProductKeysetPagination
+
+
+class ProductKeysetPaginationTestCase(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = UserFactory()
+        for price in [30, 10, None, 20, 10, None, 40]:
+            ProductFactory(seller=cls.user, price=price)
+        ProductFactory(seller=UserFactory(), price=5)
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.login(username=self.user.email, password='secret')
+        self.url = reverse('task:listing')
+
+    def walk(self, page_size, ordering='price'):
+        pages = []
+        url = '{}?page_size={}&ordering={}'.format(self.url, page_size, ordering)
+        while url:
+            response = self.client.get(url)
+            self.assertEquals(response.status_code, status.HTTP_200_OK)
+            pages.append(response.data['results'])
+            url = response.data['next']
+        return pages
+
+    def test_it_returns_paginated_response_when_page_size_is_given(self):
+        """
+            set Up :
+              - we are requesting the listing with a page size
+
+            result : returning only one page of results and a link to the next page
+        """
+        response = self.client.get(self.url, {'page_size': 3})
+        self.assertEquals(len(response.data['results']), 3)
+        self.assertIn('cursor=', response.data['next'])
+
+    def test_it_walks_all_products_in_price_order_with_nulls_last(self):
+        """
+            set Up :
+              - we are following the next links until the last page
+
+            result : every product of the user is returned once, sorted by price and NULL prices last
+        """
+        pages = self.walk(page_size=2)
+        prices = [item['price'] for page in pages for item in page]
+        self.assertEquals(prices, ['10.00', '10.00', '20.00', '30.00', '40.00', None, None])
+        self.assertEquals(len(pages), 4)
+
+    def test_it_walks_descending_prices_with_nulls_last(self):
+        """
+            set Up :
+              - we are following the next links of the listing sorted by price descending
+
+            result : every product is returned once, highest price first and NULL prices last
+        """
+        pages = self.walk(page_size=2, ordering='-price')
+        prices = [item['price'] for page in pages for item in page]
+        self.assertEquals(prices, ['40.00', '30.00', '20.00', '10.00', '10.00', None, None])
+
+    def test_last_page_has_no_next_link(self):
+        """
+            set Up :
+              - we are requesting a page bigger than the catalog
+
+            result : next link is empty
+        """
+        response = self.client.get(self.url, {'page_size': 50})
+        self.assertEquals(len(response.data['results']), 7)
+        self.assertIsNone(response.data['next'])
+
+    def test_page_size_is_capped(self):
+        """
+            set Up :
+              - we are asking for more rows than the maximum page size
+
+            result : page size falls back to the maximum
+        """
+        paginator = ProductKeysetPagination()
+        self.assertEquals(paginator.max_page_size, 1000)
+        request = Request(APIRequestFactory().get(self.url, {'page_size': 10 ** 6}))
+        self.assertEquals(paginator.get_page_size(request), paginator.max_page_size)
+
+    def test_it_returns_404_when_cursor_is_invalid(self):
+        """
+            set Up :
+              - we are sending a cursor that was not issued by the server
+
+            result : returning not found response 404
+        """
+        response = self.client.get(self.url, {'cursor': 'not-a-cursor'})
+        self.assertEquals(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_cursor_round_trips(self):
+        """
+            set Up :
+              - we are encoding a position and decoding it back
+
+            result : the same (price, id) position is returned
+        """
+        paginator = ProductKeysetPagination()
+        cursor = paginator.encode_cursor(None, 7)
+        request = Request(APIRequestFactory().get(self.url, {'cursor': cursor}))
+        self.assertEquals(paginator.decode_cursor(request), (None, 7))
@@ -0,0 +1,130 @@
+from decimal import Decimal
+from unittest import skipUnless
+
+from django.db import connection
+from django.db.models import Q
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from task.factories import UserFactory, ProductFactory
+from task.filters import ProductFilter
+from task.models import Product
+from task.pagination import PRODUCT_ORDERINGS, ProductKeysetPagination
+from task.serializers import ProductReadSerializer
+
+INDEX_NAME = 'product_seller_price_idx'
+NAME_INDEX_NAME = 'product_seller_name_idx'
+
+
+@skipUnless(connection.vendor == 'sqlite', 'query plans are asserted against the SQLite test database')
+class ProductListQueryPlanTestCase(TestCase):
+    """
+        Guards the listing access path: if a query stops using the
+        (seller, price, id) index or falls back to sorting in a temp
+        b-tree, these tests fail.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = UserFactory()
+        ProductFactory.create_batch(5, seller=cls.user)
+
+    def assertUsesListingIndex(self, queryset, index_name=INDEX_NAME):
+        plan = queryset.explain()
+        self.assertIn(index_name, plan, msg=plan)
+        self.assertNotIn('TEMP B-TREE', plan, msg=plan)
+
+    def assertIndexOnly(self, queryset, index_name=INDEX_NAME):
+        plan = ProductReadSerializer.get_rows(queryset).explain()
+        self.assertIn('COVERING INDEX {}'.format(index_name), plan, msg=plan)
+        self.assertNotIn('TEMP B-TREE', plan, msg=plan)
+
+    def test_listing_query_uses_index(self):
+        """
+            set Up : we are explaining the full listing query of the view
+
+            result : the plan searches the composite index without sorting
+        """
+        self.assertUsesListingIndex(Product.objects.filter(Q(seller=self.user)).order_by('price'))
+
+    def test_keyset_first_page_uses_index(self):
+        """
+            set Up : we are explaining the first page of the keyset pagination
+
+            result : the plan searches the composite index without sorting
+        """
+        paginator = ProductKeysetPagination()
+        queryset = Product.objects.filter(seller=self.user).order_by(*paginator.get_ordering())
+        self.assertUsesListingIndex(queryset[:paginator.page_size + 1])
+
+    def test_keyset_next_page_uses_index(self):
+        """
+            set Up : we are explaining a page after a cursor position
+
+            result : the plan searches the composite index without sorting
+        """
+        paginator = ProductKeysetPagination()
+        queryset = Product.objects.filter(seller=self.user).order_by(*paginator.get_ordering())
+        queryset = queryset.filter(paginator.get_seek_filter(Decimal('10.00'), 3))
+        self.assertUsesListingIndex(queryset[:paginator.page_size + 1])
+
+    def test_filtered_listing_reads_only_the_index(self):
+        """
+            set Up : we are explaining the listing rows for each search and price filter
+
+            result : every plan is answered from the covering index without sorting
+        """
+        for params in [{}, {'search': 'ab'}, {'name': 'ab'}, {'min_price': '10', 'max_price': '50'}]:
+            queryset = ProductFilter(params, queryset=Product.objects.filter(seller=self.user)).qs.order_by('price')
+            with self.subTest(params=params):
+                self.assertIndexOnly(queryset)
+
+    def test_every_ordering_reads_only_the_index(self):
+        """
+            set Up : we are explaining a page after a cursor position for each sort option
+
+            result : every plan seeks to the cursor in its covering index without sorting
+        """
+        paginator = ProductKeysetPagination()
+        for sort, (field, _descending) in PRODUCT_ORDERINGS.items():
+            value = Decimal('10.00') if field == 'price' else 'abc'
+            queryset = Product.objects.filter(seller=self.user).order_by(*paginator.get_ordering(sort))
+            queryset = queryset.filter(paginator.get_seek_filter(value, 3, sort=sort))
+            with self.subTest(sort=sort):
+                self.assertIndexOnly(queryset, INDEX_NAME if field == 'price' else NAME_INDEX_NAME)
+                self.assertRegex(ProductReadSerializer.get_rows(queryset).explain(), r'{}[<>]'.format(field))
+
+
+class KeysetOrderingSQLTestCase(TestCase):
+    """
+        The keyset pages must sort in plain index order: a DESC NULLS LAST
+        sort can't be served by a backward scan of the ascending Postgres
+        indexes and would sort every row of the seller.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = UserFactory()
+        for price in [30, None, 10]:
+            ProductFactory(seller=cls.user, price=price)
+
+    def test_descending_pages_sort_in_index_order(self):
+        """
+            set Up : we are fetching pages sorted by each descending option
+
+            result : every query orders by the bare index columns, with no NULLS clause
+        """
+        client = APIClient()
+        client.force_authenticate(self.user)
+        for sort, (field, _descending) in PRODUCT_ORDERINGS.items():
+            if not sort.startswith('-'):
+                continue
+            with self.subTest(sort=sort), CaptureQueriesContext(connection) as queries:
+                client.get(reverse('task:listing'), {'page_size': 2, 'ordering': sort})
+            pages = [query['sql'] for query in queries if 'ORDER BY' in query['sql']]
+            self.assertTrue(pages)
+            for sql in pages:
+                self.assertNotIn('NULLS', sql)
+                self.assertIn('ORDER BY "task_product"."{}" DESC, "task_product"."id" DESC'.format(field), sql)
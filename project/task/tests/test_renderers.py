@@ -0,0 +1,241 @@
+import datetime
+import gzip
+import io
+import json
+from decimal import Decimal
+
+import brotli
+import msgpack
+from django import forms
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils.translation import gettext_lazy
+from rest_framework.exceptions import ErrorDetail, ParseError
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+
+from task.factories import UserFactory, create_products
+from task.filters import ProductFilter
+from task.middleware import CompressionMiddleware
+from task.parsers import ORJSONParser, MessagePackParser
+from task.renderers import ORJSONRenderer, MessagePackRenderer
+
+COMPRESSION_ENABLED = {'ENABLED': True, 'MIN_SIZE': 200, 'ALGORITHMS': ['br', 'gzip'], 'GZIP_LEVEL': 6,
+                       'BROTLI_QUALITY': 4}
+
+
+class ORJSONRendererTestCase(TestCase):
+    def assertRendersIdentically(self, data, accepted_media_type='application/json'):
+        self.assertEqual(
+            ORJSONRenderer().render(data, accepted_media_type, {}),
+            JSONRenderer().render(data, accepted_media_type, {}),
+        )
+
+    def test_it_renders_the_same_bytes_as_drf(self):
+        """
+            set Up :
+              - we are rendering values DRF's encoder special-cases
+
+            result : both renderers output the same bytes
+        """
+        self.assertRendersIdentically({
+            'price': Decimal('10.50'),
+            'created': datetime.datetime(2021, 1, 2, 3, 4, 5, 123456, tzinfo=datetime.timezone.utc),
+            'day': datetime.date(2021, 1, 2),
+            'label': gettext_lazy('name'),
+            'errors': {'name': [ErrorDetail('This field is required.', code='required')]},
+            'text': 'ünïcødé "q" \u2028\u2029',
+            1: None,
+            'items': [{'name': 'car', 'price': '10.00', 'seller': 1}, {'name': 'bike', 'price': None}],
+        })
+
+    def test_it_renders_form_errors_like_drf(self):
+        """
+            set Up :
+              - we are rendering the errors of an invalid filterset and form, whose ErrorLists are list subclasses
+
+            result : both renderers output the same bytes, messages included
+        """
+        filterset = ProductFilter({'ordering': 'bogus', 'min_price': 'abc'})
+        self.assertFalse(filterset.is_valid())
+        form = forms.Form(data={})
+        form.fields['name'] = forms.CharField()
+        self.assertFalse(form.is_valid())
+        self.assertRendersIdentically({'filters': filterset.errors, 'form': form.errors})
+        self.assertIn(b'Enter a number.', ORJSONRenderer().render(filterset.errors))
+
+    def test_invalid_filters_are_explained(self):
+        """
+            set Up :
+              - we are requesting the listing with an unknown ordering
+
+            result : the 422 body carries the error message
+        """
+        client = APIClient()
+        client.force_authenticate(UserFactory())
+        response = client.get(reverse('task:listing') + '?ordering=bogus')
+        self.assertEquals(response.status_code, 422)
+        self.assertEquals(response.json(), {'ordering': ['Select a valid choice. bogus is not one of the available choices.']})
+
+    def test_indented_output_falls_back_to_drf(self):
+        """
+            set Up :
+              - the client asks for indented JSON
+
+            result : the output is indented like DRF's
+        """
+        self.assertRendersIdentically({'name': 'car'}, 'application/json; indent=4')
+
+    def test_product_listing_renders_identically(self):
+        """
+            set Up :
+              - we are requesting a seller's listing
+
+            result : the body is what DRF's JSONRenderer would produce
+        """
+        user = UserFactory()
+        create_products([user], 5, price=Decimal('12.30'))
+        client = APIClient()
+        client.force_authenticate(user)
+        response = client.get(reverse('task:listing'))
+        self.assertEqual(response.content, JSONRenderer().render(response.data))
+        self.assertIn(b'"price":"12.30"', response.content)
+
+
+class ORJSONParserTestCase(TestCase):
+    def parse(self, content):
+        return ORJSONParser().parse(io.BytesIO(content), parser_context={'encoding': 'utf-8'})
+
+    def test_it_parses_json(self):
+        """
+            set Up :
+              - we are parsing a JSON body
+
+            result : the decoded value
+        """
+        self.assertEquals(self.parse('{"name": "ünï", "price": 10.5}'.encode()), {'name': 'ünï', 'price': 10.5})
+
+    def test_it_rejects_invalid_json_and_nan(self):
+        """
+            set Up :
+              - we are parsing a truncated body, then a NaN
+
+            result : a ParseError like DRF's strict parser raises
+        """
+        for content in (b'{"name":', b'{"price": NaN}'):
+            with self.assertRaises(ParseError):
+                self.parse(content)
+
+
+class MessagePackTestCase(TestCase):
+    def test_it_renders_form_errors(self):
+        """
+            set Up :
+              - we are rendering the errors of an invalid filterset
+
+            result : they decode to what DRF's JSONRenderer outputs
+        """
+        filterset = ProductFilter({'ordering': 'bogus', 'min_price': 'abc'})
+        self.assertFalse(filterset.is_valid())
+        self.assertEquals(msgpack.unpackb(MessagePackRenderer().render(filterset.errors)),
+                          json.loads(JSONRenderer().render(filterset.errors)))
+
+    def test_it_round_trips(self):
+        """
+            set Up :
+              - we are rendering then parsing a product list
+
+            result : the same data comes back, Decimals as DRF encodes them
+        """
+        content = MessagePackRenderer().render([{'name': 'car', 'price': '10.00', 'cost': Decimal('1.5')}])
+        self.assertEquals(MessagePackParser().parse(io.BytesIO(content)),
+                          [{'name': 'car', 'price': '10.00', 'cost': 1.5}])
+
+    def test_listing_is_negotiated_with_accept(self):
+        """
+            set Up :
+              - we are requesting the listing with Accept: application/msgpack
+
+            result : the body is MessagePack
+        """
+        user = UserFactory()
+        create_products([user], 2)
+        client = APIClient()
+        client.force_authenticate(user)
+        response = client.get(reverse('task:listing'), HTTP_ACCEPT='application/msgpack')
+        self.assertEquals(response['Content-Type'], 'application/msgpack')
+        self.assertEquals(len(msgpack.unpackb(response.content)), 2)
+
+
+@override_settings(RESPONSE_COMPRESSION=COMPRESSION_ENABLED)
+class CompressionMiddlewareTestCase(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = UserFactory()
+        create_products([cls.user], 50)
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_it_gzips_large_bodies(self):
+        """
+            set Up :
+              - we are requesting a large listing accepting gzip only
+
+            result : the body is gzipped, smaller, and decompresses to the plain body
+        """
+        plain = self.client.get(reverse('task:listing'))
+        response = self.client.get(reverse('task:listing'), HTTP_ACCEPT_ENCODING='gzip')
+        self.assertEquals(response['Content-Encoding'], 'gzip')
+        self.assertIn('Accept-Encoding', response['Vary'])
+        self.assertLess(len(response.content), len(plain.content))
+        self.assertEquals(gzip.decompress(response.content), plain.content)
+        self.assertTrue(response['ETag'].startswith('W/'))
+
+    def test_it_leaves_small_bodies_alone(self):
+        """
+            set Up :
+              - we are requesting a body under MIN_SIZE
+
+            result : no Content-Encoding
+        """
+        response = self.client.get(reverse('task:stats'), HTTP_ACCEPT_ENCODING='gzip')
+        self.assertFalse(response.has_header('Content-Encoding'))
+
+    def test_it_compresses_streaming_exports(self):
+        """
+            set Up :
+              - we are downloading the NDJSON export accepting gzip
+
+            result : the stream is gzipped
+        """
+        response = self.client.get(reverse('task:export', args=['ndjson']), HTTP_ACCEPT_ENCODING='gzip')
+        self.assertEquals(response['Content-Encoding'], 'gzip')
+        self.assertEquals(len(gzip.decompress(b''.join(response.streaming_content)).splitlines()), 50)
+
+    def test_it_prefers_brotli(self):
+        """
+            set Up :
+              - the client accepts both brotli and gzip
+
+            result : brotli is used
+        """
+        response = self.client.get(reverse('task:listing'), HTTP_ACCEPT_ENCODING='gzip, br')
+        self.assertEquals(response['Content-Encoding'], 'br')
+
+    def test_it_follows_the_clients_quality_values(self):
+        """
+            set Up :
+              - we are negotiating with various Accept-Encoding headers
+
+            result : the best acceptable coding, or none
+        """
+        middleware = CompressionMiddleware(lambda request: None)
+        middleware.algorithms = ['br', 'gzip']
+        self.assertEquals(middleware.negotiate('gzip, br'), 'br')
+        self.assertEquals(middleware.negotiate('gzip;q=1.0, br;q=0.5'), 'gzip')
+        self.assertEquals(middleware.negotiate('*'), 'br')
+        self.assertEquals(middleware.negotiate('br;q=0, *;q=0.1'), 'gzip')
+        self.assertIsNone(middleware.negotiate('identity'))
+        self.assertIsNone(middleware.negotiate(''))
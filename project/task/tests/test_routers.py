@@ -0,0 +1,184 @@
+import base64
+
+from django.contrib.sessions.models import Session
+from django.core.cache import caches
+from django.db import transaction
+from django.test import TransactionTestCase, override_settings
+from django.urls import reverse
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+from task.factories import UserFactory
+from task.models import Product, User
+from task.routers import PrimaryReplicaRouter, RoutingState, activate, deactivate
+
+REPLICAS = {'DATABASES': ['replica'], 'MODELS': ['task.Product'], 'STICKY_SECONDS': 5, 'CACHE': 'default'}
+
+
+@override_settings(READ_REPLICAS=REPLICAS)
+class PrimaryReplicaRouterTestCase(TransactionTestCase):
+    databases = {'default', 'replica'}
+
+    def setUp(self):
+        self.router = PrimaryReplicaRouter()
+
+    def test_reads_go_to_the_replica(self):
+        """
+            set Up :
+              - a replica is configured and nothing pins the primary
+
+            result : reads are routed to the replica and writes to the primary
+        """
+        self.assertEquals(self.router.db_for_read(Product), 'replica')
+        self.assertEquals(self.router.db_for_write(Product), 'default')
+
+    def test_auth_models_are_read_from_the_primary(self):
+        """
+            set Up :
+              - a replica is configured and nothing pins the primary
+
+            result : users, tokens and sessions are still read from the primary
+        """
+        for model in (User, Token, Session):
+            with self.subTest(model=model):
+                self.assertEquals(self.router.db_for_read(model), 'default')
+
+    def test_pinned_request_reads_from_the_primary(self):
+        """
+            set Up :
+              - the current request is pinned
+
+            result : reads are routed to the primary
+        """
+        token = activate(RoutingState(pinned=True))
+        try:
+            self.assertEquals(self.router.db_for_read(Product), 'default')
+        finally:
+            deactivate(token)
+
+    def test_request_reads_its_own_writes(self):
+        """
+            set Up :
+              - the current request writes
+
+            result : later reads of the same request are routed to the primary
+        """
+        state = RoutingState()
+        token = activate(state)
+        try:
+            self.assertEquals(self.router.db_for_read(Product), 'replica')
+            self.router.db_for_write(Product)
+            self.assertEquals(self.router.db_for_read(Product), 'default')
+        finally:
+            deactivate(token)
+
+    def test_reads_inside_a_transaction_use_the_primary(self):
+        """
+            set Up :
+              - we are inside a transaction on the primary
+
+            result : reads are routed to the primary
+        """
+        with transaction.atomic():
+            self.assertEquals(self.router.db_for_read(Product), 'default')
+
+    @override_settings(READ_REPLICAS={'DATABASES': []})
+    def test_without_replicas_it_does_not_route(self):
+        """
+            set Up :
+              - no replica is configured
+
+            result : the router leaves reads to the default database
+        """
+        self.assertIsNone(self.router.db_for_read(Product))
+
+
+@override_settings(READ_REPLICAS=REPLICAS)
+class ReadYourWritesTestCase(TransactionTestCase):
+    databases = {'default', 'replica'}
+
+    def setUp(self):
+        caches['default'].clear()
+        self.user = UserFactory()
+        self.token = Token.objects.create(user=self.user)
+        # Replicate the seller; products written later stay on the primary (replication lag).
+        self.user.save(using='replica')
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION='Token ' + self.token.key)
+
+    def create_product(self):
+        response = self.client.post(reverse('task:create'), {'name': 'new', 'price': '9.99', 'seller': self.user.pk},
+                                    format='json')
+        self.assertEquals(response.status_code, 201)
+
+    def test_writer_sees_its_new_product(self):
+        """
+            set Up :
+              - the seller creates a product that hasn't reached the replica yet
+
+            result : the seller's next listing is read from the primary and contains it
+        """
+        self.create_product()
+        response = self.client.get(reverse('task:listing'))
+        self.assertEquals(len(response.data), 1)
+
+    def test_writer_exports_its_new_product(self):
+        """
+            set Up :
+              - the seller creates a product, then streams its export
+
+            result : the export, read after the view returned, comes from the primary and contains it
+        """
+        self.create_product()
+        response = self.client.get(reverse('task:export', args=['ndjson']))
+        self.assertEquals(len(b''.join(response.streaming_content).splitlines()), 1)
+
+    def test_other_clients_read_from_the_replica(self):
+        """
+            set Up :
+              - the seller creates a product, then the listing is requested without its token
+
+            result : the listing is read from the lagging replica
+        """
+        self.create_product()
+        other = APIClient()
+        credentials = base64.b64encode('{}:secret'.format(self.user.email).encode()).decode()
+        other.credentials(HTTP_AUTHORIZATION='Basic ' + credentials)
+        response = other.get(reverse('task:listing'))
+        self.assertEquals(response.status_code, 200)
+        self.assertEquals(len(response.data), 0)
+
+    def test_stickiness_expires(self):
+        """
+            set Up :
+              - the seller creates a product and the sticky window passes
+
+            result : the listing is read from the replica again
+        """
+        self.create_product()
+        caches['default'].clear()
+        response = self.client.get(reverse('task:listing'))
+        self.assertEquals(len(response.data), 0)
+
+    def test_new_token_works_before_it_is_replicated(self):
+        """
+            set Up :
+              - a token only exists on the primary and is used by a fresh client
+
+            result : the request is authenticated
+        """
+        token = Token.objects.create(user=UserFactory())
+        response = APIClient().get(reverse('task:listing'), HTTP_AUTHORIZATION='Token ' + token.key)
+        self.assertEquals(response.status_code, 200)
+
+    def test_login_reads_from_the_primary(self):
+        """
+            set Up :
+              - a user that only exists on the primary logs in
+
+            result : credentials are checked against the primary
+        """
+        user = UserFactory()
+        credentials = base64.b64encode('{}:secret'.format(user.email).encode()).decode()
+        response = APIClient().get(reverse('login'), HTTP_AUTHORIZATION='Basic ' + credentials)
+        self.assertEquals(response.status_code, 200)
@@ -0,0 +1,38 @@
+import unittest
+from io import StringIO
+
+from django.test import SimpleTestCase
+
+from task.runner import TimedTestRunner, TimedTextTestResult
+
+
+class TimedTestRunnerTestCase(SimpleTestCase):
+    def test_serial_runs_record_test_durations(self):
+        """
+            set Up :
+              - we are running a small suite with the result class of a serial run
+
+            result : every test gets a duration
+        """
+        class Sample(unittest.TestCase):
+            def test_one(self):
+                pass
+
+            def test_two(self):
+                pass
+
+        runner = TimedTestRunner(parallel=1, verbosity=0)
+        self.assertIs(runner.get_resultclass(), TimedTextTestResult)
+        suite = unittest.defaultTestLoader.loadTestsFromTestCase(Sample)
+        result = unittest.TextTestRunner(stream=StringIO(), resultclass=TimedTextTestResult).run(suite)
+        self.assertEquals([test_id.rsplit('.', 1)[1] for test_id, _seconds in result.durations],
+                          ['test_one', 'test_two'])
+
+    def test_parallel_runs_use_the_default_result(self):
+        """
+            set Up :
+              - we are configuring a run on two processes
+
+            result : no per-test timing is attempted
+        """
+        self.assertIsNone(TimedTestRunner(parallel=2, verbosity=0).get_resultclass())
@@ -1,14 +1,21 @@
+from decimal import Decimal
+from unittest import mock
+
 from django.contrib.auth import get_user_model
 from django.test import TestCase
+from rest_framework.renderers import JSONRenderer
 from task.factories import UserFactory, ProductFactory
 from task.models import Product
-from task.serializers import UserSerializer, ProductSerializer
+from task.serializers import UserSerializer, ProductSerializer, ProductReadSerializer, format_price
 
 
 class UserSerializerTestCase(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = UserFactory()
+
     def setUp(self):
         self.UserModel = get_user_model()
-        self.user = UserFactory()
         self.serializer = UserSerializer(instance=self.user)
         self.data = {
             'username': "test",
@@ -150,9 +157,12 @@ class UserSerializerTestCase(TestCase):
 
 
 class ProductSerializerTestCase(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = UserFactory()
+        cls.product = ProductFactory()
+
     def setUp(self):
-        self.user = UserFactory()
-        self.product = ProductFactory()
         self.serializer = ProductSerializer(instance=self.product)
         self.data = {
             'name': 'car',
@@ -234,3 +244,75 @@ class ProductSerializerTestCase(TestCase):
         serializer.save()
         self.assertEquals(ProductSerializer(instance=self.product).data, serializer.data)
 
+
+
+class ProductReadSerializerTestCase(TestCase):
+    """
+        Parity suite: the fast read path must render byte-identical JSON to
+        ProductSerializer(many=True) for the same queryset.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = UserFactory()
+        for price in [None, 0, '0.5', '1.05', 10, '1234.56', '99999999.99']:
+            ProductFactory(seller=cls.user, price=price)
+        ProductFactory(seller=None, name='no seller', price=3)
+        ProductFactory(seller=cls.user, name='ünïcødé "q"', price=7)
+
+    def assertRendersIdentically(self, queryset):
+        expected = JSONRenderer().render(ProductSerializer(queryset, many=True).data)
+        actual = JSONRenderer().render(ProductReadSerializer(ProductReadSerializer.get_rows(queryset)).data)
+        self.assertEqual(actual, expected)
+
+    def test_it_renders_same_json_as_product_serializer(self):
+        """
+              set Up :
+                - we are rendering every product with both serializers
+
+              result : both outputs are byte-identical
+        """
+        self.assertRendersIdentically(Product.objects.order_by('id'))
+
+    def test_it_renders_same_json_for_seller_listing(self):
+        """
+              set Up :
+                - we are rendering the listing queryset of one seller
+
+              result : both outputs are byte-identical
+        """
+        self.assertRendersIdentically(Product.objects.filter(seller=self.user).order_by('price'))
+
+    def test_it_renders_empty_list(self):
+        """
+              set Up :
+                - we are rendering an empty queryset
+
+              result : both outputs are byte-identical
+        """
+        self.assertRendersIdentically(Product.objects.none())
+
+    def test_format_price_matches_decimal_field(self):
+        """
+              set Up :
+                - we are formatting prices that need rounding and padding
+
+              result : same strings as the DRF DecimalField of ProductSerializer
+        """
+        field = ProductSerializer().fields['price']
+        for value in [Decimal('1'), Decimal('2.005'), Decimal('2.015'), Decimal('-3.1'), Decimal('0E-10')]:
+            self.assertEqual(format_price(value), field.to_representation(value))
+
+    def test_it_does_not_instantiate_models(self):
+        """
+              set Up :
+                - we are serializing rows straight from values_list
+
+              result : rows are tuples, no Product is built from them, and one query is issued
+        """
+        with mock.patch.object(Product, 'from_db') as from_db, self.assertNumQueries(1):
+            rows = list(ProductReadSerializer.get_rows(Product.objects.all()))
+            data = ProductReadSerializer(rows).data
+        from_db.assert_not_called()
+        self.assertTrue(all(isinstance(row, tuple) for row in rows))
+        self.assertEqual(len(data), Product.objects.count())
@@ -0,0 +1,179 @@
+import tempfile
+from datetime import timedelta
+from importlib import import_module
+from io import StringIO
+
+from django.conf import settings
+from django.contrib.sessions.models import Session
+from django.core.exceptions import ImproperlyConfigured
+from django.core.management import call_command
+from django.db import connection
+from django.http import HttpResponse
+from django.test import RequestFactory, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from task.middleware import SessionMiddleware
+from task.sessions import purge_expired_sessions
+
+
+@override_settings(SESSION_ENGINE='task.sessions.db')
+class SessionWriteSuppressionTestCase(TestCase):
+    def setUp(self):
+        store = import_module(settings.SESSION_ENGINE).SessionStore()
+        store['cart'] = [1, 2]
+        store.save()
+        self.session_key = store.session_key
+
+    def run_request(self, view):
+        request = RequestFactory().get('/')
+        request.COOKIES[settings.SESSION_COOKIE_NAME] = self.session_key
+        middleware = SessionMiddleware(lambda request: view(request) or HttpResponse())
+        with CaptureQueriesContext(connection) as queries:
+            response = middleware(request)
+        return response, [query['sql'] for query in queries]
+
+    def test_unchanged_session_is_not_saved(self):
+        """
+            set Up :
+              - a view assigns the value the session already holds
+
+            result : the session is read but neither written nor sent back as a cookie
+        """
+        def view(request):
+            request.session['cart'] = [1, 2]
+
+        response, queries = self.run_request(view)
+        self.assertEquals(len(queries), 1)
+        self.assertTrue(queries[0].startswith('SELECT'))
+        self.assertNotIn(settings.SESSION_COOKIE_NAME, response.cookies)
+
+    def test_changed_session_is_saved(self):
+        """
+            set Up :
+              - a view changes a session value
+
+            result : the session is written and its cookie refreshed
+        """
+        def view(request):
+            request.session['cart'] = [1, 2, 3]
+
+        response, queries = self.run_request(view)
+        self.assertTrue(any(query.startswith('UPDATE') for query in queries))
+        self.assertIn(settings.SESSION_COOKIE_NAME, response.cookies)
+        store = import_module(settings.SESSION_ENGINE).SessionStore(self.session_key)
+        self.assertEquals(store['cart'], [1, 2, 3])
+
+    def test_cycled_key_is_saved(self):
+        """
+            set Up :
+              - a view cycles the session key, as login does, without changing the data
+
+            result : the client gets the new key
+        """
+        def view(request):
+            request.session.cycle_key()
+
+        response, _queries = self.run_request(view)
+        self.assertNotEquals(response.cookies[settings.SESSION_COOKIE_NAME].value, self.session_key)
+
+    @override_settings(SESSION_ENGINE='task.sessions.signed_cookies')
+    def test_signed_cookie_sessions_skip_unchanged_cookies(self):
+        """
+            set Up :
+              - the session lives in a signed cookie and a view re-assigns its value
+
+            result : no cookie is sent back
+        """
+        store = import_module(settings.SESSION_ENGINE).SessionStore()
+        store['cart'] = [1, 2]
+        store.save()
+        self.session_key = store.session_key
+
+        def view(request):
+            request.session['cart'] = [1, 2]
+
+        response, queries = self.run_request(view)
+        self.assertEquals(queries, [])
+        self.assertNotIn(settings.SESSION_COOKIE_NAME, response.cookies)
+
+
+class SessionEngineTestCase(TestCase):
+    def test_sessions_are_stored_in_the_database_by_default(self):
+        """
+            set Up :
+              - SESSION_BACKEND is not set
+
+            result : sessions live in the database, which every worker shares
+        """
+        self.assertEquals(settings.SESSION_ENGINE, 'task.sessions.db')
+
+    @override_settings(SESSION_ENGINE='task.sessions.cached_db')
+    def test_cached_sessions_need_a_shared_cache(self):
+        """
+            set Up :
+              - cached_db sessions are used with the default, per-process cache
+
+            result : the middleware refuses to start
+        """
+        with self.assertRaisesMessage(ImproperlyConfigured, 'LocMemCache'):
+            SessionMiddleware(lambda request: HttpResponse())
+
+    def test_cached_sessions_start_with_a_shared_cache(self):
+        """
+            set Up :
+              - cached_db sessions are used with a cache living outside the process
+
+            result : the middleware starts
+        """
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        caches = {'default': {'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+                              'LOCATION': directory.name}}
+        with self.settings(SESSION_ENGINE='task.sessions.cached_db', CACHES=caches):
+            SessionMiddleware(lambda request: HttpResponse())
+
+
+@override_settings(SESSION_ENGINE='task.sessions.db')
+class PurgeExpiredSessionsTestCase(TestCase):
+    def setUp(self):
+        now = timezone.now()
+        for index in range(5):
+            Session.objects.create(session_key='expired%d' % index, session_data='', expire_date=now - timedelta(days=1))
+        for index in range(2):
+            Session.objects.create(session_key='valid%d' % index, session_data='', expire_date=now + timedelta(days=1))
+
+    def test_it_deletes_expired_sessions_in_batches(self):
+        """
+            set Up :
+              - five sessions are expired and two are not, purged two at a time
+
+            result : only the valid sessions remain, deleted with one statement per batch
+        """
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEquals(purge_expired_sessions(batch_size=2), 5)
+        deletes = [query['sql'] for query in queries if query['sql'].startswith('DELETE')]
+        self.assertEquals(len(deletes), 3)
+        self.assertEquals(set(Session.objects.values_list('session_key', flat=True)), {'valid0', 'valid1'})
+
+    def test_command_reports_the_number_of_deleted_sessions(self):
+        """
+            set Up :
+              - we are running the purge command
+
+            result : the expired sessions are counted in its output
+        """
+        out = StringIO()
+        call_command('purge_sessions', batch_size=10, stdout=out)
+        self.assertIn('Deleted 5 expired sessions', out.getvalue())
+
+    @override_settings(SESSION_ENGINE='task.sessions.cache')
+    def test_cache_sessions_have_nothing_to_purge(self):
+        """
+            set Up :
+              - sessions are stored in the cache
+
+            result : the database is left alone
+        """
+        self.assertEquals(purge_expired_sessions(), 0)
+        self.assertEquals(Session.objects.count(), 7)
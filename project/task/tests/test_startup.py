@@ -0,0 +1,88 @@
+import importlib
+import json
+import os
+from io import StringIO
+from unittest import mock
+
+from django.core.management import call_command
+from django.test import SimpleTestCase, override_settings
+from django.urls import NoReverseMatch, reverse
+
+from task.management.commands.startup_report import parse_import_times
+
+IMPORT_TIMES = '''\
+import time: self [us] | cumulative | imported package
+import time:       120 |        120 |     django.utils.version
+import time:       300 |        420 |   django
+import time:      1500 |       1500 |   rest_framework.compat
+import time:        80 |       2000 | task.views
+'''
+
+
+class ApiSettingsProfileTestCase(SimpleTestCase):
+    def load_profile(self):
+        with mock.patch.dict(os.environ, SECRET_KEY='secret'):
+            import project.settings_api
+            return importlib.reload(project.settings_api)
+
+    def test_it_drops_html_only_apps_and_middleware(self):
+        """
+            set Up :
+              - we are loading the API-only settings profile
+
+            result : the admin, messages, static files, templates and browsable API are gone
+        """
+        profile = self.load_profile()
+        self.assertNotIn('django.contrib.admin', profile.INSTALLED_APPS)
+        self.assertNotIn('django.contrib.messages', profile.INSTALLED_APPS)
+        self.assertNotIn('django.contrib.messages.middleware.MessageMiddleware', profile.MIDDLEWARE)
+        self.assertIn('task', profile.INSTALLED_APPS)
+        self.assertEquals(profile.TEMPLATES, [])
+        self.assertNotIn('rest_framework.renderers.BrowsableAPIRenderer',
+                         profile.REST_FRAMEWORK['DEFAULT_RENDERER_CLASSES'])
+        self.assertFalse(profile.DEBUG)
+
+    @override_settings(ROOT_URLCONF='project.urls_api')
+    def test_api_urlconf_has_no_admin(self):
+        """
+            set Up :
+              - we are resolving URLs with the API-only URLconf
+
+            result : the API endpoints are there, the admin is not
+        """
+        self.assertEquals(reverse('task:listing'), '/task/')
+        self.assertEquals(reverse('login'), '/login/')
+        with self.assertRaises(NoReverseMatch):
+            reverse('admin:index')
+
+
+class StartupReportTestCase(SimpleTestCase):
+    def test_it_parses_import_times(self):
+        """
+            set Up :
+              - we are parsing the output of python -X importtime
+
+            result : one entry per module with its self and cumulative microseconds and depth
+        """
+        self.assertEquals(parse_import_times(IMPORT_TIMES), [
+            ('django.utils.version', 120, 120, 2),
+            ('django', 300, 420, 1),
+            ('rest_framework.compat', 1500, 1500, 1),
+            ('task.views', 80, 2000, 0),
+        ])
+
+    def test_it_reports_the_first_request(self):
+        """
+            set Up :
+              - we are timing a start of the API-only profile
+
+            result : the request went through the whole stack and the import cost is broken down
+        """
+        out = StringIO()
+        with mock.patch.dict(os.environ, SECRET_KEY='secret'):
+            call_command('startup_report', settings_modules=['project.settings_api'], repeat=1, limit=5, stdout=out)
+        profile = json.loads(out.getvalue())['profiles']['project.settings_api']
+        self.assertEquals(profile['status'], '401 Unauthorized')
+        self.assertGreater(profile['total_ms'], 0)
+        self.assertIn('django', profile['packages_ms'])
+        self.assertEquals(len(profile['modules_ms']), 5)
@@ -0,0 +1,216 @@
+from decimal import Decimal
+from io import StringIO
+from unittest import mock
+
+from django.core.management import call_command
+from django.db.models import Avg, Count, Max, Min, QuerySet
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from task.bulk import bulk_create_products
+from task.factories import UserFactory, ProductFactory
+from task.models import Product, SellerStats
+
+
+class SellerStatsTestCase(TestCase):
+    def setUp(self):
+        self.user = UserFactory()
+        self.product = ProductFactory(seller=self.user, price=10)
+        ProductFactory(seller=self.user, price=30)
+        ProductFactory(seller=self.user, price=None)
+
+    def assertStatsMatchProducts(self, seller):
+        expected = Product.objects.filter(seller=seller).aggregate(
+            count=Count('id'), min=Min('price'), max=Max('price'), avg=Avg('price'))
+        stats = SellerStats.objects.get(seller=seller)
+        self.assertEquals(
+            (stats.product_count, stats.min_price, stats.max_price, stats.avg_price),
+            (expected['count'], expected['min'], expected['max'], expected['avg']),
+        )
+
+    def test_it_counts_created_products(self):
+        """
+            set Up :
+              - we are creating products with and without a price
+
+            result : count, bounds and average match an aggregate over the products
+        """
+        self.assertStatsMatchProducts(self.user)
+        self.assertEquals(SellerStats.objects.get(seller=self.user).avg_price, Decimal(20))
+
+    def test_first_product_creates_the_row(self):
+        """
+            set Up :
+              - a seller without a stats row adds a product
+
+            result : the row is created in the same transaction with the product counted
+        """
+        seller = UserFactory()
+        ProductFactory(seller=seller, price=15)
+        stats = SellerStats.objects.get(seller=seller)
+        self.assertEquals((stats.product_count, stats.min_price, stats.max_price), (1, 15, 15))
+
+    def test_concurrent_first_products_share_the_row(self):
+        """
+            set Up :
+              - another writer creates the seller's row between our UPDATE and our INSERT
+
+            result : no integrity error, and both products are counted
+        """
+        seller = UserFactory()
+        update = QuerySet.update
+        calls = []
+
+        def racing_update(queryset, **kwargs):
+            if queryset.model is SellerStats and not calls:
+                calls.append(True)
+                SellerStats.objects.create(seller=seller, product_count=1, priced_count=1, price_sum=5)
+                return 0
+            return update(queryset, **kwargs)
+
+        with mock.patch.object(QuerySet, 'update', racing_update):
+            ProductFactory(seller=seller, price=10)
+        stats = SellerStats.objects.get(seller=seller)
+        self.assertEquals((stats.product_count, stats.price_sum), (2, 15))
+
+    def test_it_follows_price_updates(self):
+        """
+            set Up :
+              - we are changing the price of the cheapest product
+
+            result : the minimum and average are updated
+        """
+        self.product.price = 50
+        self.product.save()
+        self.assertStatsMatchProducts(self.user)
+
+    def test_it_follows_products_moving_to_another_seller(self):
+        """
+            set Up :
+              - we are moving a product to a seller that already has stats
+
+            result : both sellers' stats are updated
+        """
+        other = UserFactory()
+        ProductFactory(seller=other, price=5)
+        self.product.seller = other
+        self.product.save()
+        self.assertStatsMatchProducts(self.user)
+        self.assertStatsMatchProducts(other)
+
+    def test_it_follows_deletes(self):
+        """
+            set Up :
+              - we are deleting products one by one and through a queryset
+
+            result : stats match the remaining products
+        """
+        self.product.delete()
+        self.assertStatsMatchProducts(self.user)
+        Product.objects.filter(seller=self.user).delete()
+        stats = SellerStats.objects.get(seller=self.user)
+        self.assertEquals((stats.product_count, stats.min_price, stats.avg_price), (0, None, None))
+
+    def test_it_follows_bulk_imports(self):
+        """
+            set Up :
+              - we are importing products through the bulk create path
+
+            result : stats include the imported rows
+        """
+        bulk_create_products([{'name': 'item', 'price': price, 'seller': self.user.pk} for price in (1, 99)])
+        self.assertStatsMatchProducts(self.user)
+
+    def test_it_follows_admin_edits(self):
+        """
+            set Up :
+              - a staff user changes a product price in the admin
+
+            result : stats reflect the new price
+        """
+        admin = UserFactory(is_staff=True)
+        self.client.login(username=admin.email, password='secret')
+        url = reverse('admin:task_product_change', args=[self.product.pk])
+        response = self.client.post(url, {'name': self.product.name, 'price': '70', 'seller': self.user.pk})
+        self.assertEquals(response.status_code, 302)
+        self.assertStatsMatchProducts(self.user)
+
+    def test_deleting_a_seller_removes_its_stats(self):
+        """
+            set Up :
+              - we are deleting a seller that has products
+
+            result : the seller, its products and its stats are removed
+        """
+        self.user.delete()
+        self.assertFalse(SellerStats.objects.exists())
+        self.assertFalse(Product.objects.exists())
+
+    def test_deleting_a_seller_costs_the_same_whatever_its_catalog(self):
+        """
+            set Up :
+              - we are deleting sellers with 10 and 100 products, and another seller's products stay
+
+            result : both take the same few queries, and only the deleted seller's rows go
+        """
+        other = UserFactory()
+        ProductFactory(seller=other, price=5)
+        for count in (10, 100):
+            with self.subTest(products=count):
+                seller = UserFactory()
+                bulk_create_products([{'name': 'item', 'price': 1, 'seller': seller.pk}] * count)
+                with self.assertNumQueries(8):
+                    seller.delete()
+                self.assertFalse(Product.objects.filter(seller_id=seller.pk).exists())
+                self.assertFalse(SellerStats.objects.filter(seller_id=seller.pk).exists())
+        self.assertStatsMatchProducts(other)
+
+    def test_rebuild_command_repairs_drift(self):
+        """
+            set Up :
+              - we are changing prices with QuerySet.update(), which sends no signals
+
+            result : the rebuild command brings the stats back in line
+        """
+        Product.objects.filter(seller=self.user).update(price=7)
+        call_command('rebuild_seller_stats', stdout=StringIO())
+        self.assertStatsMatchProducts(self.user)
+
+
+class SellerStatsViewTestCase(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = UserFactory()
+        self.client.force_authenticate(self.user)
+        self.url = reverse('task:stats')
+
+    def test_it_returns_the_sellers_stats_in_one_query(self):
+        """
+            set Up :
+              - the seller has stats
+
+            result : the stats are returned with a single primary key lookup
+        """
+        SellerStats.objects.create(
+            seller=self.user, product_count=3, priced_count=2, price_sum=Decimal('25'),
+            min_price=Decimal('5'), max_price=Decimal('20'),
+        )
+        with self.assertNumQueries(1):
+            response = self.client.get(self.url)
+        self.assertEquals(response.data['product_count'], 3)
+        self.assertEquals(response.data['avg_price'], '12.50')
+        self.assertEquals(response.data['min_price'], '5.00')
+
+    def test_it_returns_zeros_for_a_seller_without_products(self):
+        """
+            set Up :
+              - the seller never wrote a product
+
+            result : returning an empty catalog summary
+        """
+        response = self.client.get(self.url)
+        self.assertEquals(response.status_code, status.HTTP_200_OK)
+        self.assertEquals(response.data['product_count'], 0)
+        self.assertIsNone(response.data['avg_price'])
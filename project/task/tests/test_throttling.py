@@ -0,0 +1,150 @@
+import threading
+
+from django.conf import settings
+from django.contrib.auth.hashers import check_password
+from django.core.cache import caches
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from task.concurrency import HashingBusy, get_password_executor, hash_password
+from task.factories import UserFactory
+from task.throttling import CacheRateStore, LocMemRateStore, reset_rate_stores
+
+SIGNUP_LIMITED = {'RATE': '2/day', 'BACKEND': 'task.throttling.LocMemRateStore', 'OPTIONS': {}}
+
+
+@override_settings(SIGNUP_THROTTLE=SIGNUP_LIMITED)
+class SignupRateThrottleTestCase(TestCase):
+    def setUp(self):
+        reset_rate_stores(setting='SIGNUP_THROTTLE')
+        self.client = APIClient()
+        self.url = reverse('signup')
+
+    def signup(self, index, address='10.0.0.1', **extra):
+        return self.client.post(self.url, {
+            'username': 'user{}'.format(index), 'email': 'user{}@test.com'.format(index),
+            'password': 'secret', 'confirm_password': 'secret',
+        }, REMOTE_ADDR=address, **extra)
+
+    def test_it_returns_429_over_the_rate(self):
+        """
+            set Up :
+              - we are signing up more times than the rate allows from one address
+
+            result : the extra signup is rejected with 429 and a Retry-After header
+        """
+        self.assertEquals(self.signup(1).status_code, status.HTTP_201_CREATED)
+        self.assertEquals(self.signup(2).status_code, status.HTTP_201_CREATED)
+        response = self.signup(3)
+        self.assertEquals(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        self.assertIn('Retry-After', response)
+
+    def test_it_limits_each_address_separately(self):
+        """
+            set Up :
+              - one address used up its signups
+
+            result : another address can still sign up
+        """
+        for index in range(3):
+            self.signup(index)
+        self.assertEquals(self.signup(3, address='10.0.0.2').status_code, status.HTTP_201_CREATED)
+
+    def test_forged_forwarded_for_does_not_reset_the_count(self):
+        """
+            set Up :
+              - one address signs up with a different X-Forwarded-For each time
+
+            result : the signups are counted against its address and the extra one is rejected
+        """
+        for index in range(2):
+            self.signup(index, HTTP_X_FORWARDED_FOR='192.0.2.{}'.format(index))
+        response = self.signup(2, HTTP_X_FORWARDED_FOR='192.0.2.2')
+        self.assertEquals(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+
+    @override_settings(REST_FRAMEWORK=dict(settings.REST_FRAMEWORK, NUM_PROXIES=1))
+    def test_it_counts_the_address_seen_by_the_proxy(self):
+        """
+            set Up :
+              - the API runs behind one proxy, and a client prepends forged addresses to X-Forwarded-For
+
+            result : signups are counted against the address the proxy appended
+        """
+        for index in range(2):
+            self.signup(index, address='10.0.0.100',
+                        HTTP_X_FORWARDED_FOR='192.0.2.{}, 198.51.100.7'.format(index))
+        response = self.signup(2, address='10.0.0.100', HTTP_X_FORWARDED_FOR='192.0.2.2, 198.51.100.7')
+        self.assertEquals(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        response = self.signup(3, address='10.0.0.100', HTTP_X_FORWARDED_FOR='198.51.100.8')
+        self.assertEquals(response.status_code, status.HTTP_201_CREATED)
+
+    def test_it_does_not_throttle_product_endpoints(self):
+        """
+            set Up :
+              - one address used up its signups
+
+            result : the product listing is still served to that address
+        """
+        for index in range(3):
+            self.signup(index)
+        client = APIClient()
+        client.force_authenticate(UserFactory())
+        response = client.get(reverse('task:listing'), REMOTE_ADDR='10.0.0.1')
+        self.assertEquals(response.status_code, status.HTTP_200_OK)
+
+
+class RateStoreTestCase(TestCase):
+    def test_stores_count_per_key(self):
+        """
+            set Up :
+              - we are incrementing two keys in each store
+
+            result : every key counts its own hits
+        """
+        caches['default'].clear()
+        for store in (LocMemRateStore(), CacheRateStore('default')):
+            with self.subTest(store=type(store).__name__):
+                self.assertEquals([store.incr('a', 60) for _ in range(3)], [1, 2, 3])
+                self.assertEquals(store.incr('b', 60), 1)
+
+    def test_locmem_store_restarts_expired_windows(self):
+        """
+            set Up :
+              - a counter's window has expired
+
+            result : counting starts again from one
+        """
+        store = LocMemRateStore()
+        store.incr('a', -1)
+        self.assertEquals(store.incr('a', 60), 1)
+
+
+class PasswordHashingPoolTestCase(TestCase):
+    @override_settings(PASSWORD_HASHING={'WORKERS': 1, 'TIMEOUT': 0.05})
+    def test_it_returns_503_when_every_worker_is_busy(self):
+        """
+            set Up :
+              - the only hashing worker is busy longer than the timeout
+
+            result : hashing gives up with HashingBusy instead of queueing
+        """
+        release = threading.Event()
+        get_password_executor().submit(release.wait)
+        try:
+            with self.assertRaises(HashingBusy):
+                hash_password('secret')
+        finally:
+            release.set()
+
+    def test_it_hashes_on_the_pool(self):
+        """
+            set Up :
+              - a hashing worker is free
+
+            result : the password comes back hashed
+        """
+        encoded = hash_password('secret')
+        self.assertNotEqual(encoded, 'secret')
+        self.assertTrue(check_password('secret', encoded))
@@ -1,6 +1,9 @@
 from django.test import TestCase
 from django.urls import reverse, resolve
-from task.views import UserRegistrationAPIView, UserLoginAPIView, ProductListView, ProductCreateView
+from task.views import (
+    UserRegistrationAPIView, UserLoginAPIView, ProductListView, ProductCreateView, ProductBulkCreateView,
+    ProductExportView, AsyncProductListView, AsyncProductCreateView, SellerStatsView, JobStatusView, JobDownloadView,
+)
 
 
 class ProductUrlsTestCase(TestCase):
@@ -22,6 +25,69 @@ class ProductUrlsTestCase(TestCase):
         url = reverse('task:create')
         self.assertEquals(resolve(url).func.view_class, ProductCreateView)
 
+    def test_bulk_create_product_url_resolves(self):
+        """
+                set Up : we are the url bulk create product url
+
+                result : returning the correct view for the url
+        """
+        url = reverse('task:bulk-create')
+        self.assertEquals(resolve(url).func.view_class, ProductBulkCreateView)
+
+    def test_export_product_url_resolves(self):
+        """
+                set Up : we are the url export products as csv url
+
+                result : returning the correct view for the url
+        """
+        url = reverse('task:export', args=['csv'])
+        self.assertEquals(resolve(url).func.view_class, ProductExportView)
+
+    def test_async_listing_url_resolves(self):
+        """
+                set Up : we are the url async list all product url
+
+                result : returning the correct view for the url
+        """
+        url = reverse('task:async-listing')
+        self.assertEquals(resolve(url).func.view_class, AsyncProductListView)
+
+    def test_async_create_product_url_resolves(self):
+        """
+                set Up : we are the url async create product url
+
+                result : returning the correct view for the url
+        """
+        url = reverse('task:async-create')
+        self.assertEquals(resolve(url).func.view_class, AsyncProductCreateView)
+
+    def test_seller_stats_url_resolves(self):
+        """
+                set Up : we are the url seller stats url
+
+                result : returning the correct view for the url
+        """
+        url = reverse('task:stats')
+        self.assertEquals(resolve(url).func.view_class, SellerStatsView)
+
+    def test_job_status_url_resolves(self):
+        """
+                set Up : we are the url job status url
+
+                result : returning the correct view for the url
+        """
+        url = reverse('task:job', args=[1])
+        self.assertEquals(resolve(url).func.view_class, JobStatusView)
+
+    def test_job_download_url_resolves(self):
+        """
+                set Up : we are the url job download url
+
+                result : returning the correct view for the url
+        """
+        url = reverse('task:job-download', args=[1])
+        self.assertEquals(resolve(url).func.view_class, JobDownloadView)
+
     def test_user_login_url_resolves(self):
         """
                 set Up : we are the url login url
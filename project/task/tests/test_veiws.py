@@ -63,12 +63,43 @@ class UserSignupAPITestCase(TestCase):
         response = self.client.post(self.url, self.data)
         self.assertIn('user', response.data)
 
+    def test_it_writes_the_user_once_with_a_hashed_password(self):
+        """
+              set Up :
+                - we are posting registration data
+
+              result : one uniqueness query and one insert per row, with the password hashed before it
+        """
+        with self.assertNumQueries(5):
+            # uniqueness check, savepoint, user insert, token insert, release
+            self.client.post(self.url, self.data)
+        user = self.UserModel.objects.get(email=self.data['email'])
+        self.assertNotEqual(user.password, self.data['password'])
+        self.assertTrue(user.check_password(self.data['password']))
+
+    def test_it_reports_taken_email_and_username_together(self):
+        """
+              set Up :
+                - we are signing up with the email and username of existing users
+
+              result : returning response 422 with both errors from a single query
+        """
+        UserFactory(email=self.data['email'])
+        UserFactory(username=self.data['username'])
+        with self.assertNumQueries(1):
+            response = self.client.post(self.url, self.data)
+        self.assertEquals(response.status_code, 422)
+        self.assertEquals(set(response.data), {'email', 'username'})
+
 
 class ProductListTestCase(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = UserFactory()
+        cls.product = ProductFactory()
+
     def setUp(self):
         self.client = APIClient()
-        self.user = UserFactory()
-        self.product = ProductFactory()
         self.client.login(username=self.user.email, password='secret')
         self.url = reverse('task:listing')
 
@@ -107,10 +138,13 @@ class ProductListTestCase(TestCase):
 
 
 class ProductCreateTestCase(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = UserFactory()
+        cls.product = ProductFactory()
+
     def setUp(self):
         self.client = APIClient()
-        self.user = UserFactory()
-        self.product = ProductFactory()
         self.client.login(username=self.user.email, password='secret')
         self.url = reverse('task:create')
         self.data = {
@@ -153,10 +187,13 @@ class ProductCreateTestCase(TestCase):
 
 
 class UserLoginTestCase(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = UserFactory()
+        cls.product = ProductFactory()
+
     def setUp(self):
         self.client = APIClient()
-        self.user = UserFactory()
-        self.product = ProductFactory()
         self.client.login(username=self.user.email, password='secret')
         self.url = reverse('login')
         self.data = {
@@ -0,0 +1,103 @@
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+from django.utils.module_loading import import_string
+from rest_framework.throttling import BaseThrottle
+
+DURATIONS = {'s': 1, 'm': 60, 'h': 3600, 'd': 86400}
+
+
+class LocMemRateStore:
+    """Per-process counters; limits apply per worker process."""
+
+    def __init__(self, max_entries=100000):
+        self.max_entries = max_entries
+        self._counters = {}
+        self._lock = threading.Lock()
+
+    def incr(self, key, ttl):
+        now = time.monotonic()
+        with self._lock:
+            if len(self._counters) >= self.max_entries:
+                self._counters = {k: v for k, v in self._counters.items() if v[1] > now}
+            count, expires_at = self._counters.get(key, (0, now + ttl))
+            if expires_at <= now:
+                count, expires_at = 0, now + ttl
+            self._counters[key] = (count + 1, expires_at)
+            return count + 1
+
+
+class CacheRateStore:
+    """Counters in a ``CACHES`` alias (Redis, Memcached...), shared by every worker."""
+
+    def __init__(self, alias='default'):
+        self.alias = alias
+
+    def incr(self, key, ttl):
+        cache = caches[self.alias]
+        cache.add(key, 0, ttl)
+        try:
+            return cache.incr(key)
+        except ValueError:
+            # Expired between add() and incr().
+            cache.set(key, 1, ttl)
+            return 1
+
+
+_stores = {}
+_stores_lock = threading.Lock()
+
+
+def get_rate_store(setting_name):
+    store = _stores.get(setting_name)
+    if store is None:
+        with _stores_lock:
+            store = _stores.get(setting_name)
+            if store is None:
+                config = getattr(settings, setting_name)
+                backend = import_string(config.get('BACKEND', 'task.throttling.LocMemRateStore'))
+                store = _stores[setting_name] = backend(**config.get('OPTIONS', {}))
+    return store
+
+
+@receiver(setting_changed)
+def reset_rate_stores(*, setting, **kwargs):
+    _stores.pop(setting, None)
+
+
+class FixedWindowRateThrottle(BaseThrottle):
+    """
+    Allow ``RATE`` (e.g. ``'20/min'``) requests per client address and fixed
+    window, counted in the store configured by the ``setting_name`` dict.
+
+    Unlike DRF's ``SimpleRateThrottle``, which rewrites a list of timestamps
+    per client, a request costs one atomic increment, so the check stays
+    cheap during the floods it is meant to stop. A ``RATE`` of ``None``
+    disables the throttle.
+    """
+    setting_name = None
+    scope = None
+
+    def allow_request(self, request, view):
+        rate = getattr(settings, self.setting_name, {}).get('RATE')
+        if rate is None:
+            return True
+        limit, period = rate.split('/')
+        duration = DURATIONS[period[0]]
+        now = time.time()
+        window = int(now // duration)
+        self.retry_after = duration - now % duration
+        key = 'throttle:{}:{}:{}'.format(self.scope, self.get_ident(request), window)
+        return get_rate_store(self.setting_name).incr(key, duration) <= int(limit)
+
+    def wait(self):
+        return self.retry_after
+
+
+class SignupRateThrottle(FixedWindowRateThrottle):
+    setting_name = 'SIGNUP_THROTTLE'
+    scope = 'signup'
@@ -1,10 +1,20 @@
-from django.urls import path, include
-from task.views import ProductListView, ProductCreateView
+from django.urls import path, re_path, include
+from task.views import (
+    ProductListView, ProductCreateView, ProductBulkCreateView, ProductExportView,
+    AsyncProductListView, AsyncProductCreateView, SellerStatsView, JobStatusView, JobDownloadView,
+)
 
 app_name = "task"
 
 urlpatterns = [
 
     path('create/', ProductCreateView.as_view(), name='create'),
+    path('create/bulk/', ProductBulkCreateView.as_view(), name='bulk-create'),
+    re_path(r'^export/(?P<export_format>ndjson|csv)/$', ProductExportView.as_view(), name='export'),
+    path('stats/', SellerStatsView.as_view(), name='stats'),
+    path('jobs/<int:pk>/', JobStatusView.as_view(), name='job'),
+    path('jobs/<int:pk>/download/', JobDownloadView.as_view(), name='job-download'),
+    path('async/create/', AsyncProductCreateView.as_view(), name='async-create'),
+    path('async/', AsyncProductListView.as_view(), name='async-listing'),
     path('', ProductListView.as_view(), name='listing'),
 ]
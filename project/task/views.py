@@ -1,39 +1,239 @@
+import asyncio
+import functools
+import hashlib
+import itertools
+from collections.abc import Iterator
+
+from django.db import router, transaction
+from django.http import FileResponse, Http404, HttpResponse, StreamingHttpResponse
+from django.shortcuts import get_object_or_404
+from django.urls import reverse
+from django.utils.cache import patch_vary_headers
+from django.utils.decorators import method_decorator
+from django.views import View
+from django.views.decorators.http import condition
 from rest_framework import status
-from rest_framework.permissions import IsAuthenticated
+from rest_framework.authtoken.models import Token
+from rest_framework.exceptions import APIException, NotAuthenticated, ValidationError
+from rest_framework.permissions import IsAdminUser, IsAuthenticated
+from rest_framework.request import Request
 from rest_framework.response import Response
+from rest_framework.settings import api_settings
 from rest_framework.views import APIView
 from django.db.models import Q
-from task.models import Product
-from task.serializers import UserSerializer, ProductSerializer
+from task.bulk import bulk_create_products, get_bulk_create_setting, too_many_rows
+from task.admission import get_admission_controller
+from task.authentication import aauthenticate
+from task.cache import get_product_list_cache
+from task.concurrency import run_sync
+from task.db.pool import PoolTimeout, get_connection_pool
+from task.export import EXPORT_FORMATS, export_rows, get_export_path
+from task.filters import ProductFilter
+from task.jobs import enqueue
+from task.metrics import timing
+from task.models import Job, Product, SellerStats, User
+from task.pagination import ProductKeysetPagination
+from task.parsers import NDJSONParser, ORJSONParser
+from task.renderers import ORJSONRenderer
+from task.serializers import (
+    UserSerializer, ProductSerializer, ProductReadSerializer, SellerStatsSerializer, JobSerializer,
+)
+from task.throttling import SignupRateThrottle
 
 
 class UserRegistrationAPIView(APIView):
     serializer_class = UserSerializer
+    throttle_classes = [SignupRateThrottle]
 
     def post(self, request, *args, **kwargs):
         serializer = UserSerializer(data=request.data, context={'is_created': False})
         if serializer.is_valid():
-            serializer.save()
-            return Response({"user": serializer.data}, status=status.HTTP_201_CREATED)
+            try:
+                # User and token are committed together.
+                with transaction.atomic():
+                    user = serializer.save()
+                    token = Token.objects.create(user=user)
+            except ValidationError as exc:
+                return Response(exc.detail, status=status.HTTP_422_UNPROCESSABLE_ENTITY)
+            return Response({"user": serializer.data, "token": token.key}, status=status.HTTP_201_CREATED)
         return Response(serializer.errors, status=status.HTTP_422_UNPROCESSABLE_ENTITY)
 
 
 class UserLoginAPIView(APIView):
     permission_classes = [IsAuthenticated]
+    # Credentials are usually checked right after signup; a lagging replica would reject them.
+    read_from_primary = True
 
     def get(self, request):
-        msg = {'message': f'Hi {request.user.username}! Congratulations on being authenticated!'}
+        token, _created = Token.objects.get_or_create(user=request.user)
+        msg = {
+            'message': f'Hi {request.user.username}! Congratulations on being authenticated!',
+            'token': token.key,
+        }
         return Response(msg, status=status.HTTP_200_OK)
 
 
+def get_catalog_state(request):
+    """
+    Return ``(catalog_version, catalog_updated_at)`` of the requesting seller.
+
+    Read from ``request.user`` when it was just loaded by authentication, so
+    it costs no query; users served from the token cache may be stale and
+    are re-read with a single primary key lookup.
+    """
+    state = getattr(request, '_catalog_state', None)
+    if state is None:
+        user = request.user
+        if getattr(user, 'is_cached_credential', False):
+            state = User.objects.filter(pk=user.pk).values_list('catalog_version', 'catalog_updated_at').get()
+        else:
+            state = (user.catalog_version, user.catalog_updated_at)
+        request._catalog_state = state
+    return state
+
+
+def product_list_etag(request, *args, **kwargs):
+    """
+    ETag of a seller's listing, derived from its catalog version. The URL and
+    the accepted media type are part of the tag since pages, query params,
+    formats and media type params like ``indent`` render different bodies.
+    """
+    if not request.user.is_authenticated:
+        return None
+    variant = '{} {}'.format(request.get_full_path(), request.accepted_media_type)
+    digest = hashlib.sha1(variant.encode('utf-8')).hexdigest()[:16]
+    return '{}-{}-{}'.format(request.user.pk, get_catalog_state(request)[0], digest)
+
+
+def product_list_last_modified(request, *args, **kwargs):
+    if not request.user.is_authenticated:
+        return None
+    return get_catalog_state(request)[1]
+
+
+class MetricsView(APIView):
+    """Runtime counters of the in-process caches and pools, for staff only."""
+    permission_classes = [IsAdminUser]
+
+    def get(self, request, *args, **kwargs):
+        cache = get_product_list_cache()
+        pool = get_connection_pool()
+        admission = get_admission_controller()
+        return Response({
+            'product_list_cache': cache.stats() if cache else None,
+            'database_pool': pool.stats() if pool else None,
+            'admission_control': admission.stats() if admission else None,
+        }, status=status.HTTP_200_OK)
+
+
 class ProductListView(APIView):
     permission_classes = [IsAuthenticated]
     serializer_class = ProductSerializer
+    pagination_class = ProductKeysetPagination
+
+    @method_decorator(condition(etag_func=product_list_etag, last_modified_func=product_list_last_modified))
+    def get(self, request, *args, **kwargs):
+        self.cache_key = None
+        cache = get_product_list_cache()
+        if cache is not None and request.accepted_renderer.format == 'json':
+            self.cache_key = cache.make_key(
+                request.user.pk, get_catalog_state(request)[0], request.build_absolute_uri(),
+                request.accepted_media_type)
+            content = cache.get(self.cache_key)
+            if content is not None:
+                response = HttpResponse(content, content_type=request.accepted_renderer.media_type)
+                response['X-Cache'] = 'HIT'
+                return response
+
+        filterset = ProductFilter(request.query_params, queryset=Product.objects.filter(Q(seller=request.user)))
+        if not filterset.is_valid():
+            return Response(filterset.errors, status=status.HTTP_422_UNPROCESSABLE_ENTITY)
+        products = filterset.qs
+        paginator = self.pagination_class()
+        if paginator.is_requested(request):
+            page = paginator.paginate_queryset(ProductReadSerializer.get_rows(products), request, view=self)
+            with timing('serializer'):
+                data = ProductReadSerializer(page).data
+            return paginator.get_paginated_response(data)
+        if not products.ordered:
+            products = products.order_by('price')
+        rows = list(ProductReadSerializer.get_rows(products))
+        with timing('serializer'):
+            data = ProductReadSerializer(rows).data
+        return Response(data, status=status.HTTP_200_OK)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+        # The body depends on the Accept header as well as the URL.
+        patch_vary_headers(response, ('Accept',))
+        if getattr(self, 'cache_key', None) and isinstance(response, Response) and response.status_code == 200:
+            response.render()
+            get_product_list_cache().set(self.cache_key, response.content)
+            response['X-Cache'] = 'MISS'
+        return response
+
+
+class SellerStatsView(APIView):
+    """Catalog aggregates of the requesting seller, read from its ``SellerStats`` row."""
+    permission_classes = [IsAuthenticated]
 
     def get(self, request, *args, **kwargs):
-        products = Product.objects.filter(Q(seller=request.user)).order_by('price')
-        serializer = ProductSerializer(products, many=True)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        # No row yet means no product was ever written for this seller.
+        stats = SellerStats.objects.filter(seller=request.user).first() or SellerStats(seller=request.user)
+        return Response(SellerStatsSerializer(stats).data, status=status.HTTP_200_OK)
+
+
+class ProductExportView(APIView):
+    """Stream the seller's whole catalog as NDJSON or CSV with constant memory."""
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, export_format, *args, **kwargs):
+        content_type, render_rows = EXPORT_FORMATS[export_format]
+        # The body is read after ReadYourWritesMiddleware has returned: pick
+        # the database now, while the request's routing state still applies.
+        alias = router.db_for_read(Product)
+        rows = export_rows(Product.objects.using(alias).filter(Q(seller=request.user)))
+        response = StreamingHttpResponse(render_rows(rows), content_type=content_type)
+        response['Content-Disposition'] = 'attachment; filename="products.{}"'.format(export_format)
+        return response
+
+    def post(self, request, export_format, *args, **kwargs):
+        """Write the export to a file in the background; the job result links to its download."""
+        job = enqueue('products.export', {'seller_id': request.user.pk, 'export_format': export_format},
+                      owner=request.user)
+        return job_accepted_response(request, job)
+
+
+def job_accepted_response(request, job):
+    """``202 Accepted`` pointing at the job's status URL."""
+    response = Response(JobSerializer(job, context={'request': request}).data, status=status.HTTP_202_ACCEPTED)
+    response['Location'] = request.build_absolute_uri(reverse('task:job', args=[job.pk]))
+    return response
+
+
+class JobStatusView(APIView):
+    """Status and result of one of the requesting user's background jobs."""
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, pk, *args, **kwargs):
+        jobs = Job.objects.all() if request.user.is_staff else Job.objects.filter(owner=request.user)
+        job = get_object_or_404(jobs, pk=pk)
+        return Response(JobSerializer(job, context={'request': request}).data, status=status.HTTP_200_OK)
+
+
+class JobDownloadView(APIView):
+    """Stream the file written by one of the requesting user's finished export jobs."""
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, pk, *args, **kwargs):
+        job = get_object_or_404(Job, pk=pk, owner=request.user, kind='products.export', status=Job.SUCCEEDED)
+        try:
+            export = open(get_export_path(job.result), 'rb')
+        except (OSError, KeyError, TypeError):
+            raise Http404
+        content_type, _render_rows = EXPORT_FORMATS[job.result['format']]
+        return FileResponse(export, as_attachment=True, content_type=content_type,
+                            filename='products.{}'.format(job.result['format']))
 
 
 class ProductCreateView(APIView):
@@ -45,5 +245,142 @@ class ProductCreateView(APIView):
         serializer = ProductSerializer(data=data)
         if serializer.is_valid():
             serializer.save()
-            return Response(serializer.data, status=status.HTTP_201_CREATED)
+            with timing('serializer'):
+                data = serializer.data
+            return Response(data, status=status.HTTP_201_CREATED)
         return Response(serializer.errors, status=status.HTTP_422_UNPROCESSABLE_ENTITY)
+
+
+class ProductBulkCreateView(APIView):
+    """Create many products from a JSON array or an NDJSON stream in one request."""
+    permission_classes = [IsAuthenticated]
+    parser_classes = [ORJSONParser, NDJSONParser]
+
+    def get_chunk_size(self, request):
+        chunk_size = get_bulk_create_setting('CHUNK_SIZE')
+        try:
+            chunk_size = int(request.query_params.get('chunk_size', chunk_size))
+        except ValueError:
+            pass
+        return max(1, min(chunk_size, get_bulk_create_setting('MAX_CHUNK_SIZE')))
+
+    def post(self, request, *args, **kwargs):
+        rows = request.data
+        if not isinstance(rows, (list, Iterator)):
+            return Response({'non_field_errors': ['Expected a list of products.']},
+                            status=status.HTTP_422_UNPROCESSABLE_ENTITY)
+        if request.query_params.get('background'):
+            return self.enqueue(request, rows)
+        try:
+            result = bulk_create_products(rows, chunk_size=self.get_chunk_size(request))
+        except ValidationError as exc:
+            # Only the row limit aborts the import; row errors are in the result.
+            return Response(exc.detail, status=status.HTTP_422_UNPROCESSABLE_ENTITY)
+        if result['failed'] and not result['created']:
+            return Response(result, status=status.HTTP_422_UNPROCESSABLE_ENTITY)
+        return Response(result, status=status.HTTP_201_CREATED)
+
+    def enqueue(self, request, rows):
+        """Store the rows in a ``products.bulk_import`` job and answer 202 right away."""
+        max_rows = get_bulk_create_setting('MAX_ROWS')
+        rows = list(itertools.islice(rows, max_rows + 1))
+        if len(rows) > max_rows:
+            return Response(too_many_rows(max_rows).detail, status=status.HTTP_422_UNPROCESSABLE_ENTITY)
+        job = enqueue('products.bulk_import', {'rows': rows, 'chunk_size': self.get_chunk_size(request)},
+                      owner=request.user)
+        return job_accepted_response(request, job)
+
+
+class AsyncAPIView(View):
+    """
+    Base for async endpoints on the ASGI stack.
+
+    DRF 3.13 dispatches synchronously, so these views authenticate with
+    ``aauthenticate`` and hand ORM work to the bounded pool of ``run_sync``,
+    keeping the event loop free while queries run. Responses are rendered
+    with the ``ORJSONRenderer`` of the sync endpoints.
+    """
+    renderer = ORJSONRenderer()
+
+    @classmethod
+    def as_view(cls, **initkwargs):
+        # Django 3.2 only detects async function views, not async class-based ones.
+        view = super().as_view(**initkwargs)
+
+        async def async_view(request, *args, **kwargs):
+            response = view(request, *args, **kwargs)
+            if asyncio.iscoroutine(response):
+                response = await response
+            return response
+
+        functools.update_wrapper(async_view, view)
+        # Like APIView: session-authenticated requests are CSRF checked by SessionAuthentication.
+        async_view.csrf_exempt = True
+        return async_view
+
+    def render(self, data, status_code=status.HTTP_200_OK):
+        return HttpResponse(self.renderer.render(data), status=status_code, content_type='application/json')
+
+    def render_exception(self, exc):
+        response = self.render({'detail': exc.detail}, exc.status_code)
+        if isinstance(exc, NotAuthenticated):
+            response['WWW-Authenticate'] = 'Token'
+        elif isinstance(exc, PoolTimeout):
+            response['Retry-After'] = '1'
+        return response
+
+    async def authenticate(self, request):
+        user = await aauthenticate(request)
+        if not user.is_authenticated:
+            raise NotAuthenticated()
+        return user
+
+
+class AsyncProductListView(AsyncAPIView):
+    """
+    Async ``ProductListView``: the same filters, ordering, pagination and
+    JSON body. It does not answer conditional requests (no ETag or
+    Last-Modified, so never a 304) and does not use the product list
+    cache; clients relying on either should use the sync listing.
+    """
+
+    async def get(self, request, *args, **kwargs):
+        try:
+            user = await self.authenticate(request)
+            status_code, data = await run_sync(self.list_products, request, user)
+        except APIException as exc:
+            return self.render_exception(exc)
+        return self.render(data, status_code)
+
+    def list_products(self, request, user):
+        drf_request = Request(request)
+        filterset = ProductFilter(drf_request.query_params, queryset=Product.objects.filter(Q(seller=user)))
+        if not filterset.is_valid():
+            return status.HTTP_422_UNPROCESSABLE_ENTITY, filterset.errors
+        products = filterset.qs
+        paginator = ProductKeysetPagination()
+        if paginator.is_requested(drf_request):
+            page = paginator.paginate_queryset(ProductReadSerializer.get_rows(products), drf_request)
+            return status.HTTP_200_OK, paginator.get_paginated_response(ProductReadSerializer(page).data).data
+        if not products.ordered:
+            products = products.order_by('price')
+        return status.HTTP_200_OK, ProductReadSerializer(ProductReadSerializer.get_rows(products)).data
+
+
+class AsyncProductCreateView(AsyncAPIView):
+    async def post(self, request, *args, **kwargs):
+        try:
+            await self.authenticate(request)
+            status_code, data = await run_sync(self.create_product, request)
+        except APIException as exc:
+            return self.render_exception(exc)
+        return self.render(data, status_code)
+
+    def create_product(self, request):
+        # The parsers of the sync endpoints, so both accept the same bodies.
+        parsers = [parser() for parser in api_settings.DEFAULT_PARSER_CLASSES]
+        serializer = ProductSerializer(data=Request(request, parsers=parsers).data)
+        if serializer.is_valid():
+            serializer.save()
+            return status.HTTP_201_CREATED, serializer.data
+        return status.HTTP_422_UNPROCESSABLE_ENTITY, serializer.errors